@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+STT Accuracy/Latency Check for Project Pluto
+Compares the bucketed short-utterance encoder against Whisper's padded
+30-second path on a folder of recorded utterances
+"""
+
+import sys
+import wave
+import argparse
+from pathlib import Path
+from typing import List, Optional
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from config import AUDIO_CONFIG
+from stt_engines import WhisperEngine
+
+
+def load_wav(path: Path) -> np.ndarray:
+    """Load a 16-bit mono WAV at the pipeline sample rate as float32"""
+    with wave.open(str(path), 'rb') as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getframerate() != AUDIO_CONFIG['sample_rate']:
+            raise ValueError(f"{path.name}: expected 16-bit mono {AUDIO_CONFIG['sample_rate']}Hz")
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    return pcm.astype(np.float32) / 32768.0
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercase words without punctuation"""
+    cleaned = "".join(c if c.isalnum() or c.isspace() or c == "'" else " " for c in text.lower())
+    return cleaned.split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance divided by the reference length"""
+    ref, hyp = normalize(reference), normalize(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1] / len(ref)
+
+
+def transcribe(engine: WhisperEngine, audio: np.ndarray, short_encoder: bool) -> dict:
+    engine.short_encoder = short_encoder
+    return engine.transcribe(audio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare bucketed vs padded Whisper encoding')
+    parser.add_argument(
+        'samples',
+        type=Path,
+        help='Folder of .wav utterances (optional same-name .txt reference transcripts)'
+    )
+    parser.add_argument(
+        '--max-wer-increase',
+        type=float,
+        default=0.02,
+        help='Allowed WER increase of the bucketed path (default: 0.02)'
+    )
+
+    args = parser.parse_args()
+
+    files = sorted(args.samples.glob("*.wav"))
+    if not files:
+        print(f"❌ No .wav files in {args.samples}")
+        return 1
+
+    print("Loading Whisper...")
+    engine = WhisperEngine()
+    engine.load()
+    engine.warmup()
+
+    padded_ms, bucketed_ms = [], []
+    padded_errors, bucketed_errors = [], []
+
+    print(f"\n{'File':<28} {'Dur':>5} {'Padded':>8} {'Bucket':>8} {'WER pad':>8} {'WER bkt':>8}")
+    print("-" * 70)
+
+    for path in files:
+        audio = load_wav(path)
+        reference_path = path.with_suffix(".txt")
+        reference: Optional[str] = reference_path.read_text().strip() if reference_path.exists() else None
+
+        padded = transcribe(engine, audio, short_encoder=False)
+        bucketed = transcribe(engine, audio, short_encoder=True)
+
+        # Without a reference, the padded path is the reference
+        if reference is None:
+            reference = padded['text']
+
+        padded_ms.append(padded['timings']['total_ms'])
+        bucketed_ms.append(bucketed['timings']['total_ms'])
+        padded_errors.append(word_error_rate(reference, padded['text']))
+        bucketed_errors.append(word_error_rate(reference, bucketed['text']))
+
+        print(f"{path.name[:28]:<28} {len(audio) / AUDIO_CONFIG['sample_rate']:>4.1f}s "
+              f"{padded_ms[-1]:>6.0f}ms {bucketed_ms[-1]:>6.0f}ms "
+              f"{padded_errors[-1]:>8.2f} {bucketed_errors[-1]:>8.2f}")
+        if bucketed['text'] != padded['text']:
+            print(f"   padded:   \"{padded['text']}\"")
+            print(f"   bucketed: \"{bucketed['text']}\"")
+
+    padded_wer, bucketed_wer = float(np.mean(padded_errors)), float(np.mean(bucketed_errors))
+    print("-" * 70)
+    print(f"Mean latency: padded {np.mean(padded_ms):.0f}ms, bucketed {np.mean(bucketed_ms):.0f}ms "
+          f"({np.mean(padded_ms) / np.mean(bucketed_ms):.1f}x faster)")
+    print(f"Mean WER:     padded {padded_wer:.3f}, bucketed {bucketed_wer:.3f}")
+
+    if bucketed_wer - padded_wer > args.max_wer_increase:
+        print(f"❌ Bucketed encoder loses accuracy (> {args.max_wer_increase:.2f} WER) - disable short_encoder")
+        return 1
+
+    print("✅ Bucketed encoder within accuracy tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,7 @@ Manages the reflex agent's conversation states and transitions
 
 import time
 from enum import Enum
-from typing import Optional, Dict
+from typing import Callable, Dict, List, Optional
 
 
 class AgentState(Enum):
@@ -35,6 +35,9 @@ class AgentStateManager:
         self.state_history = []
         self.max_history_len = 50
         
+        # Called on reset() (e.g. clear the LLM conversation)
+        self._reset_listeners: List[Callable[[], None]] = []
+        
         print("🧠 Agent State Manager initialized")
         print(f"   Initial state: {self.current_state.value}")
         
@@ -177,6 +180,10 @@ class AgentStateManager:
             'should_greet': self.should_greet()
         }
         
+    def add_reset_listener(self, callback: Callable[[], None]) -> None:
+        """Call callback() whenever the agent is reset"""
+        self._reset_listeners.append(callback)
+        
     def reset(self) -> None:
         """Reset to idle state"""
         print("🔄 Resetting agent state to IDLE")
@@ -184,6 +191,12 @@ class AgentStateManager:
         self.unlock_face()
         self.state_entry_time = time.time()
         
+        for callback in self._reset_listeners:
+            try:
+                callback()
+            except Exception as e:
+                print(f"⚠️  Reset listener error: {e}")
+        
     def __repr__(self) -> str:
         """String representation"""
         return f"AgentState({self.current_state.value}, locked={self.is_locked()})"
@@ -0,0 +1,87 @@
+"""
+🪐 Project Pluto - Audio Ring Buffer
+Fixed-size int16 ring buffer shared by the capture thread and the recorder
+"""
+
+import threading
+import time
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Preallocated ring buffer of int16 samples
+
+    Samples are addressed by absolute index (samples written since start), so
+    a reader can keep its own cursor and detect when it has fallen so far
+    behind that the writer overwrote unread audio.
+    """
+
+    def __init__(self, capacity: int, sample_rate: int):
+        """
+        Args:
+            capacity: Number of samples kept
+            sample_rate: Sample rate in Hz (used for timestamps)
+        """
+        self.capacity = capacity
+        self.sample_rate = sample_rate
+        self.buffer = np.zeros(capacity, dtype=np.int16)
+
+        self.total_written = 0  # Absolute index of the next sample to be written
+        self.last_write_time = time.time()
+        self._cond = threading.Condition()
+
+    @property
+    def oldest_index(self) -> int:
+        """Absolute index of the oldest sample still in the buffer"""
+        return max(0, self.total_written - self.capacity)
+
+    def write(self, samples: np.ndarray):
+        """Append samples, overwriting the oldest audio when full"""
+        samples = samples[-self.capacity:]
+        n = len(samples)
+
+        with self._cond:
+            pos = self.total_written % self.capacity
+            first = min(n, self.capacity - pos)
+            self.buffer[pos:pos + first] = samples[:first]
+            if first < n:
+                self.buffer[:n - first] = samples[first:]
+
+            self.total_written += n
+            self.last_write_time = time.time()
+            self._cond.notify_all()
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """
+        Copy samples [start, end) into a new contiguous array
+
+        Args:
+            start: Absolute start index (clamped to the oldest available sample)
+            end: Absolute end index (clamped to the newest sample)
+        """
+        with self._cond:
+            start = max(start, self.oldest_index)
+            end = min(end, self.total_written)
+            n = max(0, end - start)
+
+            out = np.empty(n, dtype=np.int16)
+            if n == 0:
+                return out
+
+            pos = start % self.capacity
+            first = min(n, self.capacity - pos)
+            out[:first] = self.buffer[pos:pos + first]
+            if first < n:
+                out[first:] = self.buffer[:n - first]
+
+            return out
+
+    def wait_for(self, index: int, timeout: float) -> bool:
+        """Block until sample `index` has been written (exclusive end)"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.total_written >= index, timeout=timeout)
+
+    def time_of(self, index: int) -> float:
+        """Estimate the wall-clock capture time of an absolute sample index"""
+        return self.last_write_time - (self.total_written - index) / self.sample_rate
@@ -0,0 +1,115 @@
+"""
+🪐 Project Pluto - Cancellation
+Per-turn cancellation tokens carried in queue messages between workers
+"""
+
+import threading
+import time
+import weakref
+from typing import Callable, List, Optional
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag with callbacks
+
+    Tokens form a tree: cancelling a token cancels all of its children
+    (a session token cancels every turn in it). Workers check `cancelled`
+    at their own checkpoints; callbacks let a worker interrupt a blocking
+    call (close an HTTP response, wake a playback thread).
+    """
+
+    def __init__(self, parent: Optional["CancellationToken"] = None, name: str = ""):
+        self.name = name
+        self.reason: Optional[str] = None
+        self.cancelled_at: Optional[float] = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[str], None]] = []
+        self._children = weakref.WeakSet()
+
+        if parent is not None:
+            parent._add_child(self)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled"):
+        """Cancel this token and its children (idempotent)"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self.cancelled_at = time.time()
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+            children = list(self._children)
+
+        for callback in callbacks:
+            self._run_callback(callback)
+        for child in children:
+            child.cancel(reason)
+
+    def add_callback(self, callback: Callable[[str], None]):
+        """Call callback(reason) on cancellation (immediately if already cancelled)"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        self._run_callback(callback)
+
+    def child(self, name: str = "") -> "CancellationToken":
+        """New token that is cancelled together with this one"""
+        return CancellationToken(parent=self, name=name)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled; True if cancelled"""
+        return self._event.wait(timeout)
+
+    def _add_child(self, child: "CancellationToken"):
+        with self._lock:
+            if not self._event.is_set():
+                self._children.add(child)
+                return
+        child.cancel(self.reason)
+
+    def _run_callback(self, callback: Callable[[str], None]):
+        try:
+            callback(self.reason)
+        except Exception as e:
+            print(f"⚠️  Cancellation callback error: {e}")
+
+
+class TurnManager:
+    """
+    Hands out turn tokens under the current session token
+
+    A session lasts while one person is locked in; cancelling it (face lost,
+    agent reset) cancels every turn still in flight and starts a new session.
+    """
+
+    def __init__(self):
+        self.session = CancellationToken(name="session")
+        self.turn_count = 0
+        self._turns = weakref.WeakSet()
+
+    def new_turn(self) -> CancellationToken:
+        """Token for one user turn (transcript → LLM → TTS)"""
+        self.turn_count += 1
+        token = self.session.child(name=f"turn-{self.turn_count}")
+        self._turns.add(token)
+        return token
+
+    def cancel_turns(self, reason: str) -> int:
+        """Cancel all turns in flight but keep the session (e.g. barge-in)"""
+        active = [turn for turn in list(self._turns) if not turn.cancelled]
+        for turn in active:
+            turn.cancel(reason)
+        return len(active)
+
+    def cancel_session(self, reason: str):
+        """Cancel the session and everything in it, then start a new session"""
+        old, self.session = self.session, CancellationToken(name="session")
+        self._turns = weakref.WeakSet()
+        old.cancel(reason)
@@ -0,0 +1,156 @@
+"""
+🪐 Project Pluto - Circuit Breaker
+Stops sending turns to a backend that keeps failing or hanging, and probes
+it for recovery in the background
+"""
+
+import threading
+from typing import Callable, Optional
+
+from config import OLLAMA_CONFIG
+
+
+class CircuitBreaker:
+    """
+    Closed → open → (probe) → closed circuit breaker
+
+    - closed: calls go through; consecutive failures (errors, or calls slower
+      than slow_call_s) are counted
+    - open: after failure_threshold consecutive failures calls are refused
+      immediately; a background thread runs probe() with exponential backoff
+      (backoff_initial_s doubling up to backoff_max_s)
+    - half-open: a successful probe lets one real call through; its success
+      closes the circuit, its failure opens it again
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Numeric value of each state for metrics
+    STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, probe: Callable[[], bool],
+                 on_state_change: Optional[Callable[[str, str, str], None]] = None,
+                 failure_threshold: Optional[int] = None, slow_call_s: Optional[float] = None,
+                 backoff_initial_s: Optional[float] = None, backoff_max_s: Optional[float] = None):
+        """
+        Args:
+            probe: Returns True if the backend looks healthy again
+            on_state_change: on_state_change(old, new, reason)
+            failure_threshold: Consecutive failures that open the circuit
+            slow_call_s: Calls slower than this count as failures
+            backoff_initial_s: First probe delay after opening
+            backoff_max_s: Probe delay cap
+        """
+        self.probe = probe
+        self.on_state_change = on_state_change
+        self.failure_threshold = failure_threshold or OLLAMA_CONFIG['breaker_failure_threshold']
+        self.slow_call_s = slow_call_s or OLLAMA_CONFIG['breaker_slow_call_s']
+        self.backoff_initial_s = backoff_initial_s or OLLAMA_CONFIG['breaker_backoff_initial_s']
+        self.backoff_max_s = backoff_max_s or OLLAMA_CONFIG['breaker_backoff_max_s']
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.rejected_count = 0
+        self.open_count = 0
+
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._probe_thread = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
+
+    def allow(self) -> bool:
+        """May a call go to the backend now? (refusals are counted)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected_count += 1
+            return False
+
+    def record_success(self, duration_s: float):
+        """Report a finished call; slow calls count as failures"""
+        if duration_s > self.slow_call_s:
+            self.record_failure(f"slow call ({duration_s:.1f}s)")
+            return
+
+        with self._lock:
+            old = self.state
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+            changed = self._set_state(self.CLOSED)
+        if changed:
+            self._notify(old, self.CLOSED, "call succeeded")
+
+    def release(self):
+        """A permitted call ended without a verdict (e.g. cancelled)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self, reason: str):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            old = self.state
+            should_open = old == self.HALF_OPEN or (
+                old == self.CLOSED and self.consecutive_failures >= self.failure_threshold)
+            if should_open:
+                self._set_state(self.OPEN)
+                self.open_count += 1
+
+        if should_open:
+            self._notify(old, self.OPEN, reason)
+            self._start_probing()
+
+    def stop(self):
+        self._stop.set()
+        if self._probe_thread is not None:
+            self._probe_thread.join(timeout=2)
+
+    def _set_state(self, state: str) -> bool:
+        if self.state == state:
+            return False
+        self.state = state
+        return True
+
+    def _start_probing(self):
+        if self._probe_thread is not None and self._probe_thread.is_alive():
+            return
+        self._probe_thread = threading.Thread(target=self._probe_loop, name="circuit-probe", daemon=True)
+        self._probe_thread.start()
+
+    def _probe_loop(self):
+        """While open: probe with exponential backoff, half-open on success"""
+        delay = self.backoff_initial_s
+        while not self._stop.wait(delay):
+            if self.state != self.OPEN:
+                return
+
+            try:
+                healthy = self.probe()
+            except Exception:
+                healthy = False
+
+            if healthy:
+                with self._lock:
+                    changed = self.state == self.OPEN and self._set_state(self.HALF_OPEN)
+                if changed:
+                    self._notify(self.OPEN, self.HALF_OPEN, f"probe succeeded after {delay:.0f}s backoff")
+                return
+
+            delay = min(delay * 2, self.backoff_max_s)
+
+    def _notify(self, old: str, new: str, reason: str):
+        print(f"🔌 LLM circuit {old} → {new} ({reason})")
+        if self.on_state_change:
+            try:
+                self.on_state_change(old, new, reason)
+            except Exception as e:
+                print(f"⚠️  Circuit listener error: {e}")
@@ -17,6 +17,7 @@ PROJECT_ROOT = Path(__file__).parent.parent
 SRC_DIR = PROJECT_ROOT / "src"
 MODELS_DIR = PROJECT_ROOT / "models"
 LOGS_DIR = PROJECT_ROOT / "logs"
+CACHE_DIR = PROJECT_ROOT / "cache"
 
 # Ensure directories exist
 MODELS_DIR.mkdir(exist_ok=True)
@@ -38,12 +39,40 @@ AUDIO_CONFIG = {
     "output_device_index": None,  # None = default speaker
     
     # Voice activity detection (adjusted for better sensitivity)
-    "energy_threshold": 300,  # Lowered from 500 - more sensitive
-    "silence_threshold": 300,  # Lowered from 500 - detects quieter speech
-    "silence_chunks_threshold": 20,  # Reduced from 30 - faster detection
-    "silence_duration": 1.0,  # Reduced from 1.5 - faster cutoff
+    "energy_threshold": 300,  # Minimum frame energy that can count as speech
+    
+    # Endpointing (analysis frames are independent of chunk_size)
+    "frame_ms": 20,  # Analysis frame length
+    "speech_start_ms": 60,  # Loud audio needed before speech starts
+    "trailing_silence_ms": 500,  # Silence after speech that ends the phrase
+    "noise_floor_alpha": 0.05,  # Noise floor adaptation rate (per frame)
+    
+    # Spectral VAD
+    "vad_band_hz": (300, 3400),  # Speech band used for energy/flatness
+    "vad_start_snr_db": 10.0,  # Band energy above noise floor needed to start speech
+    "vad_end_snr_db": 6.0,  # ...and to continue it (lower = hysteresis)
+    "vad_flatness_max": 0.45,  # Spectral flatness above this is noise (fans, clicks)
+    "vad_zcr_max": 0.35,  # Zero-crossing rate above this is hiss
+    "vad_calibration_ms": 1000,  # Background audio used to learn the noise floor at startup
+    "vad_trim_pad_ms": 150,  # Audio kept around speech when trimming silence
+    "vad_model_path": str(MODELS_DIR / "silero_vad.onnx"),  # Optional
+    "vad_model_threshold": 0.5,  # Speech probability needed from the ONNX model
     "min_phrase_duration": 0.3,  # Reduced from 0.5 - capture shorter phrases
     "max_phrase_duration": 20.0,  # Increased from 15 - allow longer sentences
+    
+    # Continuous capture
+    "ring_buffer_seconds": 30.0,  # Audio kept by the capture ring buffer
+    "preroll_ms": 300,  # Audio kept from before the speech trigger
+    
+    # Echo gating (half duplex): ignore the microphone while Pluto speaks
+    "echo_tail_ms": 300,  # Still gated this long after playback ends (reverb, output latency)
+    
+    # Barge-in: the user talking over playback interrupts it
+    "barge_in_enabled": True,
+    "barge_in_ms": 150,  # Speech above the echo level needed to interrupt
+    "barge_in_margin_db": 10.0,  # How much louder than Pluto's echo the user must be
+    "barge_in_grace_ms": 300,  # Start of each playback only trains the echo level
+    "echo_decay_db_per_s": 3.0,  # Decay of the learned echo peak level
 }
 
 # ============================================================================
@@ -52,17 +81,42 @@ AUDIO_CONFIG = {
 
 # Whisper STT Model (replaced Vosk for better accuracy)
 WHISPER_CONFIG = {
+    "engine": "whisper",  # whisper, faster-whisper (CTranslate2 int8) or vosk
     "model_size": "tiny",  # tiny, base, small, medium, large
     "device": "cpu",  # cpu or cuda
     "language": "en",  # Language code (None for auto-detect)
     "task": "transcribe",  # transcribe or translate
     "fp16": False,  # Use FP16 (only works on GPU)
+    "compute_type": "int8",  # faster-whisper quantization (int8, int8_float32, float32)
+    "vosk_model_path": str(MODELS_DIR / "vosk-model-small-en-us-0.15"),  # install_vosk.ps1
     
     # Decoding options
     "temperature": 0.0,  # Sampling temperature (0 = deterministic)
     "best_of": 5,  # Number of candidates when sampling
     "beam_size": 5,  # Beam size for beam search
     
+    # Decoding policy: "adaptive" decodes greedily and re-decodes with beam
+    # search only when the result looks unreliable; "greedy" or "beam" always
+    "decoding": "adaptive",
+    "logprob_threshold": -1.0,  # Below this average token log-prob: fall back to beam
+    "compression_ratio_threshold": 2.4,  # Above this (repetitive output): fall back to beam
+    "no_speech_threshold": 0.6,  # Low log-prob with this no-speech prob is silence, not a miss
+    
+    # Incremental transcription while the user is still talking
+    "streaming": True,  # Emit partial transcripts and reuse them at the endpoint
+    "partial_interval_ms": 400,  # New audio needed before the next partial decode
+    
+    # Short utterances run the encoder on a window sized to the audio instead
+    # of 30 s of padding (check accuracy with evaluate_stt.py)
+    "short_encoder": True,
+    "encoder_buckets_s": (2, 4, 8, 16),  # Window lengths; longer audio uses the full 30 s
+    "encoder_tail_pad_s": 0.5,  # Minimum silence after the speech inside the window
+    
+    # Inference runs in a separate process (no GIL contention with vision)
+    "num_threads": 2,  # CPU threads used by the engine in the inference process
+    "process_start_timeout": 120.0,  # seconds - model load
+    "process_timeout": 30.0,  # seconds - a request taking longer restarts the process
+    
     # Model info
     "model_info": {
         "tiny": "39M params, ~1GB RAM, ~1s latency, good accuracy",
@@ -71,16 +125,82 @@ WHISPER_CONFIG = {
     }
 }
 
+# Transcript gating between STT and the LLM (drops Whisper hallucinations)
+TRANSCRIPT_FILTER_CONFIG = {
+    "enabled": True,
+    # Same thresholds Whisper uses for its beam fallback
+    "no_speech_prob": WHISPER_CONFIG["no_speech_threshold"],  # Drop when above this AND avg log-prob is below logprob_threshold
+    "logprob_threshold": WHISPER_CONFIG["logprob_threshold"],
+    "max_compression_ratio": WHISPER_CONFIG["compression_ratio_threshold"],  # Repetition loops ("you you you you ...")
+    "min_avg_logprob": -1.5,  # Drop regardless of no-speech prob below this
+    "max_words_per_second": 5.0,  # More words than the audio could hold
+    
+    # Subtitle credits Whisper produces from noise; always dropped
+    # (matched case/punctuation-insensitive)
+    "blocklist": [
+        "thanks for watching",
+        "thank you for watching",
+        "thank you so much for watching",
+        "please subscribe",
+        "subtitles by the amara org community",
+    ],
+    # Real replies that Whisper also hallucinates from noise; dropped only
+    # when the segment looks like noise (no_speech_prob above no_speech_prob,
+    # avg log-prob below logprob_threshold, or shorter than suspect_min_duration)
+    "suspect_phrases": [
+        "you",
+        "thank you",
+        "so",
+    ],
+    "suspect_min_duration": 0.5,  # seconds
+}
+
 # Ollama/Qwen2.5 LLM
 OLLAMA_CONFIG = {
     "host": os.getenv("OLLAMA_HOST", "http://localhost:11434"),
     "model": os.getenv("OLLAMA_MODEL", "qwen2.5:0.5b-instruct-q4_k_M"),
-    "timeout": 30.0,  # seconds
+    "timeout": 30.0,  # seconds - read timeout (time between streamed bytes)
+    "connect_timeout": 2.0,  # seconds - fail fast when the server is down
+    "keep_alive": 900,  # seconds the model stays loaded after a request (-1 = never unload)
+    "cold_load_threshold_ms": 300,  # Model load time above which a first turn counts as cold
+    "preload_retry_s": 30.0,  # Wait this long before preloading again after a failed preload
+    
+    # Circuit breaker: answer with a fallback phrase instead of waiting on a failing server
+    "breaker_failure_threshold": 2,  # Consecutive failures (or slow calls) that open the circuit
+    "breaker_slow_call_s": 20.0,  # Waiting longer than this for the first or next token counts as a failure
+    "breaker_backoff_initial_s": 2.0,  # First recovery probe after opening, doubling...
+    "breaker_backoff_max_s": 60.0,  # ...up to this
+    "breaker_probe_timeout_s": 10.0,  # Read timeout of a probe (one generated token)
+    "pool_size": 4,  # Keep-alive connections kept open to Ollama
+    "health_check_interval": 5.0,  # seconds between background health probes
     "temperature": 0.7,
     "top_p": 0.9,
     "max_tokens": 150,
-    "max_history": 5,  # Number of conversation turns to remember
-    "stream": False,
+    "chat_mode": True,  # /api/chat with the conversation; Ollama reuses the cached prompt prefix
+    "context_token_budget": 1024,  # Prefill budget: estimated prompt tokens (system + summary + history)
+    "summarize_history": True,  # Compact older turns into a summary instead of forgetting them
+    "summary_trigger_ratio": 0.75,  # Compact once the prompt reaches this share of the budget
+    "summary_keep_recent_turns": 2,  # Most recent turns always kept verbatim
+    "summary_max_words": 60,
+    "summary_max_tokens": 100,
+    "num_ctx": 2048,  # Context window requested from Ollama
+    "stream": True,  # Stream tokens and speak each sentence as soon as it is complete
+    "stream_min_chunk_chars": 12,  # Shorter sentences are merged with the next one
+    "stream_clause_min_chars": 60,  # Split long sentences at , ; : once this long
+    
+    # Exact-match response cache (opt-in, e.g. FAQ/kiosk deployments)
+    "response_cache_enabled": False,
+    "response_cache_ttl": 3600.0,  # seconds an answer may be reused
+    "response_cache_max_entries": 256,
+    "deterministic": False,  # temperature 0 + fixed seed: cached answers match fresh ones
+    "seed": 42,
+    
+    # Semantic cache: answer paraphrases of earlier questions (opt-in)
+    "semantic_cache_enabled": False,
+    "embedding_model": "all-minilm",  # ollama pull all-minilm
+    "semantic_cache_threshold": 0.92,  # Minimum cosine similarity to reuse an answer
+    "semantic_cache_max_entries": 2048,
+    "semantic_cache_dir": str(CACHE_DIR / "semantic"),
     
     "system_prompt": (
         "You are a helpful voice assistant. Give concise, natural responses "
@@ -99,7 +219,18 @@ PIPER_CONFIG = {
     "length_scale": 1.0,
     "noise_scale": 0.667,
     "noise_w": 0.8,
-    "sample_rate": 22050,
+    "sample_rate": 22050,  # Fallback if the .onnx.json config can't be read
+    "synthesis_timeout": 10.0,  # seconds - Piper is restarted if an utterance takes longer
+    "idle_timeout": 1.0,  # seconds of no output that ends an utterance if Piper logs nothing
+    "pcm_buffer_chunks": 128,  # Synthesized PCM chunks buffered ahead of playback (~10s)
+    "playback_chunk_frames": 1024,  # Frames per write to the output stream
+    
+    # Phrase cache (repeated phrases skip synthesis)
+    "cache_enabled": True,
+    "cache_dir": str(CACHE_DIR / "tts"),  # Raw PCM per phrase, survives restarts
+    "cache_max_bytes": 32 * 1024 * 1024,  # In-memory LRU budget (~12 min of 22kHz audio)
+    "cache_disk_max_bytes": 128 * 1024 * 1024,
+    "cache_max_chars": 120,  # Longer sentences rarely repeat and are not cached
 }
 
 # Vision/Face Detection (YuNet)
@@ -137,6 +268,13 @@ VISION_CONFIG = {
     "greeting_enabled": True,  # Auto-greet on new face
     "greeting_cooldown": 10.0,  # Seconds before greeting same face again
     "greeting_message": "Hi there! How can I help you today?",
+    "greeting_prerendered": True,  # Play greetings synthesized at startup (no LLM/TTS round trip)
+    "greeting_variants": [  # Rendered once at startup; empty = greeting_message only
+        "Hi there! How can I help you today?",
+        "Hello! What can I do for you?",
+        "Hey, nice to see you! What's on your mind?",
+    ],
+    "greeting_rotation": "round_robin",  # "round_robin" or "random"
     
     # Display settings (for debugging/demo)
     "show_preview": True,  # Show live camera window with face detection
@@ -155,6 +293,11 @@ QUEUE_CONFIG = {
     "timeout": 5.0,
     "get_timeout": 1.0,  # Timeout for queue.get() operations
     "block_on_full": False,
+    # STT->LLM scheduling: messages older than this (since capture) are dropped
+    # unanswered instead of being answered late
+    "greeting_deadline_s": 5.0,
+    "transcript_deadline_s": 10.0,
+    "partial_deadline_s": 1.0,
 }
 
 # ============================================================================
@@ -241,6 +384,7 @@ def get_config(section: str) -> Dict[str, Any]:
     config_map = {
         "audio": AUDIO_CONFIG,
         "whisper": WHISPER_CONFIG,
+        "transcript_filter": TRANSCRIPT_FILTER_CONFIG,
         "ollama": OLLAMA_CONFIG,
         "piper": PIPER_CONFIG,
         "vision": VISION_CONFIG,
@@ -260,6 +404,10 @@ def validate_config() -> bool:
     
     # Whisper model will be downloaded automatically on first use
     # No need to check for model path
+    if WHISPER_CONFIG["engine"] not in ("whisper", "faster-whisper", "vosk"):
+        errors.append(f"Unknown STT engine: {WHISPER_CONFIG['engine']}")
+    elif WHISPER_CONFIG["engine"] == "vosk" and not Path(WHISPER_CONFIG["vosk_model_path"]).exists():
+        errors.append(f"Vosk model not found: {WHISPER_CONFIG['vosk_model_path']} (Run: install_vosk.ps1)")
     
     if not Path(PIPER_CONFIG["model_path"]).exists():
         errors.append(f"Piper model not found: {PIPER_CONFIG['model_path']}")
@@ -0,0 +1,175 @@
+"""
+🪐 Project Pluto - Conversation History
+Token-budgeted chat history with rolling summarization of older turns
+"""
+
+import math
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+from config import OLLAMA_CONFIG
+
+
+# Words, numbers and single punctuation marks, roughly how BPE tokenizers split text
+_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+# Chat-template overhead per message (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate token count for Qwen/Llama-style BPE vocabularies
+
+    Common short words are one token; longer words split into pieces of
+    about 4 characters; digits are grouped up to 3 per token; punctuation is
+    one token per mark.
+    """
+    count = 0
+    for piece in _PIECES.findall(text):
+        if piece.isdigit():
+            count += math.ceil(len(piece) / 3)
+        elif piece.isalpha():
+            count += 1 if len(piece) <= 6 else math.ceil(len(piece) / 4)
+        else:
+            count += 1
+    return count
+
+
+class ConversationHistory:
+    """
+    Chat messages kept under a prompt-token budget
+
+    Once the history (with the system prompt) reaches summary_trigger_ratio
+    of the budget, the older turns are compacted into a short summary by the
+    summarizer in a background thread, while the user is talking. The most
+    recent turns stay verbatim. If the budget is exceeded before a summary
+    is ready (or there is no summarizer), the oldest turns are dropped. In
+    both cases the prompt stays roughly the same size however long the
+    conversation runs.
+    """
+
+    def __init__(self, summarizer: Optional[Callable[[str, List[Dict[str, str]]], Optional[str]]] = None,
+                 budget: Optional[int] = None):
+        """
+        Args:
+            summarizer: summarizer(previous_summary, messages) -> new summary or None
+            budget: Prompt tokens (system prompt + summary + messages)
+        """
+        self.summarizer = summarizer
+        self.budget = OLLAMA_CONFIG['context_token_budget'] if budget is None else budget
+        self.trigger_tokens = int(self.budget * OLLAMA_CONFIG['summary_trigger_ratio'])
+        self.keep_recent = OLLAMA_CONFIG['summary_keep_recent_turns'] * 2
+
+        self.summary = ""
+        self._messages: List[Dict[str, str]] = []
+        self._lock = threading.Lock()
+        self._epoch = 0  # Bumped by clear(); stale summaries are discarded
+        self._compacting = False
+        self.compactions = 0
+        self.dropped_messages = 0
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    def messages(self) -> List[Dict[str, str]]:
+        """Messages for the prompt (summary first, as a system message)"""
+        with self._lock:
+            messages = list(self._messages)
+            summary = self.summary
+        if summary:
+            messages.insert(0, {'role': 'system', 'content': f"Earlier in this conversation: {summary}"})
+        return messages
+
+    def tokens(self) -> int:
+        """Estimated prompt tokens of system prompt, summary and messages"""
+        with self._lock:
+            return self._tokens()
+
+    def add(self, role: str, content: str, epoch: Optional[int] = None) -> bool:
+        """
+        Append a message
+
+        Args:
+            epoch: Epoch the message belongs to; ignored if clear() ran since
+
+        Returns:
+            True if appended
+        """
+        return self.extend([{'role': role, 'content': content}], epoch)
+
+    def extend(self, messages: List[Dict[str, str]], epoch: Optional[int] = None) -> bool:
+        with self._lock:
+            if epoch is not None and epoch != self._epoch:
+                return False
+            self._messages.extend(messages)
+            self._enforce_budget()
+            compact = self._should_compact()
+            if compact:
+                self._compacting = True
+
+        if compact:
+            threading.Thread(target=self._compact, name="history-summary", daemon=True).start()
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._messages = []
+            self.summary = ""
+            self._epoch += 1
+
+    def _tokens(self) -> int:
+        text_tokens = estimate_tokens(OLLAMA_CONFIG['system_prompt']) + estimate_tokens(self.summary)
+        text_tokens += sum(estimate_tokens(m['content']) for m in self._messages)
+        return text_tokens + MESSAGE_OVERHEAD_TOKENS * (len(self._messages) + 2)
+
+    def _should_compact(self) -> bool:
+        return (self.summarizer is not None and not self._compacting
+                and len(self._messages) > self.keep_recent
+                and self._tokens() >= self.trigger_tokens)
+
+    def _enforce_budget(self):
+        """
+        Hard limit: once over budget, drop the oldest messages down to the
+        summary trigger level (not just under the budget, so the prompt
+        prefix isn't changed again on the very next turn)
+        """
+        if self._tokens() <= self.budget:
+            return
+
+        dropped = 0
+        while self._messages and self._tokens() > self.trigger_tokens:
+            self._messages.pop(0)
+            dropped += 1
+        # Don't start the conversation with an orphaned assistant reply
+        while dropped and len(self._messages) > 1 and self._messages[0]['role'] == 'assistant':
+            self._messages.pop(0)
+            dropped += 1
+        self.dropped_messages += dropped
+
+    def _compact(self):
+        """Summarize everything but the most recent turns (background thread)"""
+        with self._lock:
+            epoch = self._epoch
+            older = self._messages[:-self.keep_recent]
+            previous = self.summary
+
+        try:
+            summary = self.summarizer(previous, older) if older else None
+        except Exception as e:
+            print(f"⚠️  History summarization failed: {e}")
+            summary = None
+
+        with self._lock:
+            self._compacting = False
+            # Apply only if nothing was cleared or dropped meanwhile
+            if summary and epoch == self._epoch and self._messages[:len(older)] == older:
+                self._messages = self._messages[len(older):]
+                self.summary = summary.strip()
+                self.compactions += 1
+                print(f"   📝 History compacted: {len(older)} messages → summary ({self._tokens()} tokens)")
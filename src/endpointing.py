@@ -0,0 +1,134 @@
+"""
+🪐 Project Pluto - Endpointing
+Frame-level speech start / end-of-speech and barge-in detection
+"""
+
+from typing import Optional
+import numpy as np
+
+from config import AUDIO_CONFIG
+from vad import SpectralVAD
+
+
+class Endpointer:
+    """
+    Detects speech start and end-of-speech on short analysis frames
+
+    Per-frame speech decisions come from the VAD (which also tracks the
+    adaptive noise floor and applies start/continue hysteresis). On top of
+    that the endpointer adds hangover: speech starts after speech_start_ms of
+    speech frames and ends after trailing_silence_ms of non-speech frames.
+    """
+
+    def __init__(self, sample_rate: Optional[int] = None, vad: Optional[SpectralVAD] = None):
+        self.sample_rate = sample_rate or AUDIO_CONFIG['sample_rate']
+        self.vad = vad or SpectralVAD(self.sample_rate)
+        self.frame_ms = AUDIO_CONFIG['frame_ms']
+        self.frame_samples = self.vad.frame_samples
+
+        self.start_frames = max(1, int(AUDIO_CONFIG['speech_start_ms'] / self.frame_ms))
+        self.end_frames = max(1, int(AUDIO_CONFIG['trailing_silence_ms'] / self.frame_ms))
+
+        self.reset()
+
+    def reset(self):
+        """Reset per-utterance state (the VAD noise floor is kept)"""
+        self.in_speech = False
+        self.loud_frames = 0
+        self.quiet_frames = 0
+        self.frame_index = 0
+        self.speech_start_frame = None
+        self.last_speech_frame = None
+
+    def process(self, frame: np.ndarray) -> Optional[str]:
+        """
+        Process one analysis frame
+
+        Args:
+            frame: frame_samples int16 samples
+
+        Returns:
+            'start' when speech begins, 'end' at the endpoint, otherwise None
+        """
+        speech = self.vad.is_speech(frame, in_speech=self.in_speech)
+        index = self.frame_index
+        self.frame_index += 1
+
+        if not self.in_speech:
+            if speech:
+                self.loud_frames += 1
+                if self.loud_frames >= self.start_frames:
+                    self.in_speech = True
+                    self.quiet_frames = 0
+                    self.speech_start_frame = index - self.start_frames + 1
+                    self.last_speech_frame = index
+                    return 'start'
+            else:
+                self.loud_frames = 0
+            return None
+
+        if speech:
+            self.quiet_frames = 0
+            self.last_speech_frame = index
+        else:
+            self.quiet_frames += 1
+            if self.quiet_frames >= self.end_frames:
+                self.in_speech = False
+                self.loud_frames = 0
+                return 'end'
+
+        return None
+
+
+class BargeInDetector:
+    """
+    Detects the user talking over Pluto's playback
+
+    The echo level is a peak follower of the speech-band energy picked up
+    while Pluto speaks (fast attack, slow decay; kept across playbacks).
+    Barge-in needs barge_in_ms of frames that pass the VAD start rule and
+    are barge_in_margin_db louder than that echo level. The first
+    barge_in_grace_ms of each playback only train the echo level.
+    """
+
+    def __init__(self, vad: SpectralVAD):
+        self.vad = vad
+        self.frame_samples = vad.frame_samples
+        frame_ms = AUDIO_CONFIG['frame_ms']
+
+        self.trigger_frames = max(1, int(AUDIO_CONFIG['barge_in_ms'] / frame_ms))
+        self.grace_frames = int(AUDIO_CONFIG['barge_in_grace_ms'] / frame_ms)
+        self.decay = AUDIO_CONFIG['echo_decay_db_per_s'] * frame_ms / 1000
+
+        self.echo_db: Optional[float] = None
+        self.reset()
+
+    def reset(self):
+        """Start watching a new playback (the learned echo level is kept)"""
+        self.frame_index = 0
+        self.speech_frames = 0
+
+    def process(self, frame: np.ndarray) -> bool:
+        """
+        Process one analysis frame captured during playback
+
+        Returns:
+            True when the user is barging in
+        """
+        f = self.vad.features(frame[np.newaxis, :])
+        band_db = float(f['band_db'][0])
+        self.frame_index += 1
+
+        if self.echo_db is None:
+            self.echo_db = self.vad.noise_db if self.vad.noise_db is not None else band_db
+
+        if self.frame_index > self.grace_frames:
+            loud = (band_db > self.echo_db + AUDIO_CONFIG['barge_in_margin_db']
+                    and bool(self.vad.decide(f)[0]))
+            if loud:
+                self.speech_frames += 1
+                return self.speech_frames >= self.trigger_frames
+
+        self.speech_frames = 0
+        self.echo_db = max(band_db, self.echo_db - self.decay)
+        return False
@@ -0,0 +1,146 @@
+"""
+🪐 Project Pluto - Incremental Log-Mel Spectrogram
+Whisper-compatible log-mel features that only compute frames for new audio
+"""
+
+import numpy as np
+
+# Whisper front-end constants (whisper/audio.py)
+N_FFT = 400
+HOP_LENGTH = 160
+
+
+class IncrementalLogMel:
+    """
+    Log-mel spectrogram for a growing utterance
+
+    Matches whisper.log_mel_spectrogram(audio, padding=N_SAMPLES) as used by
+    model.transcribe(): centered STFT with reflect padding on the left, zero
+    padding on the right. Frames whose window lies fully inside the audio
+    seen so far are cached; only the last couple of frames (which still
+    depend on future audio) are recomputed on each call.
+    """
+
+    def __init__(self, filters: np.ndarray, initial_frames: int = 3000):
+        """
+        Args:
+            filters: (n_mels, N_FFT // 2 + 1) mel filterbank
+            initial_frames: Preallocated frame capacity (grows if exceeded)
+        """
+        self.filters = filters.astype(np.float32)
+        self.n_mels = filters.shape[0]
+        # Periodic Hann window, like torch.hann_window
+        self.window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(N_FFT) / N_FFT)).astype(np.float32)
+
+        self.log_spec = np.empty((self.n_mels, initial_frames), dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        """Start a new utterance (keeps the preallocated buffer)"""
+        self.audio_len = 0
+        self.n_cached = 0
+        self._left_pad = None
+
+    @property
+    def n_frames(self) -> int:
+        """Frames for the audio seen so far (same count Whisper uses)"""
+        return self.audio_len // HOP_LENGTH
+
+    def update(self, audio: np.ndarray):
+        """
+        Compute log-mel frames for newly appended audio
+
+        Args:
+            audio: float32 samples of the whole utterance so far. Must extend
+                the audio passed previously; a shorter array starts a new utterance.
+        """
+        if len(audio) < self.audio_len:
+            self.reset()
+
+        self.audio_len = len(audio)
+        if self.audio_len <= N_FFT // 2:
+            return
+
+        if self._left_pad is None:
+            self._left_pad = audio[1:N_FFT // 2 + 1][::-1].astype(np.float32)
+
+        # Frame t covers padded[t*HOP : t*HOP + N_FFT] where padded has
+        # N_FFT//2 samples of reflect padding in front of the audio
+        complete = max(0, (self.audio_len + N_FFT // 2 - N_FFT) // HOP_LENGTH + 1)
+        complete = min(complete, self.n_frames)
+
+        if complete > self.n_cached:
+            self._ensure_capacity(complete)
+            self.log_spec[:, self.n_cached:complete] = self._compute(audio, self.n_cached, complete)
+            self.n_cached = complete
+
+    def log_mel(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Normalized log-mel for the whole utterance
+
+        Args:
+            audio: The same array last passed to update()
+
+        Returns:
+            (n_mels, n_frames) float32 array, normalized like Whisper
+        """
+        self.update(audio)
+
+        n_frames = self.n_frames
+        if self._left_pad is None:
+            return np.empty((self.n_mels, 0), dtype=np.float32)
+
+        spec = np.empty((self.n_mels, n_frames), dtype=np.float32)
+        spec[:, :self.n_cached] = self.log_spec[:, :self.n_cached]
+        if n_frames > self.n_cached:
+            # Tail frames reach past the end of the audio: zero padding
+            spec[:, self.n_cached:] = self._compute(audio, self.n_cached, n_frames)
+
+        return self.normalize(spec)
+
+    @staticmethod
+    def normalize(spec: np.ndarray) -> np.ndarray:
+        """Whisper's dynamic range clamp and scaling"""
+        if spec.size == 0:
+            return spec
+        spec = np.maximum(spec, spec.max() - 8.0)
+        return (spec + 4.0) / 4.0
+
+    @staticmethod
+    def padding_value(spec: np.ndarray) -> float:
+        """Normalized value of a silent (zero-padded) frame for this spectrogram"""
+        floor = -10.0  # log10(1e-10)
+        if spec.size:
+            # spec is normalized: recover the clamp floor max - 8
+            floor = max(floor, (spec.max() * 4.0 - 4.0) - 8.0)
+        return (floor + 4.0) / 4.0
+
+    def _compute(self, audio: np.ndarray, start: int, end: int) -> np.ndarray:
+        """log10 mel power for frames [start, end)"""
+        first = start * HOP_LENGTH
+        last = (end - 1) * HOP_LENGTH + N_FFT
+        pad = N_FFT // 2
+
+        # Slice of the padded signal covering the frames
+        lo, hi = first - pad, last - pad
+        pieces = []
+        if lo < 0:
+            pieces.append(self._left_pad[len(self._left_pad) + lo:])
+        pieces.append(audio[max(lo, 0):min(hi, len(audio))].astype(np.float32))
+        if hi > len(audio):
+            pieces.append(np.zeros(hi - len(audio), dtype=np.float32))
+        signal = np.concatenate(pieces)
+
+        frames = np.lib.stride_tricks.sliding_window_view(signal, N_FFT)[::HOP_LENGTH][:end - start]
+        spectrum = np.fft.rfft(frames * self.window, axis=1)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2).T
+
+        mel = self.filters @ power
+        return np.log10(np.maximum(mel, 1e-10))
+
+    def _ensure_capacity(self, frames: int):
+        if frames <= self.log_spec.shape[1]:
+            return
+        grown = np.empty((self.n_mels, max(frames, self.log_spec.shape[1] * 2)), dtype=np.float32)
+        grown[:, :self.n_cached] = self.log_spec[:, :self.n_cached]
+        self.log_spec = grown
@@ -0,0 +1,85 @@
+"""
+🪐 Project Pluto - Ollama Client
+Pooled keep-alive HTTP session for all Ollama calls, with a background
+health prober
+"""
+
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import OLLAMA_CONFIG
+
+
+class OllamaClient:
+    """
+    Shared requests.Session for the Ollama server
+
+    Connections are kept alive and reused from a pool, so a turn doesn't pay
+    TCP connection setup. Timeouts are (connect, read): an unreachable
+    server fails fast while a slow generation still gets the full read
+    timeout. Server health comes from a background thread; reading it
+    never blocks.
+    """
+
+    def __init__(self, host: Optional[str] = None):
+        self.host = (host or OLLAMA_CONFIG['host']).rstrip('/')
+        self.timeout = (OLLAMA_CONFIG['connect_timeout'], OLLAMA_CONFIG['timeout'])
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,  # One host
+            pool_maxsize=OLLAMA_CONFIG['pool_size'],
+            max_retries=0  # Callers decide what a failure means
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.healthy = False
+        self.last_health_check = 0.0
+        self._health_stop = threading.Event()
+        self._health_thread = None
+
+    def url(self, path: str) -> str:
+        return f"{self.host}{path}"
+
+    def get(self, path: str, timeout=None, **kwargs) -> requests.Response:
+        return self.session.get(self.url(path), timeout=timeout or self.timeout, **kwargs)
+
+    def post(self, path: str, timeout=None, **kwargs) -> requests.Response:
+        return self.session.post(self.url(path), timeout=timeout or self.timeout, **kwargs)
+
+    def check_health(self) -> bool:
+        """Probe /api/tags once and cache the result"""
+        try:
+            response = self.get('/api/tags', timeout=(OLLAMA_CONFIG['connect_timeout'], 1.0))
+            self.healthy = response.status_code == 200
+        except requests.exceptions.RequestException:
+            self.healthy = False
+        self.last_health_check = time.time()
+        return self.healthy
+
+    def start_health_checks(self, interval: Optional[float] = None):
+        """Probe the server every interval seconds in a background thread"""
+        if self._health_thread is not None:
+            return
+        interval = interval or OLLAMA_CONFIG['health_check_interval']
+        self._health_stop.clear()
+
+        def probe():
+            while not self._health_stop.is_set():
+                self.check_health()
+                self._health_stop.wait(interval)
+
+        self._health_thread = threading.Thread(target=probe, name="ollama-health", daemon=True)
+        self._health_thread.start()
+
+    def close(self):
+        self._health_stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join(timeout=2)
+            self._health_thread = None
+        self.session.close()
@@ -18,7 +18,11 @@ from metrics_logger import get_logger, close_logger
 from performance_reporter import get_reporter, close_reporter
 from workers import STTWorker, LLMWorker, TTSWorker
 from workers.vision_worker import VisionWorker
+from workers.llm_worker import FALLBACK_RESPONSES
 from agent_state import AgentStateManager, AgentState
+from playback_tracker import PlaybackTracker
+from cancellation import TurnManager
+from scheduler import DeadlineQueue
 
 
 class PlutoOrchestrator:
@@ -38,21 +42,33 @@ class PlutoOrchestrator:
         self.reporter = get_reporter()
         self.reporter.start_monitoring(interval=2.0)
         
+        # Metrics
+        self.metrics = get_logger()
+        
         # Queues
-        self.stt_to_llm_queue = queue.Queue(maxsize=QUEUE_CONFIG["max_size"])
+        self.stt_to_llm_queue = DeadlineQueue(maxsize=QUEUE_CONFIG["max_size"], metrics=self.metrics)
         self.llm_to_tts_queue = queue.Queue(maxsize=QUEUE_CONFIG["max_size"])
         self.vision_to_orchestrator_queue = queue.Queue(maxsize=QUEUE_CONFIG["max_size"])
         
-        # Metrics
-        self.metrics = get_logger()
-        
         # Agent state manager (NEW: Reflex agent behavior)
         self.agent_state = AgentStateManager()
         
+        # Speaker activity shared by TTS (publisher) and STT (echo gating)
+        self.playback = PlaybackTracker()
+        
+        # Cancellation tokens: one per turn, under one per locked-in session
+        self.turns = TurnManager()
+        
         # Workers (pass reporter for latency tracking)
-        self.stt_worker = STTWorker(self.stt_to_llm_queue, self.metrics, self.reporter)
+        self.stt_worker = STTWorker(self.stt_to_llm_queue, self.metrics, self.reporter, self.playback)
         self.llm_worker = LLMWorker(self.stt_to_llm_queue, self.llm_to_tts_queue, self.metrics, self.reporter)
-        self.tts_worker = TTSWorker(self.llm_to_tts_queue, self.metrics, self.reporter)
+        self.tts_worker = TTSWorker(self.llm_to_tts_queue, self.metrics, self.reporter, self.playback,
+                                    prewarm_phrases=list(FALLBACK_RESPONSES.values()))
+        self.stt_worker.on_barge_in = self._handle_barge_in
+        self.stt_worker.cancel_token = self.turns.session
+        
+        # A new person starts a new conversation
+        self.agent_state.add_reset_listener(self.llm_worker.clear_history)
         
         # Vision worker (optional)
         self.enable_vision = enable_vision
@@ -134,10 +150,18 @@ class PlutoOrchestrator:
         self.llm_to_tts_queue.get = self._wrap_tts_get
     
     def _wrap_stt_put(self, item, **kwargs):
-        """Track conversation start when STT produces transcript"""
-        self.conversation_start_time = time.time()
-        self.metrics.log_conversation_start()
-        self.reporter.log_conversation_event('conversation_start', f"User spoke: {item.get('text', '')[:50]}")
+        """Track conversation start when STT produces transcript
+        
+        Also starts the turn: its cancellation token travels with the
+        transcript through LLM and TTS. Messages are tagged with the locked
+        face so the scheduler can drop them once that person is gone.
+        """
+        item.setdefault('face_id', self.agent_state.locked_face_id)
+        if item.get('type') == 'transcript':
+            item.setdefault('cancel_token', self.turns.new_turn())
+            self.conversation_start_time = time.time()
+            self.metrics.log_conversation_start()
+            self.reporter.log_conversation_event('conversation_start', f"User spoke: {item.get('text', '')[:50]}")
         return self.original_stt_put(item, **kwargs)
     
     def _wrap_tts_get(self, **kwargs):
@@ -234,7 +258,11 @@ class PlutoOrchestrator:
         
         # State: IDLE - waiting for a face
         if self.agent_state.current_state == AgentState.IDLE:
-            if vision_state in ['face_locked', 'locked_tracking']:
+            if vision_state == 'face_detected':
+                # Someone is approaching: load the LLM while the lock settles
+                self.llm_worker.preload()
+            
+            elif vision_state in ['face_locked', 'locked_tracking']:
                 # New face detected and locked!
                 locked_face = event.get('locked_face')
                 if locked_face:
@@ -249,6 +277,7 @@ class PlutoOrchestrator:
                     
                     # Then immediately to LOCKED_IN (ready to greet)
                     self.agent_state.lock_face(locked_face['id'])
+                    self.stt_to_llm_queue.set_current_face(locked_face['id'])
                     self.agent_state.transition(
                         AgentState.LOCKED_IN,
                         "Ready to initiate conversation"
@@ -271,11 +300,14 @@ class PlutoOrchestrator:
                 )
                 self.reporter.log_conversation_event('face_lost', 'Person left')
                 
-                # Stop listening
+                # Stop listening and abandon everything in flight for this person
                 self.stt_worker.pause()
+                self._cancel_session('face_lost')
+                self.stt_to_llm_queue.set_current_face(None)
                 
                 # Reset after timeout
                 time.sleep(2.0)
+                self._cancel_session('reset')
                 self.agent_state.reset()
                 self.reporter.log_conversation_event('agent_reset', 'Ready for next person')
                 print("🔄 Ready for next person\n")
@@ -284,11 +316,30 @@ class PlutoOrchestrator:
                 # Person still here, continue normal operation
                 pass
     
+    def _handle_barge_in(self):
+        """
+        The user started talking over Pluto: stop speaking and generating
+        
+        Called from the STT thread. Cancelling the turns in flight aborts
+        the LLM request and stops TTS; the user's utterance is then recorded
+        from its pre-roll and becomes the next turn.
+        """
+        cancelled = self.turns.cancel_turns('barge_in')
+        self.reporter.log_conversation_event('barge_in', f"User interrupted ({cancelled} turn(s) cancelled)")
+    
+    def _cancel_session(self, reason: str):
+        """Cancel every turn of the current person and start a new session"""
+        self.turns.cancel_session(reason)
+        self.stt_worker.cancel_token = self.turns.session
+        self.reporter.log_conversation_event('session_cancelled', reason)
+    
     def _send_greeting(self):
         """
-        Send greeting message to LLM to initiate conversation
+        Greet the person who was just locked onto
         
-        This bypasses STT and directly queues a greeting prompt
+        Plays a pre-rendered greeting clip straight through TTS playback.
+        Without clips (disabled or pre-rendering failed) the greeting prompt
+        is queued to the LLM instead, bypassing STT.
         """
         # Check cooldown to avoid repeated greetings
         current_time = time.time()
@@ -304,13 +355,24 @@ class PlutoOrchestrator:
             "Initiating conversation"
         )
         
+        if VISION_CONFIG['greeting_prerendered']:
+            greeting_text = self.tts_worker.play_greeting(self.turns.new_turn())
+            if greeting_text is not None:
+                # The reply to the greeting needs it as context
+                self.llm_worker.add_assistant_message(greeting_text)
+                self.reporter.log_conversation_event('greeting_sent', greeting_text)
+                self._listen_after_greeting()
+                return
+        
         # Inject greeting into STT->LLM queue
         greeting_msg = {
             'type': 'transcript',
             'text': VISION_CONFIG['greeting_message'],
             'timestamp': current_time,
             'latency_ms': 0,
-            'source': 'vision_trigger'  # Mark as vision-initiated
+            'source': 'vision_trigger',  # Mark as vision-initiated
+            'cancel_token': self.turns.new_turn(),
+            'face_id': self.agent_state.locked_face_id
         }
         
         try:
@@ -320,19 +382,25 @@ class PlutoOrchestrator:
             # Log greeting event
             self.reporter.log_conversation_event('greeting_sent', VISION_CONFIG['greeting_message'])
             
-            # Transition to listening after greeting
-            self.agent_state.transition(
-                AgentState.LISTENING,
-                "Waiting for user response"
-            )
-            
-            # Resume STT to listen for response
-            self.stt_worker.resume()
+            self._listen_after_greeting()
             
         except queue.Full:
             print("⚠️  Failed to queue greeting - queue full")
             self.reporter.log_warning("Failed to queue greeting - queue full")
     
+    def _listen_after_greeting(self):
+        """Start listening for the person's reply"""
+        # Transition to listening after greeting
+        self.agent_state.transition(
+            AgentState.LISTENING,
+            "Waiting for user response"
+        )
+        
+        # Resume STT to listen for response (within this person's session);
+        # echo gating ignores the greeting while it plays
+        self.stt_worker.cancel_token = self.turns.session
+        self.stt_worker.resume()
+    
     def get_status(self) -> dict:
         """Get orchestrator status"""
         status = {
@@ -342,6 +410,8 @@ class PlutoOrchestrator:
                 'stt_to_llm': self.stt_to_llm_queue.qsize(),
                 'llm_to_tts': self.llm_to_tts_queue.qsize()
             },
+            'stt_to_llm_dropped': dict(self.stt_to_llm_queue.drop_counts),
+            'stt_to_llm_partials_replaced': self.stt_to_llm_queue.partials_replaced,
             'conversations': self.metrics.conversation_count,
             'agent_state': self.agent_state.get_state_info()
         }
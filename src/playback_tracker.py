@@ -0,0 +1,113 @@
+"""
+🪐 Project Pluto - Playback Tracker
+Shared record of when Pluto's speaker is playing, so the microphone path
+can ignore Pluto's own voice
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+from config import AUDIO_CONFIG
+
+
+class PlaybackTracker:
+    """
+    Playback start/stop events published by the TTS worker
+
+    Keeps recent playback intervals (with wall-clock timestamps) so captured
+    audio can be checked against them, and lets listeners block until the
+    speaker has been quiet for the echo tail (room reverb, output latency).
+    """
+
+    def __init__(self, tail_ms: Optional[float] = None, history: int = 32):
+        """
+        Args:
+            tail_ms: Time after playback stops that still counts as echo
+            history: Number of past playback intervals kept
+        """
+        tail_ms = AUDIO_CONFIG['echo_tail_ms'] if tail_ms is None else tail_ms
+        self.tail = tail_ms / 1000
+        self.playing_since: Optional[float] = None
+        self.last_stop = 0.0
+
+        self._intervals = deque(maxlen=history)  # (start, stop) of finished playback
+        self._listeners: List[Callable[[str, float], None]] = []
+        self._cond = threading.Condition()
+
+    def add_listener(self, callback: Callable[[str, float], None]):
+        """Call callback('start' | 'stop', timestamp) on playback events"""
+        self._listeners.append(callback)
+
+    @property
+    def is_playing(self) -> bool:
+        return self.playing_since is not None
+
+    def started(self, timestamp: Optional[float] = None):
+        """Playback began (first sample written to the output device)"""
+        timestamp = timestamp or time.time()
+        with self._cond:
+            if self.playing_since is not None:
+                return
+            self.playing_since = timestamp
+            self._cond.notify_all()
+        self._notify('start', timestamp)
+
+    def stopped(self, timestamp: Optional[float] = None):
+        """
+        Playback ended
+
+        Args:
+            timestamp: When the last sample leaves the speaker (write time
+                plus the device's output latency)
+        """
+        timestamp = timestamp or time.time()
+        with self._cond:
+            if self.playing_since is None:
+                return
+            self._intervals.append((self.playing_since, timestamp))
+            self.playing_since = None
+            self.last_stop = timestamp
+            self._cond.notify_all()
+        self._notify('stop', timestamp)
+
+    def is_gated(self, now: Optional[float] = None) -> bool:
+        """True while playing or within the echo tail after playback"""
+        now = now or time.time()
+        return self.is_playing or now < self.last_stop + self.tail
+
+    def covers(self, timestamp: float) -> bool:
+        """Was the speaker playing (or ringing out) at this capture time?"""
+        with self._cond:
+            if self.playing_since is not None and timestamp >= self.playing_since:
+                return True
+            return any(start <= timestamp < stop + self.tail for start, stop in self._intervals)
+
+    def wait_until_quiet(self, timeout: float) -> bool:
+        """
+        Block until playback stopped and the echo tail has passed
+
+        Returns:
+            True if quiet, False on timeout
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                now = time.time()
+                if not self.is_gated(now):
+                    return True
+                if now >= deadline:
+                    return False
+
+                wait = deadline - now
+                if not self.is_playing:
+                    wait = min(wait, self.last_stop + self.tail - now)
+                self._cond.wait(wait)
+
+    def _notify(self, event: str, timestamp: float):
+        for callback in self._listeners:
+            try:
+                callback(event, timestamp)
+            except Exception as e:
+                print(f"⚠️  Playback listener error: {e}")
@@ -0,0 +1,106 @@
+"""
+🪐 Project Pluto - Response Cache
+Exact-match cache of LLM answers for questions that are asked over and over
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from config import OLLAMA_CONFIG
+
+
+# Openers and references that only make sense with the previous turns
+_FOLLOW_UP = re.compile(
+    r"^(and|but|so|also|then|what about|how about|why)\b"
+    r"|\b(it|its|that|this|those|these|they|them|he|she|him|her|there|again|more|else)\b"
+)
+
+
+def normalize_prompt(text: str) -> str:
+    """Lowercase words without punctuation (transcripts vary in both)"""
+    cleaned = "".join(c if c.isalnum() or c.isspace() or c == "'" else " " for c in text.lower())
+    return " ".join(cleaned.split())
+
+
+def is_follow_up(text: str) -> bool:
+    """Does this utterance refer back to the conversation ("what about tomorrow?")"""
+    return bool(_FOLLOW_UP.search(normalize_prompt(text)))
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of generated responses
+
+    Keys cover the normalized prompt, the system prompt, the model and the
+    sampling options, so changing any of them never serves an old answer.
+    Each entry remembers how long its generation took; a hit adds that to
+    saved_ms.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Args:
+            ttl: Seconds an answer stays valid
+            max_entries: Least recently used answers are evicted beyond this
+        """
+        self.ttl = OLLAMA_CONFIG['response_cache_ttl'] if ttl is None else ttl
+        self.max_entries = OLLAMA_CONFIG['response_cache_max_entries'] if max_entries is None else max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (text, created, generation_ms)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(prompt: str, system: str, model: str, options: dict) -> str:
+        material = json.dumps([normalize_prompt(prompt), system, model, options], sort_keys=True)
+        return hashlib.sha1(material.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response text, or None (counted as a miss)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_ms += entry[2]
+            return entry[0]
+
+    def put(self, key: str, text: str, generation_ms: float):
+        with self._lock:
+            self._entries[key] = (text, time.time(), generation_ms)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'saved_ms': self.saved_ms,
+        }
@@ -0,0 +1,220 @@
+"""
+🪐 Project Pluto - Deadline Scheduler
+Priority/deadline queue between STT/vision and the LLM worker
+"""
+
+import heapq
+import itertools
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from config import QUEUE_CONFIG
+
+
+# Lower runs first
+PRIORITIES = {'greeting': 0, 'transcript': 1, 'partial': 2}
+
+
+class DeadlineQueue:
+    """
+    Drop-in replacement for queue.Queue (put/get/task_done/qsize...) that
+    schedules instead of FIFO
+
+    - Each message gets a priority (greeting > transcript > partial) and a
+      deadline (its timestamp + the per-kind deadline in QUEUE_CONFIG)
+    - Messages past their deadline, belonging to a face other than
+      current_face, or whose turn was cancelled are dropped when reached
+    - Coalescing: a partial replaces the pending partial of the same
+      utterance; a final transcript replaces pending partials and is merged
+      into a pending transcript of the same face, so bursts become one turn
+    - drop_counts records every discarded message by reason; a partial
+      replaced by a newer one is routine and only counted in
+      partials_replaced
+    """
+
+    def __init__(self, maxsize: int = 0, metrics=None):
+        self.maxsize = maxsize
+        self.metrics = metrics
+        self.current_face: Optional[float] = None  # Locked face id; None = accept any
+
+        self.drop_counts: Dict[str, int] = defaultdict(int)
+        self.partials_replaced = 0
+        self.unfinished_tasks = 0
+
+        self._heap = []  # (priority, seq, item)
+        self._seq = itertools.count()
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+        self._all_tasks_done = threading.Condition(self._mutex)
+
+    # --- queue.Queue API -------------------------------------------------
+
+    def put(self, item: Dict[str, Any], block: bool = True, timeout: Optional[float] = None):
+        with self._not_full:
+            kind = self._kind(item)
+            item.setdefault('priority', PRIORITIES[kind])
+            item.setdefault('deadline', item.get('timestamp', time.time()) + QUEUE_CONFIG[f'{kind}_deadline_s'])
+
+            if self._coalesce(item, kind):
+                return
+
+            if self.maxsize > 0 and len(self._heap) >= self.maxsize:
+                self._purge()
+            if self.maxsize > 0:
+                deadline = None if timeout is None else time.time() + timeout
+                while len(self._heap) >= self.maxsize:
+                    if not block:
+                        raise queue.Full
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        raise queue.Full
+                    self._not_full.wait(remaining)
+
+            heapq.heappush(self._heap, (item['priority'], next(self._seq), item))
+            self.unfinished_tasks += 1
+            self._not_empty.notify()
+
+    def put_nowait(self, item: Dict[str, Any]):
+        return self.put(item, block=False)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Next useful message: highest priority, oldest first, skipping stale ones"""
+        with self._not_empty:
+            deadline = None if timeout is None else time.time() + timeout
+            while True:
+                while not self._heap:
+                    if not block:
+                        raise queue.Empty
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        raise queue.Empty
+                    self._not_empty.wait(remaining)
+
+                _, _, item = heapq.heappop(self._heap)
+                self._not_full.notify()
+
+                reason = self._stale_reason(item, time.time())
+                if reason is None:
+                    return item
+                self._drop(item, reason)
+
+    def get_nowait(self) -> Dict[str, Any]:
+        return self.get(block=False)
+
+    def task_done(self):
+        with self._all_tasks_done:
+            if self.unfinished_tasks <= 0:
+                raise ValueError('task_done() called too many times')
+            self._finish_task()
+
+    def join(self):
+        with self._all_tasks_done:
+            while self.unfinished_tasks:
+                self._all_tasks_done.wait()
+
+    def qsize(self) -> int:
+        with self._mutex:
+            return len(self._heap)
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= self.qsize()
+
+    # --- Scheduling ----------------------------------------------------------
+
+    def set_current_face(self, face_id: Optional[float]):
+        """Messages from any other face become stale (dropped now and when reached)"""
+        with self._mutex:
+            self.current_face = face_id
+            self._purge()
+
+    @staticmethod
+    def _kind(item: Dict[str, Any]) -> str:
+        if item.get('source') == 'vision_trigger':
+            return 'greeting'
+        if item.get('type') == 'partial_transcript':
+            return 'partial'
+        return 'transcript'
+
+    def _stale_reason(self, item: Dict[str, Any], now: float) -> Optional[str]:
+        token = item.get('cancel_token')
+        if token is not None and token.cancelled:
+            return 'cancelled'
+        face_id = item.get('face_id')
+        if face_id is not None and face_id != self.current_face:
+            return 'stale_face'
+        if now > item['deadline']:
+            return 'expired'
+        return None
+
+    def _coalesce(self, item: Dict[str, Any], kind: str) -> bool:
+        """Fold item into pending messages; True if it was absorbed"""
+        if kind == 'partial':
+            for _, _, pending in self._heap:
+                if (pending.get('type') == 'partial_transcript'
+                        and pending.get('utterance_id') == item.get('utterance_id')):
+                    pending.update(item)  # Newer partial of the same utterance
+                    self.partials_replaced += 1
+                    return True
+            return False
+
+        if kind == 'transcript':
+            # The final transcript supersedes its partials
+            partials = [entry for entry in self._heap if entry[2].get('type') == 'partial_transcript']
+            for entry in partials:
+                self._heap.remove(entry)
+                self._drop(entry[2], 'coalesced')
+            heapq.heapify(self._heap)
+
+            for _, _, pending in self._heap:
+                if self._kind(pending) == 'transcript' and pending.get('face_id') == item.get('face_id'):
+                    # The user said more before we got to it: answer both as one turn
+                    old_token = pending.get('cancel_token')
+                    new_token = item.get('cancel_token')
+                    pending.update({**item, 'text': f"{pending['text']} {item['text']}"})
+                    if new_token is None:
+                        pending['cancel_token'] = old_token
+                    elif old_token is not None and old_token is not new_token:
+                        old_token.cancel('coalesced')  # The merged turn runs under the newest token
+                    self._count('coalesced')
+                    return True
+        return False
+
+    def _purge(self):
+        """Drop everything already stale (called with the mutex held)"""
+        now = time.time()
+        keep = []
+        for entry in self._heap:
+            reason = self._stale_reason(entry[2], now)
+            if reason is None:
+                keep.append(entry)
+            else:
+                self._drop(entry[2], reason)
+        if len(keep) != len(self._heap):
+            self._heap = keep
+            heapq.heapify(self._heap)
+            self._not_full.notify_all()
+
+    def _drop(self, item: Dict[str, Any], reason: str):
+        """Discard a queued message (called with the mutex held)"""
+        self._count(reason)
+        self._finish_task()
+        age = time.time() - item.get('timestamp', time.time())
+        print(f"   🗑️  Dropped {self._kind(item)} ({reason}, {age:.1f}s old)")
+
+    def _count(self, reason: str):
+        self.drop_counts[reason] += 1
+        if self.metrics:
+            self.metrics.log_metric('queue', 'dropped', 1, 'count', {'reason': reason})
+
+    def _finish_task(self):
+        self.unfinished_tasks -= 1
+        if self.unfinished_tasks <= 0:
+            self.unfinished_tasks = 0
+            self._all_tasks_done.notify_all()
@@ -0,0 +1,189 @@
+"""
+🪐 Project Pluto - Semantic Cache
+Answers paraphrases of earlier questions by embedding similarity
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from config import OLLAMA_CONFIG
+
+
+def embed(client, text: str, timeout: float = 5.0) -> Optional[np.ndarray]:
+    """Embed text with Ollama's embeddings endpoint (None on failure)
+
+    Args:
+        client: OllamaClient whose pooled session is used
+        text: Text to embed
+        timeout: Read timeout in seconds
+    """
+    try:
+        response = client.post(
+            '/api/embeddings',
+            json={'model': OLLAMA_CONFIG['embedding_model'], 'prompt': text},
+            timeout=(OLLAMA_CONFIG['connect_timeout'], timeout)
+        )
+        response.raise_for_status()
+        vector = response.json().get('embedding')
+    except Exception as e:
+        print(f"⚠️  Embedding failed: {e}")
+        return None
+    return np.asarray(vector, dtype=np.float32) if vector else None
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache over past questions
+
+    Question embeddings are unit-normalized rows of one contiguous float32
+    matrix, memory-mapped from the cache directory (vectors.f32) with the
+    questions and answers alongside (entries.json). A lookup is a single
+    matrix-vector product: cosine similarity against every stored question.
+    When full, the oldest entry is overwritten.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_entries: Optional[int] = None,
+                 threshold: Optional[float] = None):
+        """
+        Args:
+            directory: On-disk index (None = OLLAMA_CONFIG['semantic_cache_dir'])
+            max_entries: Rows in the matrix
+            threshold: Minimum cosine similarity for a hit
+        """
+        self.directory = Path(directory or OLLAMA_CONFIG['semantic_cache_dir'])
+        self.max_entries = OLLAMA_CONFIG['semantic_cache_max_entries'] if max_entries is None else max_entries
+        self.threshold = OLLAMA_CONFIG['semantic_cache_threshold'] if threshold is None else threshold
+
+        self.hits = 0
+        self.misses = 0
+
+        # Entries only match for the same embedding model, LLM and system prompt
+        self._signature = {
+            'embedding_model': OLLAMA_CONFIG['embedding_model'],
+            'model': OLLAMA_CONFIG['model'],
+            'system_prompt': OLLAMA_CONFIG['system_prompt'],
+        }
+        self.dim: Optional[int] = None
+        self.vectors: Optional[np.memmap] = None
+        self.entries = []  # {'question', 'answer', 'created'} per row
+        self._next = 0  # Row overwritten next once full
+        self._lock = threading.Lock()
+
+        self._load()
+
+    def lookup(self, vector: np.ndarray) -> Optional[dict]:
+        """
+        Best stored answer for a question embedding
+
+        Returns:
+            Dict with answer, question and similarity if above the threshold
+        """
+        with self._lock:
+            if self.vectors is None or not self.entries or len(vector) != self.dim:
+                self.misses += 1
+                return None
+
+            similarities = self.vectors[:len(self.entries)] @ _unit(vector)
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return {**self.entries[best], 'similarity': similarity}
+
+    def add(self, vector: np.ndarray, question: str, answer: str):
+        """Store a question embedding with its answer"""
+        with self._lock:
+            if self.vectors is None or len(vector) != self.dim:
+                self._create(len(vector))
+
+            entry = {'question': question, 'answer': answer, 'created': time.time()}
+            if len(self.entries) < self.max_entries:
+                row = len(self.entries)
+                self.entries.append(entry)
+            else:
+                row = self._next
+                self.entries[row] = entry
+                self._next = (self._next + 1) % self.max_entries
+
+            self.vectors[row] = _unit(vector)
+            self.vectors.flush()
+            self._save_entries()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+        }
+
+    def _load(self):
+        """Open the index written by an earlier run (discarded if its signature differs)"""
+        meta_path = self.directory / "entries.json"
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+
+        if meta.get('signature') != self._signature or meta.get('max_entries') != self.max_entries:
+            print("   Semantic cache: model or prompt changed, starting empty")
+            return
+
+        try:
+            self.dim = meta['dim']
+            self.vectors = np.memmap(self.directory / "vectors.f32", dtype=np.float32, mode='r+',
+                                     shape=(self.max_entries, self.dim))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Semantic cache index unreadable: {e}")
+            self.dim = self.vectors = None
+            return
+
+        self.entries = meta['entries']
+        self._next = meta.get('next', 0)
+        print(f"   Semantic cache: {len(self.entries)} answer(s) loaded")
+
+    def _create(self, dim: int):
+        """Start a new (empty) index for embeddings of this size"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.vectors = np.memmap(self.directory / "vectors.f32", dtype=np.float32, mode='w+',
+                                 shape=(self.max_entries, dim))
+        self.entries = []
+        self._next = 0
+
+    def _save_entries(self):
+        meta = {
+            'signature': self._signature,
+            'dim': self.dim,
+            'max_entries': self.max_entries,
+            'next': self._next,
+            'entries': self.entries,
+        }
+        path = self.directory / "entries.json"
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(meta), encoding='utf-8')
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"⚠️  Semantic cache write failed: {e}")
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
@@ -0,0 +1,348 @@
+"""
+🪐 Project Pluto - STT Engines
+Interchangeable speech-to-text backends behind one interface
+"""
+
+import copy
+import dataclasses
+import json
+import time
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+from config import AUDIO_CONFIG, WHISPER_CONFIG
+from log_mel import IncrementalLogMel, HOP_LENGTH
+
+# Backends are optional - only the configured one has to be installed.
+# This module is imported inside the inference process only.
+try:
+    import torch
+    import whisper
+except ImportError:
+    torch = whisper = None
+
+try:
+    import faster_whisper
+except ImportError:
+    faster_whisper = None
+
+try:
+    import vosk
+except ImportError:
+    vosk = None
+
+
+class STTEngine:
+    """
+    Base class for speech-to-text backends
+
+    Subclasses implement load() and _run(). transcribe() adds timings and
+    the real-time factor (processing time / audio duration; < 1.0 is faster
+    than real time) so engines can be compared on the same hardware.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.sample_rate = AUDIO_CONFIG['sample_rate']
+
+    def load(self):
+        """Load the model (called once, inside the inference process)"""
+        raise NotImplementedError
+
+    def warmup(self) -> dict:
+        """Run one pass on 1 second of silence"""
+        return self.transcribe(np.zeros(self.sample_rate, dtype=np.float32))
+
+    def transcribe(self, audio: np.ndarray, utterance_id: Optional[int] = None,
+                   beam: bool = False) -> dict:
+        """
+        Transcribe float32 audio in [-1.0, 1.0]
+
+        Args:
+            audio: Samples at AUDIO_CONFIG['sample_rate']
+            utterance_id: Set when audio is a growing utterance that is decoded
+                repeatedly; engines may reuse per-utterance state and always
+                decode greedily
+            beam: Use beam search instead of greedy decoding
+
+        Returns:
+            Dict with text, confidence (0-1), timings (ms) and rtf. Whisper-based
+            engines also report avg_logprob, compression_ratio and no_speech_prob.
+        """
+        start = time.time()
+        result = self._run(audio, utterance_id, beam)
+        total_ms = (time.time() - start) * 1000
+
+        timings = result.setdefault('timings', {})
+        timings['total_ms'] = total_ms
+        duration = len(audio) / self.sample_rate
+        result['rtf'] = (total_ms / 1000) / duration if duration > 0 else 0.0
+        result['engine'] = self.name
+        return result
+
+    def _run(self, audio: np.ndarray, utterance_id: Optional[int], beam: bool) -> dict:
+        """Engine-specific transcription: returns at least text and confidence"""
+        raise NotImplementedError
+
+
+class WhisperEngine(STTEngine):
+    """
+    openai-whisper (PyTorch) - reference accuracy, slowest on CPU
+
+    Short utterances skip Whisper's 30 s padding: the encoder runs on a mel
+    window rounded up to one of a few bucket lengths (encoder cost scales with
+    window length), and the decoder cross-attends to the shorter output.
+    """
+
+    name = "whisper"
+
+    def __init__(self):
+        super().__init__()
+        self.model = None
+        self.mel = None
+        self._mel_utterance = None
+
+        self.short_encoder = WHISPER_CONFIG['short_encoder']
+        self._bucket_models = {}  # encoder frames -> model view with matching n_audio_ctx
+
+    def load(self):
+        if whisper is None:
+            raise ImportError("openai-whisper is not installed")
+
+        torch.set_num_threads(WHISPER_CONFIG['num_threads'])
+        self.model = whisper.load_model(WHISPER_CONFIG['model_size'], device=WHISPER_CONFIG['device'])
+        self.mel = IncrementalLogMel(whisper.audio.mel_filters('cpu', self.model.dims.n_mels).numpy())
+
+    def _run(self, audio: np.ndarray, utterance_id: Optional[int], beam: bool) -> dict:
+        if utterance_id is not None:
+            return self._decode_incremental(audio, utterance_id)
+
+        if self.short_encoder and self._bucket_frames(len(audio) // HOP_LENGTH):
+            # Short utterance: a single window, no need for transcribe()'s seeking
+            start = time.time()
+            self.mel.reset()
+            self._mel_utterance = None
+            spec = self.mel.log_mel(audio)
+            mel_ms = (time.time() - start) * 1000
+
+            stats = self._decode_mel(spec, beam)
+            stats['timings'] = {'mel_ms': mel_ms}
+            return stats
+
+        # beam_size/best_of of None make whisper decode greedily
+        result = self.model.transcribe(
+            audio,
+            language=WHISPER_CONFIG['language'],
+            task=WHISPER_CONFIG['task'],
+            fp16=WHISPER_CONFIG['fp16'],
+            temperature=WHISPER_CONFIG['temperature'],
+            best_of=WHISPER_CONFIG['best_of'] if beam else None,
+            beam_size=WHISPER_CONFIG['beam_size'] if beam else None
+        )
+
+        return _segment_stats(result['text'], [
+            (s['avg_logprob'], s['compression_ratio'], s['no_speech_prob'])
+            for s in result.get('segments', [])
+        ])
+
+    def _decode_incremental(self, audio: np.ndarray, utterance_id: int) -> dict:
+        """Greedy decode using the incremental log-mel of this utterance"""
+        start = time.time()
+        if self._mel_utterance != utterance_id:
+            self.mel.reset()
+            self._mel_utterance = utterance_id
+
+        spec = self.mel.log_mel(audio)
+        mel_ms = (time.time() - start) * 1000
+
+        stats = self._decode_mel(spec, beam=False)
+        stats['timings'] = {'mel_ms': mel_ms}
+        return stats
+
+    def _decode_mel(self, spec: np.ndarray, beam: bool) -> dict:
+        """
+        Decode one normalized log-mel window
+
+        The window is the smallest encoder bucket that fits the audio, or
+        Whisper's full 30 s window. Padding uses the value of silent frames.
+        """
+        bucket = self._bucket_frames(spec.shape[1]) if self.short_encoder else None
+        n_frames = bucket or whisper.audio.N_FRAMES
+
+        segment = np.full((spec.shape[0], n_frames), IncrementalLogMel.padding_value(spec), dtype=np.float32)
+        used = min(spec.shape[1], n_frames)
+        segment[:, :used] = spec[:, :used]
+        segment = torch.from_numpy(segment).to(self.model.device)
+
+        options = whisper.DecodingOptions(
+            language=WHISPER_CONFIG['language'],
+            task=WHISPER_CONFIG['task'],
+            fp16=WHISPER_CONFIG['fp16'],
+            temperature=0.0,
+            beam_size=WHISPER_CONFIG['beam_size'] if beam else None,
+            without_timestamps=True
+        )
+
+        if bucket:
+            features = self._encode(segment)
+            result = whisper.decode(self._bucket_model(features.shape[0]), features, options)
+        else:
+            result = whisper.decode(self.model, segment, options)
+
+        stats = _segment_stats(result.text, [(result.avg_logprob, result.compression_ratio, result.no_speech_prob)])
+        stats['window_s'] = n_frames * HOP_LENGTH / self.sample_rate
+        return stats
+
+    def _bucket_frames(self, n_frames: int) -> Optional[int]:
+        """Smallest bucket (in mel frames) holding n_frames plus the tail pad"""
+        frames_per_second = self.sample_rate // HOP_LENGTH
+        needed = n_frames + int(WHISPER_CONFIG['encoder_tail_pad_s'] * frames_per_second)
+        for seconds in WHISPER_CONFIG['encoder_buckets_s']:
+            bucket = int(seconds * frames_per_second)
+            if needed <= bucket:
+                return bucket
+        return None
+
+    def _encode(self, mel: "torch.Tensor") -> "torch.Tensor":
+        """
+        AudioEncoder.forward for a window shorter than 30 s
+
+        Same layers, with the positional embedding sliced to the window
+        (the stock forward asserts the full 1500-position shape).
+        """
+        encoder = self.model.encoder
+        with torch.no_grad():
+            x = torch.nn.functional.gelu(encoder.conv1(mel.unsqueeze(0)))
+            x = torch.nn.functional.gelu(encoder.conv2(x))
+            x = x.permute(0, 2, 1)
+            x = (x + encoder.positional_embedding[:x.shape[1]]).to(x.dtype)
+            for block in encoder.blocks:
+                x = block(x)
+            return encoder.ln_post(x)[0]
+
+    def _bucket_model(self, n_audio_ctx: int):
+        """
+        Shallow model view whose dims match the bucketed encoder output
+
+        whisper.decode() treats input shaped (n_audio_ctx, n_audio_state) as
+        precomputed audio features and skips the encoder; all weights are shared.
+        """
+        if n_audio_ctx not in self._bucket_models:
+            view = copy.copy(self.model)
+            view.dims = dataclasses.replace(self.model.dims, n_audio_ctx=n_audio_ctx)
+            self._bucket_models[n_audio_ctx] = view
+        return self._bucket_models[n_audio_ctx]
+
+
+class FasterWhisperEngine(STTEngine):
+    """faster-whisper (CTranslate2) - same Whisper weights, int8 on CPU"""
+
+    name = "faster-whisper"
+
+    def __init__(self):
+        super().__init__()
+        self.model = None
+
+    def load(self):
+        if faster_whisper is None:
+            raise ImportError("faster-whisper is not installed (pip install faster-whisper)")
+
+        self.model = faster_whisper.WhisperModel(
+            WHISPER_CONFIG['model_size'],
+            device=WHISPER_CONFIG['device'],
+            compute_type=WHISPER_CONFIG['compute_type'],
+            cpu_threads=WHISPER_CONFIG['num_threads']
+        )
+
+    def _run(self, audio: np.ndarray, utterance_id: Optional[int], beam: bool) -> dict:
+        # Growing utterances are re-decoded often: always greedy
+        beam_size = WHISPER_CONFIG['beam_size'] if beam and utterance_id is None else 1
+
+        segments, _ = self.model.transcribe(
+            audio,
+            language=WHISPER_CONFIG['language'],
+            task=WHISPER_CONFIG['task'],
+            beam_size=beam_size,
+            best_of=WHISPER_CONFIG['best_of'],
+            temperature=WHISPER_CONFIG['temperature'],
+            without_timestamps=True,
+            condition_on_previous_text=False
+        )
+        segments = list(segments)  # The generator does the decoding
+
+        return _segment_stats("".join(s.text for s in segments), [
+            (s.avg_logprob, s.compression_ratio, s.no_speech_prob) for s in segments
+        ])
+
+
+class VoskEngine(STTEngine):
+    """Vosk (Kaldi) - small streaming model, fastest, lower accuracy"""
+
+    name = "vosk"
+
+    def __init__(self):
+        super().__init__()
+        self.model = None
+
+    def load(self):
+        if vosk is None:
+            raise ImportError("vosk is not installed (pip install vosk)")
+
+        model_path = WHISPER_CONFIG['vosk_model_path']
+        if not Path(model_path).exists():
+            raise FileNotFoundError(f"Vosk model not found: {model_path} (run install_vosk.ps1)")
+
+        vosk.SetLogLevel(-1)
+        self.model = vosk.Model(model_path)
+
+    def _run(self, audio: np.ndarray, utterance_id: Optional[int], beam: bool) -> dict:
+        recognizer = vosk.KaldiRecognizer(self.model, self.sample_rate)
+        recognizer.SetWords(True)
+
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+        recognizer.AcceptWaveform(pcm)
+        result = json.loads(recognizer.FinalResult())
+
+        words = result.get('result', [])
+        return {
+            'text': result.get('text', '').strip(),
+            'confidence': float(np.mean([w['conf'] for w in words])) if words else 0.0,
+        }
+
+
+def _segment_stats(text: str, segments: list) -> dict:
+    """
+    Combine per-segment Whisper decoding statistics
+
+    Args:
+        text: Transcribed text
+        segments: (avg_logprob, compression_ratio, no_speech_prob) per segment
+    """
+    if not segments:
+        return {'text': text.strip(), 'confidence': 0.0}
+
+    logprobs, ratios, no_speech = zip(*segments)
+    avg_logprob = float(np.mean(logprobs))
+    return {
+        'text': text.strip(),
+        'confidence': float(np.exp(avg_logprob)),
+        'avg_logprob': avg_logprob,
+        'compression_ratio': float(max(ratios)),
+        'no_speech_prob': float(no_speech[0]),
+    }
+
+
+ENGINES = {
+    WhisperEngine.name: WhisperEngine,
+    FasterWhisperEngine.name: FasterWhisperEngine,
+    VoskEngine.name: VoskEngine,
+}
+
+
+def create_engine(name: str) -> STTEngine:
+    """Instantiate an engine by its config name"""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown STT engine '{name}' (choose from {', '.join(ENGINES)})")
+    return ENGINES[name]()
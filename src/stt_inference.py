@@ -0,0 +1,241 @@
+"""
+🪐 Project Pluto - Out-of-Process STT Inference
+Runs the STT engine in a separate process so it doesn't compete for the
+GIL with vision, the LLM client and TTS
+"""
+
+import multiprocessing as mp
+import signal
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+import numpy as np
+
+from config import AUDIO_CONFIG, WHISPER_CONFIG
+
+
+class STTProcess:
+    """
+    STT engine (see stt_engines.py) hosted in a child process
+
+    Audio is passed through a shared-memory float32 buffer; requests and
+    results (text, confidence, timings, rtf) go over a pipe. If the child
+    dies or hangs it is restarted and the request fails with None.
+    """
+
+    def __init__(self, metrics=None, engine_name: Optional[str] = None):
+        self.metrics = metrics
+        self.engine_name = engine_name or WHISPER_CONFIG['engine']
+        self.process = None
+        self.conn = None
+        self.restart_count = 0
+        self.load_time_ms = 0.0
+
+        sample_rate = AUDIO_CONFIG['sample_rate']
+        self.capacity = int((AUDIO_CONFIG['max_phrase_duration'] + 1.0) * sample_rate)
+        self.shm = None
+        self.audio_buffer = None
+
+        self._ctx = mp.get_context('spawn')
+        self._lock = threading.Lock()
+
+    def start(self) -> bool:
+        """Start the inference process and wait until the model is loaded"""
+        if self.shm is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.capacity * 4)
+            self.audio_buffer = np.ndarray((self.capacity,), dtype=np.float32, buffer=self.shm.buf)
+
+        parent_conn, child_conn = self._ctx.Pipe()
+        self.process = self._ctx.Process(
+            target=_serve,
+            args=(child_conn, self.shm.name, self.capacity, self.engine_name),
+            name="pluto-stt-inference",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+        start = time.time()
+        if not self.conn.poll(WHISPER_CONFIG['process_start_timeout']):
+            print("❌ STT inference process did not start in time")
+            self._kill()
+            return False
+
+        try:
+            reply = self.conn.recv()
+        except EOFError:
+            print("❌ STT inference process exited during startup")
+            self._kill()
+            return False
+
+        if reply.get('status') != 'ready':
+            print(f"❌ STT inference process failed: {reply.get('error')}")
+            self._kill()
+            return False
+
+        self.load_time_ms = (time.time() - start) * 1000
+        print(f"   STT inference process ready: {self.engine_name} (pid {self.process.pid}, {self.load_time_ms:.0f}ms)")
+        return True
+
+    def stop(self):
+        """Stop the inference process and release shared memory"""
+        if self.conn is not None:
+            try:
+                self.conn.send({'cmd': 'stop'})
+            except (BrokenPipeError, OSError):
+                pass
+
+        if self.process is not None:
+            self.process.join(timeout=2.0)
+        self._kill()
+
+        if self.shm is not None:
+            self.audio_buffer = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def restart(self) -> bool:
+        """Kill and restart the inference process"""
+        self._kill()
+        self.restart_count += 1
+        print(f"🔁 Restarting STT inference process (restart #{self.restart_count})")
+        if self.metrics:
+            self.metrics.log_metric('stt', 'process_restart', 1, 'count')
+        return self.start()
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def _kill(self):
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=1.0)
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def warmup(self) -> Optional[dict]:
+        """Run a warmup pass inside the child"""
+        return self._request('warmup', np.zeros(AUDIO_CONFIG['sample_rate'], dtype=np.float32))
+
+    def transcribe(self, audio: np.ndarray, utterance_id: Optional[int] = None,
+                   beam: bool = False) -> Optional[dict]:
+        """
+        Transcribe float32 audio (see STTEngine.transcribe)
+
+        Args:
+            audio: Samples to transcribe
+            utterance_id: Set for repeated decodes of a growing utterance
+            beam: Use beam search instead of greedy decoding
+        """
+        return self._request('transcribe', audio, utterance_id=utterance_id, beam=beam)
+
+    def _request(self, cmd: str, audio: np.ndarray, **fields) -> Optional[dict]:
+        """
+        Send one request to the child
+
+        Returns:
+            Reply dict ('text', 'confidence', 'timings', 'rtf') or None on failure
+        """
+        with self._lock:
+            if not self.is_alive() and not self.restart():
+                return None
+
+            n_samples = min(len(audio), self.capacity)
+            self.audio_buffer[:n_samples] = audio[:n_samples]
+
+            start = time.time()
+            try:
+                self.conn.send({'cmd': cmd, 'n_samples': n_samples, **fields})
+                if not self.conn.poll(WHISPER_CONFIG['process_timeout']):
+                    print("❌ STT inference process timed out")
+                    self.restart()
+                    return None
+                reply = self.conn.recv()
+            except (EOFError, BrokenPipeError, OSError) as e:
+                print(f"❌ STT inference process crashed: {e}")
+                self.restart()
+                return None
+
+            if reply.get('status') != 'ok':
+                print(f"❌ STT inference error: {reply.get('error')}")
+                return None
+
+            reply['timings']['roundtrip_ms'] = (time.time() - start) * 1000
+            return reply
+
+
+def beam_fallback_reason(reply: dict) -> Optional[str]:
+    """
+    Decide whether a greedy result is unreliable enough to re-decode with beam search
+
+    Uses Whisper's own quality signals (same thresholds as whisper.transcribe's
+    temperature fallback). Engines that don't report them never fall back.
+
+    Returns:
+        Reason string, or None if the greedy result can be used
+    """
+    if 'avg_logprob' not in reply or not reply['text']:
+        return None
+
+    if reply['compression_ratio'] > WHISPER_CONFIG['compression_ratio_threshold']:
+        return 'compression_ratio'  # Repetition loop
+
+    if reply['avg_logprob'] < WHISPER_CONFIG['logprob_threshold']:
+        if reply['no_speech_prob'] > WHISPER_CONFIG['no_speech_threshold']:
+            return None  # Probably not speech - beam search won't help
+        return 'avg_logprob'
+
+    return None
+
+
+def _serve(conn, shm_name: str, capacity: int, engine_name: str):
+    """Child process main loop: load the engine once, then serve requests"""
+    # Ctrl+C goes to the whole process group - let the parent shut us down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    try:
+        # Imported here so the backends (torch etc.) only load in the child
+        from stt_engines import create_engine
+
+        # Spawned children share the parent's resource tracker, and the
+        # parent unlinks the segment on stop()
+        shm = shared_memory.SharedMemory(name=shm_name)
+        audio_buffer = np.ndarray((capacity,), dtype=np.float32, buffer=shm.buf)
+
+        engine = create_engine(engine_name)
+        engine.load()
+
+    except Exception as e:
+        conn.send({'status': 'error', 'error': str(e)})
+        return
+
+    conn.send({'status': 'ready'})
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+
+        cmd = request['cmd']
+        if cmd == 'stop':
+            break
+
+        try:
+            if cmd == 'warmup':
+                result = engine.warmup()
+            else:
+                audio = audio_buffer[:request['n_samples']]
+                result = engine.transcribe(audio, request.get('utterance_id'), request.get('beam', False))
+
+            conn.send({'status': 'ok', **result})
+
+        except Exception as e:
+            conn.send({'status': 'error', 'error': str(e)})
+
+    shm.close()
@@ -0,0 +1,114 @@
+"""
+🪐 Project Pluto - Text Segmenter
+Splits LLM output into speakable sentence/clause chunks for TTS
+"""
+
+import re
+from typing import List, Optional
+
+from config import OLLAMA_CONFIG
+
+
+# Sentence end: terminal punctuation (optionally followed by quotes/brackets)
+# and then whitespace. Requiring the whitespace means "3.5" or "e.g." in the
+# middle of a token never splits, and we wait for the next token to confirm.
+_SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+')
+
+# Clause end: only used once the pending text is long enough to be worth
+# speaking on its own
+_CLAUSE_END = re.compile(r'[,;:]\s+')
+
+# Common abbreviations that end with a period but do not end a sentence
+_ABBREVIATIONS = {'mr.', 'mrs.', 'ms.', 'dr.', 'st.', 'vs.', 'etc.', 'e.g.', 'i.e.', 'no.', 'a.m.', 'p.m.'}
+
+
+class SentenceSegmenter:
+    """
+    Incremental sentence/clause splitter for streamed LLM tokens
+
+    Tokens are fed in as they arrive; complete chunks are returned as soon
+    as a boundary is seen so TTS can start speaking before generation ends.
+    """
+
+    def __init__(self, min_chars: Optional[int] = None, clause_min_chars: Optional[int] = None):
+        """
+        Args:
+            min_chars: Minimum chunk length before a sentence boundary splits
+            clause_min_chars: Minimum chunk length before a clause boundary splits
+        """
+        self.min_chars = min_chars if min_chars is not None else OLLAMA_CONFIG['stream_min_chunk_chars']
+        self.clause_min_chars = (clause_min_chars if clause_min_chars is not None
+                                 else OLLAMA_CONFIG['stream_clause_min_chars'])
+        self.buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add streamed text and return any chunks that are now complete
+
+        Args:
+            text: Next token(s) from the LLM
+
+        Returns:
+            List of complete chunks (may be empty)
+        """
+        self.buffer += text
+        chunks = []
+
+        while True:
+            cut = self._find_boundary()
+            if cut is None:
+                break
+            chunk = self.buffer[:cut].strip()
+            self.buffer = self.buffer[cut:]
+            if chunk:
+                chunks.append(chunk)
+
+        return chunks
+
+    def flush(self) -> Optional[str]:
+        """Return whatever text is left once the stream has ended"""
+        chunk = self.buffer.strip()
+        self.buffer = ""
+        return chunk or None
+
+    def _find_boundary(self) -> Optional[int]:
+        """Find the end index of the first complete chunk in the buffer"""
+        for match in _SENTENCE_END.finditer(self.buffer):
+            end = match.end()
+            if len(self.buffer[:end].strip()) < self.min_chars:
+                continue
+            if self._ends_with_abbreviation(self.buffer[:match.start() + 1]):
+                continue
+            return end
+
+        if len(self.buffer) >= self.clause_min_chars:
+            for match in _CLAUSE_END.finditer(self.buffer):
+                if len(self.buffer[:match.end()].strip()) >= self.clause_min_chars:
+                    return match.end()
+
+        return None
+
+    @staticmethod
+    def _ends_with_abbreviation(text: str) -> bool:
+        """Check if text ends with a known abbreviation (e.g. "Dr.")"""
+        words = text.split()
+        return bool(words) and words[-1].lower() in _ABBREVIATIONS
+
+
+def split_sentences(text: str, min_chars: Optional[int] = None) -> List[str]:
+    """
+    Split complete text into speakable chunks
+
+    Args:
+        text: Full response text
+        min_chars: Minimum chunk length (shorter sentences are merged forward)
+
+    Returns:
+        List of chunks in order
+    """
+    segmenter = SentenceSegmenter(min_chars=min_chars, clause_min_chars=10 ** 9)
+    chunks = segmenter.feed(text + " ")
+    tail = segmenter.flush()
+    if tail:
+        chunks.append(tail)
+    return chunks
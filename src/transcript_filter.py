@@ -0,0 +1,92 @@
+"""
+🪐 Project Pluto - Transcript Filter
+Drops phantom transcripts (Whisper hallucinations on noise) before they
+reach the LLM
+"""
+
+import re
+from typing import Optional
+
+from config import TRANSCRIPT_FILTER_CONFIG
+
+
+class TranscriptFilter:
+    """
+    Gate between STT and the LLM queue
+
+    Uses the engine's decoding statistics (when it reports them), the word
+    rate relative to the audio duration and a blocklist of phrases Whisper
+    is known to produce from silence or noise. Phrases a person might also
+    really say ("thank you") are only dropped when the segment is not
+    confidently speech.
+    """
+
+    def __init__(self, config: Optional[dict] = None):
+        self.config = config or TRANSCRIPT_FILTER_CONFIG
+        self.blocklist = {self.normalize(phrase) for phrase in self.config['blocklist']}
+        self.suspect_phrases = {self.normalize(phrase) for phrase in self.config['suspect_phrases']}
+        self.drop_counts = {}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercase, strip punctuation, collapse whitespace"""
+        return " ".join(re.sub(r"[^\w\s']", " ", text.lower()).split())
+
+    def check(self, reply: dict, duration: float) -> Optional[str]:
+        """
+        Decide whether a transcript should be dropped
+
+        Args:
+            reply: Engine result (text plus optional avg_logprob,
+                compression_ratio and no_speech_prob)
+            duration: Length of the transcribed audio in seconds
+
+        Returns:
+            Drop reason, or None to pass the transcript on
+        """
+        reason = self._reason(reply, duration)
+        if reason:
+            self.drop_counts[reason] = self.drop_counts.get(reason, 0) + 1
+        return reason
+
+    def _reason(self, reply: dict, duration: float) -> Optional[str]:
+        config = self.config
+        text = self.normalize(reply.get('text', ""))
+
+        if not text:
+            return 'empty_transcript'
+
+        if not config['enabled']:
+            return None
+
+        if text in self.blocklist:
+            return 'blocklist'
+
+        if text in self.suspect_phrases and self._low_confidence(reply, duration):
+            return 'blocklist'
+
+        if 'avg_logprob' in reply:
+            if (reply['no_speech_prob'] > config['no_speech_prob']
+                    and reply['avg_logprob'] < config['logprob_threshold']):
+                return 'no_speech'
+
+            if reply['avg_logprob'] < config['min_avg_logprob']:
+                return 'low_logprob'
+
+            if reply['compression_ratio'] > config['max_compression_ratio']:
+                return 'repetition'
+
+        if duration > 0 and len(text.split()) / duration > config['max_words_per_second']:
+            return 'word_rate'
+
+        return None
+
+    def _low_confidence(self, reply: dict, duration: float) -> bool:
+        """Does the segment look like noise rather than clear speech?"""
+        config = self.config
+        if duration < config['suspect_min_duration']:
+            return True
+        if 'avg_logprob' not in reply:
+            return False  # Engine reports no statistics
+        return (reply['no_speech_prob'] > config['no_speech_prob']
+                or reply['avg_logprob'] < config['logprob_threshold'])
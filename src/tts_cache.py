@@ -0,0 +1,171 @@
+"""
+🪐 Project Pluto - TTS Cache
+Synthesized PCM for phrases Pluto says repeatedly, kept in memory (LRU)
+and persisted on disk across restarts
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import PIPER_CONFIG
+
+
+class TTSCache:
+    """
+    Phrase-level PCM cache
+
+    Keys combine the normalized text with the voice model and synthesis
+    parameters, so changing the voice never plays stale audio. Memory holds
+    the most recently used clips under a byte budget; every clip is also
+    written to the cache directory as raw PCM (<key>.pcm), bounded by a
+    separate disk budget, and loaded back on a memory miss.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None,
+                 disk_max_bytes: Optional[int] = None):
+        """
+        Args:
+            directory: On-disk store (None = PIPER_CONFIG['cache_dir'])
+            max_bytes: Memory budget for PCM
+            disk_max_bytes: Disk budget for PCM
+        """
+        self.directory = Path(directory or PIPER_CONFIG['cache_dir'])
+        self.max_bytes = PIPER_CONFIG['cache_max_bytes'] if max_bytes is None else max_bytes
+        self.disk_max_bytes = PIPER_CONFIG['cache_disk_max_bytes'] if disk_max_bytes is None else disk_max_bytes
+        self.max_chars = PIPER_CONFIG['cache_max_chars']
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_bytes = 0
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._disk: Dict[str, int] = {}  # key -> size, oldest first
+        self._lock = threading.Lock()
+        self._voice = "|".join(str(PIPER_CONFIG[k]) for k in
+                               ('model_path', 'voice', 'length_scale', 'noise_scale', 'noise_w'))
+
+        self._scan_disk()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse whitespace (case and punctuation change the prosody, so they stay)"""
+        return re.sub(r'\s+', ' ', text).strip()
+
+    def cacheable(self, text: str) -> bool:
+        """Only short phrases are worth caching - long answers rarely repeat"""
+        return 0 < len(self.normalize(text)) <= self.max_chars
+
+    def key(self, text: str) -> str:
+        return hashlib.sha1(f"{self._voice}|{self.normalize(text)}".encode('utf-8')).hexdigest()
+
+    def get(self, text: str) -> Optional[bytes]:
+        """PCM for text, or None (counted as a miss)"""
+        key = self.key(text)
+        with self._lock:
+            pcm = self._entries.get(key)
+            if pcm is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return pcm
+
+            pcm = self._read_disk(key)
+            if pcm is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._remember(key, pcm)
+            return pcm
+
+    def put(self, text: str, pcm: bytes):
+        """Store PCM for text in memory and on disk"""
+        if not pcm or not self.cacheable(text):
+            return
+
+        key = self.key(text)
+        with self._lock:
+            self._remember(key, pcm)
+            if key not in self._disk:
+                self._write_disk(key, pcm)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._entries),
+            'memory_bytes': self.memory_bytes,
+            'disk_entries': len(self._disk),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+        }
+
+    def _remember(self, key: str, pcm: bytes):
+        """Insert into the in-memory LRU and evict down to the budget"""
+        if len(pcm) > self.max_bytes:
+            return
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.memory_bytes -= len(old)
+
+        self._entries[key] = pcm
+        self.memory_bytes += len(pcm)
+
+        while self.memory_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+
+    def _scan_disk(self):
+        """Index clips persisted by earlier runs (oldest first, by mtime)"""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            files = sorted(self.directory.glob("*.pcm"), key=lambda p: p.stat().st_mtime)
+        except OSError as e:
+            print(f"⚠️  TTS cache directory unavailable: {e}")
+            return
+
+        for path in files:
+            self._disk[path.stem] = path.stat().st_size
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if key not in self._disk:
+            return None
+        path = self.directory / f"{key}.pcm"
+        try:
+            pcm = path.read_bytes()
+            os.utime(path)  # Recently used clips are evicted last
+        except OSError:
+            self._disk.pop(key, None)
+            return None
+
+        self._disk[key] = self._disk.pop(key)
+        return pcm
+
+    def _write_disk(self, key: str, pcm: bytes):
+        """Write atomically, then evict the oldest clips over the disk budget"""
+        path = self.directory / f"{key}.pcm"
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_bytes(pcm)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"⚠️  TTS cache write failed: {e}")
+            return
+
+        self._disk[key] = len(pcm)
+        while sum(self._disk.values()) > self.disk_max_bytes and len(self._disk) > 1:
+            oldest = next(iter(self._disk))
+            self._disk.pop(oldest)
+            try:
+                (self.directory / f"{oldest}.pcm").unlink()
+            except OSError:
+                pass
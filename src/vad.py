@@ -0,0 +1,237 @@
+"""
+🪐 Project Pluto - Voice Activity Detection
+Vectorized spectral VAD with noise-floor calibration and silence trimming
+"""
+
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+from config import AUDIO_CONFIG
+
+# Optional neural VAD (Silero-style ONNX model)
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+
+class SpectralVAD:
+    """
+    Per-frame speech/non-speech decisions
+
+    Features (computed for many frames at once with NumPy):
+    - Band energy: power in the speech band (300-3400 Hz) relative to the
+      learned noise floor, in dB
+    - Spectral flatness: geometric / arithmetic mean of the band spectrum.
+      Voiced speech is harmonic (low flatness); fans, hiss and key clicks
+      are broadband (high flatness)
+    - Zero-crossing rate: rejects hiss-like frames
+
+    Starting speech needs all three to agree; continuing speech only needs
+    band energy above a lower SNR (hysteresis, so unvoiced consonants and
+    soft word endings don't cut the phrase).
+    """
+
+    def __init__(self, sample_rate: Optional[int] = None):
+        self.sample_rate = sample_rate or AUDIO_CONFIG['sample_rate']
+        self.frame_samples = int(self.sample_rate * AUDIO_CONFIG['frame_ms'] / 1000)
+        self.n_fft = 1 << (self.frame_samples - 1).bit_length()
+
+        self.window = np.hanning(self.frame_samples).astype(np.float32)
+        freqs = np.fft.rfftfreq(self.n_fft, 1.0 / self.sample_rate)
+        low, high = AUDIO_CONFIG['vad_band_hz']
+        self.band = (freqs >= low) & (freqs <= high)
+
+        # Noise floor (band energy, dB) - learned by calibrate() and adapted
+        # on non-speech frames afterwards
+        self.noise_db: Optional[float] = None
+        self.noise_flatness: Optional[float] = None
+        self.calibrated = False
+
+        self.model = None
+        self._model_state = None
+        self._model_buffer = np.zeros(0, dtype=np.float32)
+        self._model_prob = 0.0
+        self._load_model()
+
+    def _load_model(self):
+        """Load the optional ONNX VAD model if configured and available"""
+        model_path = AUDIO_CONFIG.get('vad_model_path')
+        if not model_path or not Path(model_path).exists() or onnxruntime is None:
+            return
+
+        try:
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = 1
+            self.model = onnxruntime.InferenceSession(model_path, sess_options=options,
+                                                      providers=['CPUExecutionProvider'])
+            self._model_state = np.zeros((2, 1, 128), dtype=np.float32)
+            print(f"   VAD model loaded: {Path(model_path).name}")
+        except Exception as e:
+            print(f"⚠️  VAD model failed to load, using spectral VAD only: {e}")
+            self.model = None
+
+    def frames(self, audio: np.ndarray) -> np.ndarray:
+        """View audio as (n_frames, frame_samples), dropping the partial tail"""
+        n = len(audio) // self.frame_samples
+        return audio[:n * self.frame_samples].reshape(n, self.frame_samples)
+
+    def features(self, frames: np.ndarray) -> dict:
+        """
+        Compute per-frame features
+
+        Args:
+            frames: (n_frames, frame_samples) int16 or float array
+
+        Returns:
+            Dict of (n_frames,) arrays: energy (mean |x|), band_db, flatness, zcr
+        """
+        x = frames.astype(np.float32)
+
+        spectrum = np.fft.rfft(x * self.window, n=self.n_fft, axis=1)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2)[:, self.band] + 1e-10
+
+        band_db = 10.0 * np.log10(power.mean(axis=1))
+        flatness = np.exp(np.log(power).mean(axis=1)) / power.mean(axis=1)
+
+        signs = np.signbit(x)
+        zcr = (signs[:, 1:] != signs[:, :-1]).mean(axis=1)
+
+        return {
+            'energy': np.abs(x).mean(axis=1),
+            'band_db': band_db,
+            'flatness': flatness,
+            'zcr': zcr,
+        }
+
+    def classify(self, frames: np.ndarray, in_speech: bool = False) -> np.ndarray:
+        """
+        Vectorized per-frame decisions (no noise-floor adaptation)
+
+        Args:
+            frames: (n_frames, frame_samples) array
+            in_speech: Use the relaxed continuation rule instead of the start rule
+
+        Returns:
+            (n_frames,) boolean array
+        """
+        return self.decide(self.features(frames), in_speech)
+
+    def decide(self, f: dict, in_speech: bool = False) -> np.ndarray:
+        """
+        Per-frame speech decisions from precomputed features (no noise-floor
+        adaptation)
+
+        Args:
+            f: Output of features()
+            in_speech: Use the relaxed continuation rule instead of the start rule
+
+        Returns:
+            (n_frames,) boolean array
+        """
+        noise_db = self.noise_db if self.noise_db is not None else float(np.min(f['band_db']))
+        snr = f['band_db'] - noise_db
+
+        if in_speech:
+            return snr > AUDIO_CONFIG['vad_end_snr_db']
+
+        return ((snr > AUDIO_CONFIG['vad_start_snr_db'])
+                & (f['energy'] > AUDIO_CONFIG['energy_threshold'])
+                & (f['flatness'] < AUDIO_CONFIG['vad_flatness_max'])
+                & (f['zcr'] < AUDIO_CONFIG['vad_zcr_max']))
+
+    def is_speech(self, frame: np.ndarray, in_speech: bool = False) -> bool:
+        """
+        Decide one frame and adapt the noise floor on non-speech frames
+
+        Args:
+            frame: frame_samples samples
+            in_speech: True while inside a phrase (relaxed continuation rule)
+        """
+        frame = frame[np.newaxis, :]
+        f = self.features(frame)
+
+        if self.noise_db is None:
+            self.noise_db = float(f['band_db'][0])
+
+        speech = bool(self.decide(f, in_speech)[0])
+
+        if self.model is not None:
+            prob = self._model_probability(frame[0])
+            threshold = AUDIO_CONFIG['vad_model_threshold']
+            if in_speech:
+                speech = speech and prob > threshold * 0.5
+            else:
+                speech = speech and prob > threshold
+
+        if not in_speech and not speech:
+            alpha = AUDIO_CONFIG['noise_floor_alpha']
+            self.noise_db = (1 - alpha) * self.noise_db + alpha * float(f['band_db'][0])
+
+        return speech
+
+    def _model_probability(self, frame: np.ndarray) -> float:
+        """Run the ONNX model on 512-sample windows, returning the latest probability"""
+        window = 512 if self.sample_rate == 16000 else 256
+        self._model_buffer = np.concatenate([self._model_buffer, frame.astype(np.float32) / 32768.0])
+
+        while len(self._model_buffer) >= window:
+            chunk = self._model_buffer[:window][np.newaxis, :]
+            self._model_buffer = self._model_buffer[window:]
+            try:
+                prob, self._model_state = self.model.run(None, {
+                    'input': chunk,
+                    'state': self._model_state,
+                    'sr': np.array(self.sample_rate, dtype=np.int64),
+                })
+                self._model_prob = float(np.asarray(prob).reshape(-1)[0])
+            except Exception as e:
+                print(f"⚠️  VAD model error, disabling: {e}")
+                self.model = None
+                return 1.0
+
+        return self._model_prob
+
+    def calibrate(self, audio: np.ndarray):
+        """
+        Learn the room's noise floor from audio recorded while nobody speaks
+
+        Args:
+            audio: int16 samples of background noise (~1s)
+        """
+        frames = self.frames(audio)
+        if len(frames) == 0:
+            return
+
+        f = self.features(frames)
+        self.noise_db = float(np.median(f['band_db']))
+        self.noise_flatness = float(np.median(f['flatness']))
+        self.calibrated = True
+
+    def trim(self, audio: np.ndarray, pad_ms: Optional[int] = None, leading: bool = True) -> np.ndarray:
+        """
+        Remove leading/trailing non-speech frames
+
+        Args:
+            audio: int16 samples of one phrase
+            pad_ms: Audio kept around the first/last speech frame
+            leading: Also trim the start (False keeps the start sample fixed,
+                e.g. when features for the phrase were already computed)
+
+        Returns:
+            Trimmed audio (empty if no frame contains speech)
+        """
+        frames = self.frames(audio)
+        if len(frames) == 0:
+            return audio[:0]
+
+        speech = np.flatnonzero(self.classify(frames, in_speech=True))
+        if len(speech) == 0:
+            return audio[:0]
+
+        pad_ms = AUDIO_CONFIG['vad_trim_pad_ms'] if pad_ms is None else pad_ms
+        pad = int(self.sample_rate * pad_ms / 1000)
+        start = max(0, speech[0] * self.frame_samples - pad) if leading else 0
+        end = min(len(audio), (speech[-1] + 1) * self.frame_samples + pad)
+        return audio[start:end]
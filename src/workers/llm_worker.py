@@ -3,6 +3,7 @@
 Language Model inference using Ollama + Qwen2.5
 """
 
+import json
 import queue
 import threading
 import time
@@ -10,6 +11,22 @@ import requests
 from typing import Optional, List, Dict
 
 from config import OLLAMA_CONFIG, WORKER_CONFIG, QUEUE_CONFIG
+from text_segmenter import SentenceSegmenter
+from cancellation import CancellationToken
+from response_cache import ResponseCache, is_follow_up
+from semantic_cache import SemanticCache, embed
+from ollama_client import OllamaClient
+from conversation_history import ConversationHistory
+from circuit_breaker import CircuitBreaker
+
+
+# Spoken when generation fails (also pre-synthesized by the TTS cache)
+FALLBACK_RESPONSES = {
+    'timeout': "I'm thinking too slowly. Please try again.",
+    'request_error': "I encountered an error. Please try again.",
+    'error': "Something went wrong.",
+    'unavailable': "Sorry, I can't think right now. Please try again in a moment.",
+}
 
 
 class LLMWorker:
@@ -23,11 +40,39 @@ class LLMWorker:
         self.running = False
         self.thread = None
         
-        self.conversation_history: List[Dict[str, str]] = []
+        # Token-budgeted history; older turns are summarized in the background
+        summarizer = self._summarize if OLLAMA_CONFIG['summarize_history'] else None
+        self.history = ConversationHistory(summarizer)
         self.warmup_complete = False
         self.processing_count = 0
         
-        self.api_url = f"{OLLAMA_CONFIG['host']}/api/generate"
+        # Token of the turn being generated; cancelling it aborts the
+        # streaming request
+        self.current_token: Optional[CancellationToken] = None
+        self.cancelled_count = 0
+        
+        # Exact-match answers for repeated questions (opt-in)
+        self.response_cache = ResponseCache() if OLLAMA_CONFIG['response_cache_enabled'] else None
+        # Answers for paraphrases of earlier questions (opt-in)
+        self.semantic_cache = SemanticCache() if OLLAMA_CONFIG['semantic_cache_enabled'] else None
+        self.last_error: Optional[str] = None  # Set when the last generation fell back
+        # How long the last generation waited on Ollama: request time, or when
+        # streaming the worse of time to first piece and longest gap between pieces
+        self.last_backend_s = 0.0
+        
+        # Pooled keep-alive connections to Ollama (shared by every call)
+        self.client = OllamaClient()
+        
+        # Model residency: Ollama keeps the model loaded for keep_alive after
+        # each request; a face showing up preloads it
+        self.model_loaded_until = 0.0
+        self.last_load_ms: Optional[float] = None  # Model load time reported for the last request
+        self._first_turn_pending = True  # Next generated turn is a session's first
+        self._preloading = threading.Lock()
+        self._preload_retry_at = 0.0  # No new preload before this after one failed
+        
+        # Fast-fail while Ollama is failing or hanging
+        self.breaker = CircuitBreaker(self._probe_backend, self._on_circuit_change)
         
         print("🧠 LLM Worker initializing...")
     
@@ -36,7 +81,7 @@ class LLMWorker:
         try:
             print(f"   Checking Ollama server at: {OLLAMA_CONFIG['host']}")
             
-            response = requests.get(f"{OLLAMA_CONFIG['host']}/api/tags", timeout=5)
+            response = self.client.get('/api/tags', timeout=(OLLAMA_CONFIG['connect_timeout'], 5))
             
             if response.status_code != 200:
                 print(f"⚠️  Ollama server not responding properly")
@@ -62,7 +107,7 @@ class LLMWorker:
                     'temperature': OLLAMA_CONFIG['temperature'],
                     'top_p': OLLAMA_CONFIG['top_p'],
                     'max_tokens': OLLAMA_CONFIG['max_tokens'],
-                    'max_history': OLLAMA_CONFIG['max_history'],
+                    'context_token_budget': OLLAMA_CONFIG['context_token_budget'],
                     'stream': OLLAMA_CONFIG['stream']
                 }
                 self.reporter.log_model_info('llm', model_name, model_details)
@@ -104,6 +149,7 @@ class LLMWorker:
         self.warmup()
         
         self.running = True
+        self.client.start_health_checks()
         self.thread = threading.Thread(target=self._process_queue, daemon=True)
         self.thread.start()
         print("🧠 LLM Worker started")
@@ -117,6 +163,9 @@ class LLMWorker:
         if self.thread:
             self.thread.join(timeout=5)
         
+        self.breaker.stop()
+        self.client.close()
+        
         print("✅ LLM Worker stopped")
     
     def _process_queue(self):
@@ -129,7 +178,13 @@ class LLMWorker:
             try:
                 task = self.input_queue.get(timeout=QUEUE_CONFIG["get_timeout"])
                 
-                if task['type'] == 'transcript':
+                token = task.get('cancel_token') or CancellationToken()
+                
+                if token.cancelled:
+                    # Turn was cancelled while queued (face lost, barge-in)
+                    print(f"   ✋ Dropped queued turn ({token.reason})")
+                
+                elif task['type'] == 'transcript':
                     user_text = task['text']
                     source = task.get('source', 'stt')
                     
@@ -139,9 +194,24 @@ class LLMWorker:
                         print(f"   🤔 Thinking about: \"{user_text}\"")
                     
                     start_time = time.time()
-                    response_text = self._generate(user_text)
+                    turn_id = self.processing_count + 1
+                    epoch = self.history.epoch
+                    
+                    self.current_token = token
+                    try:
+                        response_text = self._respond(user_text, turn_id, start_time, token)
+                    finally:
+                        self.current_token = None
                     latency = (time.time() - start_time) * 1000
                     
+                    if token.cancelled:
+                        # Time from cancel() until the request was torn down
+                        reclaim = (time.time() - token.cancelled_at) * 1000
+                        print(f"   ✋ Generation cancelled ({token.reason}), stopped after {reclaim:.0f}ms")
+                        self.cancelled_count += 1
+                        if self.metrics:
+                            self.metrics.log_metric('llm', 'cancel_latency', reclaim, 'ms', {'reason': token.reason})
+                    
                     print(f"   💭 Response: \"{response_text}\"")
                     
                     if self.metrics:
@@ -150,18 +220,27 @@ class LLMWorker:
                     if self.reporter:
                         self.reporter.log_latency('llm', latency)
                     
+                    # In streaming mode the text was already sent chunk by chunk;
+                    # 'response_end' just marks the end of the turn for TTS
                     self.output_queue.put({
-                        'type': 'response',
+                        'type': 'response_end' if OLLAMA_CONFIG['stream'] else 'response',
                         'text': response_text,
+                        'turn_id': turn_id,
+                        'cancel_token': token,
                         'timestamp': time.time(),
                         'latency_ms': latency
                     })
                     
-                    self.conversation_history.append({'role': 'user', 'content': user_text})
-                    self.conversation_history.append({'role': 'assistant', 'content': response_text})
+                    self._log_first_turn(latency)
                     
-                    if len(self.conversation_history) > OLLAMA_CONFIG["max_history"] * 2:
-                        self.conversation_history = self.conversation_history[-OLLAMA_CONFIG["max_history"] * 2:]
+                    # Not recorded if the history was cleared meanwhile (new person),
+                    # when a fallback phrase was spoken, or when the turn was cut
+                    # off (the user never heard the whole answer)
+                    if response_text and self.last_error is None and not token.cancelled:
+                        self.history.extend([
+                            {'role': 'user', 'content': user_text},
+                            {'role': 'assistant', 'content': response_text}
+                        ], epoch)
                     
                     self.processing_count += 1
                 
@@ -175,38 +254,424 @@ class LLMWorker:
                     if self.metrics:
                         self.metrics.log_error('llm', 'processing_error', str(e))
     
-    def _generate(self, prompt: str, max_tokens: Optional[int] = None) -> str:
-        """Generate response from Ollama"""
-        try:
-            payload = {
+    def _respond(self, user_text: str, turn_id: int, start_time: float, token: CancellationToken) -> str:
+        """
+        Answer one transcript: from the exact-match or semantic cache if
+        possible, otherwise generated by Ollama (and cached if it succeeded)
+        """
+        self.last_error = None
+        self.last_load_ms = None  # Only a generated turn reports a load time
+        
+        # Answers that may depend on earlier turns are never cached
+        cacheable = not (len(self.history) and is_follow_up(user_text))
+        
+        cache_key = None
+        if cacheable and self.response_cache is not None:
+            cache_key = ResponseCache.key(user_text, OLLAMA_CONFIG['system_prompt'],
+                                          OLLAMA_CONFIG['model'], self._options())
+            cached = self.response_cache.get(cache_key)
+            if self.metrics:
+                self.metrics.log_metric('llm', 'cache_hit', 1.0 if cached is not None else 0.0, 'ratio',
+                                        {'saved_ms': self.response_cache.saved_ms})
+            if cached is not None:
+                print(f"   ⚡ Cached response ({self.response_cache.saved_ms:.0f}ms saved so far)")
+                return self._send_cached(cached, turn_id, start_time, token)
+        
+        # Embedding is an Ollama call too: skip it unless the backend is healthy
+        vector = None
+        if cacheable and self.semantic_cache is not None and self.breaker.state == CircuitBreaker.CLOSED:
+            embed_start = time.time()
+            vector = embed(self.client, user_text)
+            if vector is not None:
+                lookup_start = time.time()
+                match = self.semantic_cache.lookup(vector)
+                lookup_ms = (time.time() - lookup_start) * 1000
+                if self.metrics:
+                    self.metrics.log_metric('llm', 'semantic_cache_hit', 1.0 if match else 0.0, 'ratio',
+                                            {'lookup_ms': lookup_ms,
+                                             'embed_ms': (lookup_start - embed_start) * 1000})
+                if match is not None:
+                    print(f"   ⚡ Semantic cache: \"{match['question']}\" ({match['similarity']:.2f})")
+                    return self._send_cached(match['answer'], turn_id, start_time, token)
+        
+        if not self.breaker.allow():
+            # Backend is down: answer instantly instead of waiting for a timeout
+            self.last_error = 'unavailable'
+            print("   🔌 LLM circuit open - answering with fallback")
+            return self._send_cached(FALLBACK_RESPONSES['unavailable'], turn_id, start_time, token)
+        
+        if OLLAMA_CONFIG['stream']:
+            response_text = self._generate_stream(user_text, turn_id, start_time, token)
+        else:
+            response_text = self._generate(user_text)
+        
+        if token.cancelled:
+            self.breaker.release()
+        elif self.last_error is not None:
+            self.breaker.record_failure(self.last_error)
+        else:
+            # Only time spent waiting on Ollama (not embedding or TTS backpressure)
+            self.breaker.record_success(self.last_backend_s)
+        
+        if response_text and self.last_error is None and not token.cancelled:
+            if cache_key is not None:
+                self.response_cache.put(cache_key, response_text, (time.time() - start_time) * 1000)
+            if vector is not None:
+                self.semantic_cache.add(vector, user_text, response_text)
+        
+        return response_text
+    
+    def _send_cached(self, text: str, turn_id: int, start_time: float, token: CancellationToken) -> str:
+        """Forward a cached answer to TTS in one chunk (streaming mode)"""
+        if OLLAMA_CONFIG['stream']:
+            self.output_queue.put({
+                'type': 'response_chunk',
+                'text': text,
+                'turn_id': turn_id,
+                'cancel_token': token,
+                'index': 0,
+                'timestamp': time.time(),
+                'latency_ms': (time.time() - start_time) * 1000
+            })
+        return text
+    
+    @staticmethod
+    def _options(max_tokens: Optional[int] = None) -> dict:
+        """Sampling options; deterministic mode makes answers repeatable (and cacheable)"""
+        options = {
+            'temperature': OLLAMA_CONFIG['temperature'],
+            'top_p': OLLAMA_CONFIG['top_p'],
+            'num_predict': max_tokens or OLLAMA_CONFIG['max_tokens'],
+            'num_ctx': OLLAMA_CONFIG['num_ctx']  # Fixed, so Ollama never reloads the model to resize
+        }
+        if OLLAMA_CONFIG['deterministic']:
+            options['temperature'] = 0.0
+            options['seed'] = OLLAMA_CONFIG['seed']
+        return options
+    
+    def _request(self, prompt: str, stream: bool, max_tokens: Optional[int] = None):
+        """
+        Endpoint and payload for one generation
+        
+        Chat mode sends the system prompt, the conversation so far and the new
+        message to /api/chat. The messages only ever grow at the end (until the
+        history is trimmed), so Ollama finds the previous turn's prompt in its
+        KV cache and only prefills the new message.
+        
+        Returns:
+            (path, payload)
+        """
+        if not OLLAMA_CONFIG['chat_mode']:
+            return '/api/generate', {
                 'model': OLLAMA_CONFIG['model'],
                 'prompt': prompt,
                 'system': OLLAMA_CONFIG['system_prompt'],
-                'stream': False,
-                'options': {
-                    'temperature': OLLAMA_CONFIG['temperature'],
-                    'num_predict': max_tokens or OLLAMA_CONFIG['max_tokens']
-                }
+                'stream': stream,
+                'keep_alive': self._keep_alive(),
+                'options': self._options(max_tokens)
             }
+        
+        messages = [{'role': 'system', 'content': OLLAMA_CONFIG['system_prompt']}]
+        messages.extend(self.history.messages())
+        messages.append({'role': 'user', 'content': prompt})
+        
+        return '/api/chat', {
+            'model': OLLAMA_CONFIG['model'],
+            'messages': messages,
+            'stream': stream,
+            'keep_alive': self._keep_alive(),
+            'options': self._options(max_tokens)
+        }
+    
+    @staticmethod
+    def _response_text(data: dict) -> str:
+        """Generated text of one /api/generate or /api/chat reply (or stream line)"""
+        if 'message' in data:
+            return data['message'].get('content', '')
+        return data.get('response', '')
+    
+    def _probe_backend(self) -> bool:
+        """Recovery probe while the circuit is open: generate a single token"""
+        try:
+            response = self.client.post('/api/generate', json={
+                'model': OLLAMA_CONFIG['model'],
+                'prompt': "Hi",
+                'stream': False,
+                'keep_alive': self._keep_alive(),
+                'options': {'num_predict': 1}
+            }, timeout=(OLLAMA_CONFIG['connect_timeout'], OLLAMA_CONFIG['breaker_probe_timeout_s']))
+            return response.status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+    
+    def _on_circuit_change(self, old: str, new: str, reason: str):
+        if self.metrics:
+            self.metrics.log_metric('llm', 'circuit_state', CircuitBreaker.STATE_VALUES[new], 'state',
+                                    {'from': old, 'to': new, 'reason': reason})
+        if self.reporter:
+            self.reporter.log_conversation_event('llm_circuit', f"{old} → {new}: {reason}")
+    
+    @staticmethod
+    def _keep_alive() -> int:
+        """keep_alive for a request: the model unloads after this long idle (frees RAM)"""
+        return OLLAMA_CONFIG['keep_alive']
+    
+    def _mark_loaded(self):
+        """A request succeeded: the model stays loaded for keep_alive from now"""
+        keep_alive = self._keep_alive()
+        self.model_loaded_until = time.time() + keep_alive if keep_alive >= 0 else float('inf')
+    
+    def is_model_warm(self) -> bool:
+        """Is the model still loaded from a recent request (as far as we know)"""
+        return time.time() < self.model_loaded_until
+    
+    def preload(self):
+        """
+        Load the model in the background before it is needed
+        
+        Called when vision first sees a face, before the lock threshold is
+        reached: the load overlaps with locking and the greeting instead of
+        delaying the first answer. A request without a prompt only loads the
+        model. Does nothing if the model is warm, a preload is running, the
+        last one failed less than preload_retry_s ago or the circuit is not
+        closed.
+        """
+        if (self.is_model_warm() or time.time() < self._preload_retry_at
+                or self.breaker.state != CircuitBreaker.CLOSED):
+            return
+        if not self._preloading.acquire(blocking=False):
+            return
+        
+        def load():
+            try:
+                start = time.time()
+                response = self.client.post('/api/generate', json={
+                    'model': OLLAMA_CONFIG['model'],
+                    'keep_alive': self._keep_alive()
+                })
+                response.raise_for_status()
+                self._mark_loaded()
+                
+                load_ms = response.json().get('load_duration', 0) / 1e6
+                print(f"   🔥 LLM preloaded ({load_ms:.0f}ms load, {(time.time() - start) * 1000:.0f}ms total)")
+                if self.metrics:
+                    self.metrics.log_metric('llm', 'preload', load_ms, 'ms')
+            except Exception as e:
+                self._preload_retry_at = time.time() + OLLAMA_CONFIG['preload_retry_s']
+                print(f"⚠️  LLM preload failed: {e}")
+            finally:
+                self._preloading.release()
+        
+        threading.Thread(target=load, name="llm-preload", daemon=True).start()
+    
+    def _log_first_turn(self, latency: float):
+        """Log a session's first generated turn as cold (model had to load) or warm"""
+        if not self._first_turn_pending or self.last_load_ms is None:
+            return
+        self._first_turn_pending = False
+        
+        cold = self.last_load_ms >= OLLAMA_CONFIG['cold_load_threshold_ms']
+        print(f"   {'🧊 Cold' if cold else '🔥 Warm'} first turn: {latency:.0f}ms (model load {self.last_load_ms:.0f}ms)")
+        if self.metrics:
+            self.metrics.log_metric('llm', 'first_turn_cold' if cold else 'first_turn_warm', latency, 'ms',
+                                    {'load_ms': self.last_load_ms})
+    
+    def _log_prefill(self, data: dict):
+        """Log prompt evaluation from the final reply (small when the prefix was cached)"""
+        self.last_load_ms = data.get('load_duration', 0) / 1e6
+        if not self.metrics or 'prompt_eval_duration' not in data:
+            return
+        self.metrics.log_metric('llm', 'prefill', data['prompt_eval_duration'] / 1e6, 'ms', {
+            'prompt_tokens': data.get('prompt_eval_count', 0),
+            'history_tokens': self.history.tokens()
+        })
+    
+    def _generate(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        """Generate response from Ollama"""
+        self.last_error = None
+        self.last_load_ms = None
+        try:
+            path, payload = self._request(prompt, stream=False, max_tokens=max_tokens)
             
-            response = requests.post(self.api_url, json=payload, timeout=OLLAMA_CONFIG['timeout'])
+            request_start = time.time()
+            response = self.client.post(path, json=payload)
             response.raise_for_status()
+            self.last_backend_s = time.time() - request_start
             
             result = response.json()
-            return result.get('response', '').strip()
+            self._mark_loaded()
+            self._log_prefill(result)
+            return self._response_text(result).strip()
             
         except requests.exceptions.Timeout:
-            return "I'm thinking too slowly. Please try again."
+            self.last_error = 'timeout'
         except requests.exceptions.RequestException as e:
             print(f"❌ Ollama request failed: {e}")
-            return "I encountered an error. Please try again."
+            self.last_error = 'request_error'
         except Exception as e:
             print(f"❌ Generation failed: {e}")
-            return "Something went wrong."
+            self.last_error = 'error'
+        return FALLBACK_RESPONSES[self.last_error]
+    
+    def _generate_stream(self, prompt: str, turn_id: int, start_time: float,
+                         token: Optional[CancellationToken] = None) -> str:
+        """
+        Stream a response from Ollama, forwarding each sentence to TTS as it completes
+        
+        Ollama returns NDJSON: one object per line with the next piece of text
+        and 'done': true on the last line. Cancelling the token closes the
+        response, which also unblocks a read waiting for the next line.
+        
+        Returns:
+            Full response text (what was generated before cancellation)
+        """
+        token = token or CancellationToken()
+        self.last_error = None
+        self.last_load_ms = None
+        segmenter = SentenceSegmenter()
+        parts = []
+        chunk_index = 0
+        self.last_backend_s = 0.0
+        
+        def emit(chunk: str):
+            nonlocal chunk_index
+            if chunk_index == 0:
+                first_latency = (time.time() - start_time) * 1000
+                print(f"   ⚡ First chunk after {first_latency:.0f}ms")
+                if self.metrics:
+                    self.metrics.log_metric('llm', 'first_chunk_latency', first_latency, 'ms')
+            self.output_queue.put({
+                'type': 'response_chunk',
+                'text': chunk,
+                'turn_id': turn_id,
+                'cancel_token': token,
+                'index': chunk_index,
+                'timestamp': time.time(),
+                'latency_ms': (time.time() - start_time) * 1000
+            })
+            chunk_index += 1
+        
+        try:
+            path, payload = self._request(prompt, stream=True)
+            
+            waiting_since = time.time()
+            with self.client.post(path, json=payload, stream=True) as response:
+                response.raise_for_status()
+                
+                # Closing the connection makes Ollama stop generating
+                token.add_callback(lambda reason: response.close())
+                
+                for line in response.iter_lines():
+                    if token.cancelled:
+                        return "".join(parts).strip()
+                    
+                    if not line:
+                        continue
+                    
+                    # Wait for this line, excluding time spent handing the
+                    # previous sentence to TTS
+                    self.last_backend_s = max(self.last_backend_s, time.time() - waiting_since)
+                    
+                    data = json.loads(line)
+                    if 'error' in data:
+                        raise requests.exceptions.RequestException(data['error'])
+                    
+                    piece = self._response_text(data)
+                    if piece:
+                        parts.append(piece)
+                        for chunk in segmenter.feed(piece):
+                            emit(chunk)
+                    
+                    if data.get('done'):
+                        self._mark_loaded()
+                        self._log_prefill(data)
+                        break
+                    
+                    waiting_since = time.time()
+            
+            tail = segmenter.flush()
+            if tail:
+                emit(tail)
+            
+            return "".join(parts).strip()
+            
+        except Exception as e:
+            if token.cancelled:
+                # Reading from the response closed by the cancel callback
+                return "".join(parts).strip()
+            if isinstance(e, requests.exceptions.Timeout):
+                self.last_error = 'timeout'
+            elif isinstance(e, requests.exceptions.RequestException):
+                print(f"❌ Ollama request failed: {e}")
+                self.last_error = 'request_error'
+            else:
+                print(f"❌ Generation failed: {e}")
+                self.last_error = 'error'
+            fallback = FALLBACK_RESPONSES[self.last_error]
+        
+        # Speak whatever was already generated, otherwise the fallback phrase
+        tail = segmenter.flush()
+        if tail:
+            emit(tail)
+        if chunk_index == 0:
+            emit(fallback)
+            return fallback
+        return "".join(parts).strip()
+    
+    def cancel_current(self, reason: str = "cancelled") -> bool:
+        """Abort the generation in flight by cancelling its turn token
+        
+        Returns:
+            True if a generation was running
+        """
+        token = self.current_token
+        if token is None or token.cancelled:
+            return False
+        token.cancel(reason)
+        return True
+    
+    def add_assistant_message(self, text: str):
+        """Record something Pluto said outside the LLM (e.g. a pre-rendered greeting)"""
+        self.history.add('assistant', text)
+    
+    def _summarize(self, previous: str, messages: List[Dict[str, str]]) -> Optional[str]:
+        """
+        Compact older turns into a few sentences (called from the history's
+        background thread)
+        """
+        if self.breaker.state != CircuitBreaker.CLOSED:
+            return None  # Backend is unhealthy; the history falls back to dropping turns
+        
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        prompt = (
+            f"Summary so far: {previous or '(none)'}\n\n"
+            f"Conversation:\n{transcript}\n\n"
+            f"Update the summary of this conversation in at most {OLLAMA_CONFIG['summary_max_words']} "
+            "words. Keep names, facts and open questions. Reply with the summary only."
+        )
+        payload = {
+            'model': OLLAMA_CONFIG['model'],
+            'prompt': prompt,
+            'stream': False,
+            'keep_alive': self._keep_alive(),
+            'options': {**self._options(OLLAMA_CONFIG['summary_max_tokens']), 'temperature': 0.0}
+        }
+        
+        start = time.time()
+        response = self.client.post('/api/generate', json=payload)
+        response.raise_for_status()
+        summary = response.json().get('response', '').strip()
+        self._mark_loaded()
+        
+        if self.metrics:
+            self.metrics.log_metric('llm', 'summarize', (time.time() - start) * 1000, 'ms',
+                                    {'messages': len(messages)})
+        return summary or None
     
     def clear_history(self):
-        """Clear conversation history"""
-        self.conversation_history = []
+        """Clear conversation history (new person / agent reset)"""
+        self.history.clear()
+        self._first_turn_pending = True
         print("🗑️  Conversation history cleared")
     
     def get_status(self) -> dict:
@@ -216,14 +681,18 @@ class LLMWorker:
             'running': self.running,
             'warmup_complete': self.warmup_complete,
             'processed': self.processing_count,
-            'history_length': len(self.conversation_history) // 2,
+            'history_length': len(self.history) // 2,
+            'history_tokens': self.history.tokens(),
+            'history_compactions': self.history.compactions,
+            'model_warm': self.is_model_warm(),
+            'circuit': self.breaker.state,
+            'circuit_rejected': self.breaker.rejected_count,
+            'cancelled': self.cancelled_count,
+            'response_cache': self.response_cache.stats() if self.response_cache else None,
+            'semantic_cache': self.semantic_cache.stats() if self.semantic_cache else None,
             'server_reachable': self._check_server()
         }
     
     def _check_server(self) -> bool:
-        """Quick server health check"""
-        try:
-            response = requests.get(f"{OLLAMA_CONFIG['host']}/api/tags", timeout=1)
-            return response.status_code == 200
-        except:
-            return False
+        """Server health from the background prober (never blocks)"""
+        return self.client.healthy
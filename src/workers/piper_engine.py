@@ -0,0 +1,230 @@
+"""
+🪐 Project Pluto - Piper Engine
+Long-lived Piper process that streams raw PCM over a pipe
+"""
+
+import json
+import os
+import queue
+import re
+import subprocess
+import threading
+import time
+from typing import Callable, Optional
+
+from config import PIPER_CONFIG
+
+
+# Piper logs one of these to stderr after every input line, once all of the
+# line's audio has been written to stdout
+_RTF_PATTERN = re.compile(r'Real-time factor: .*audio=([0-9.eE+-]+) sec')
+
+
+class PiperEngine:
+    """
+    Persistent Piper synthesis process
+
+    The voice model is loaded once. Each call to synthesize() writes one line
+    of text to Piper's stdin and streams the raw 16-bit mono PCM it produces
+    on stdout (--output-raw). The process is restarted if it dies.
+    """
+
+    def __init__(self, metrics=None):
+        self.metrics = metrics
+        self.process: Optional[subprocess.Popen] = None
+        self.sample_rate = self._read_sample_rate()
+        self.sample_width = 2  # 16-bit PCM
+        self.restart_count = 0
+
+        self._audio_queue: queue.Queue = queue.Queue()
+        self._done_queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _read_sample_rate() -> int:
+        """Read the voice sample rate from the model's .onnx.json config"""
+        try:
+            with open(PIPER_CONFIG["config_path"], 'r', encoding='utf-8') as f:
+                return int(json.load(f)['audio']['sample_rate'])
+        except Exception:
+            return PIPER_CONFIG["sample_rate"]
+
+    def _build_command(self) -> list:
+        cmd = [
+            PIPER_CONFIG["piper_binary"],
+            "--model", PIPER_CONFIG["model_path"],
+            "--output-raw",
+            "--length_scale", str(PIPER_CONFIG["length_scale"]),
+            "--noise_scale", str(PIPER_CONFIG["noise_scale"]),
+            "--noise_w", str(PIPER_CONFIG["noise_w"]),
+        ]
+
+        if PIPER_CONFIG["voice"]:
+            cmd.extend(["--speaker", str(PIPER_CONFIG["voice"])])
+
+        return cmd
+
+    def start(self) -> bool:
+        """Start the Piper process (loads the voice model)"""
+        try:
+            self.process = subprocess.Popen(
+                self._build_command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=0
+            )
+        except Exception as e:
+            print(f"❌ Failed to start Piper: {e}")
+            self.process = None
+            return False
+
+        # Fresh queues so a dead process's readers can't leak into the new one
+        self._audio_queue = queue.Queue()
+        self._done_queue = queue.Queue()
+
+        threading.Thread(target=self._read_stdout,
+                         args=(self.process, self._audio_queue), daemon=True).start()
+        threading.Thread(target=self._read_stderr,
+                         args=(self.process, self._done_queue), daemon=True).start()
+
+        return True
+
+    def stop(self):
+        """Stop the Piper process"""
+        process = self.process
+        self.process = None
+
+        if process is None:
+            return
+
+        try:
+            process.stdin.close()
+            process.wait(timeout=2)
+        except Exception:
+            process.kill()
+
+    def restart(self) -> bool:
+        """Kill and restart the Piper process"""
+        self.stop()
+        self.restart_count += 1
+        print(f"🔁 Restarting Piper (restart #{self.restart_count})")
+        if self.metrics:
+            self.metrics.log_metric('tts', 'piper_restart', 1, 'count')
+        return self.start()
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def synthesize(self, text: str, on_audio: Optional[Callable[[bytes], None]] = None) -> Optional[bytes]:
+        """
+        Synthesize text, streaming PCM to on_audio as it is produced
+
+        Args:
+            text: Text to speak (newlines are flattened - Piper reads one line per utterance)
+            on_audio: Called with each PCM chunk (always a whole number of samples)
+
+        Returns:
+            All PCM bytes for the utterance, or None on failure
+        """
+        line = " ".join(text.split())
+        if not line:
+            return b""
+
+        with self._lock:
+            if not self.is_alive() and not self.restart():
+                return None
+
+            # Drop anything left over from an aborted utterance
+            self._drain(self._audio_queue)
+            self._drain(self._done_queue)
+
+            try:
+                self.process.stdin.write((line + "\n").encode('utf-8'))
+                self.process.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                print(f"❌ Piper pipe error: {e}")
+                self.restart()
+                return None
+
+            return self._collect_audio(on_audio)
+
+    def _collect_audio(self, on_audio: Optional[Callable[[bytes], None]]) -> Optional[bytes]:
+        """Read PCM for one utterance until Piper reports it is finished"""
+        pcm = bytearray()
+        carry = b""
+        expected_bytes = None
+        start = time.time()
+        last_audio = start
+
+        while True:
+            try:
+                expected_bytes = int(round(self._done_queue.get_nowait() * self.sample_rate)) * self.sample_width
+            except queue.Empty:
+                pass
+
+            try:
+                data = self._audio_queue.get(timeout=0.02)
+            except queue.Empty:
+                data = None
+
+            if data:
+                last_audio = time.time()
+                data = carry + data
+                usable = len(data) - (len(data) % self.sample_width)
+                carry = data[usable:]
+                if usable:
+                    pcm.extend(data[:usable])
+                    if on_audio:
+                        on_audio(data[:usable])
+
+            now = time.time()
+
+            if expected_bytes is not None:
+                # Audio is already in the pipe when the RTF line is logged,
+                # so only a short grace period is needed to drain it
+                if len(pcm) >= expected_bytes or now - last_audio > 0.1:
+                    return bytes(pcm)
+            elif pcm and now - last_audio > PIPER_CONFIG["idle_timeout"]:
+                # No RTF line (e.g. quiet log level) - fall back to idle detection
+                return bytes(pcm)
+
+            if not self.is_alive():
+                print("❌ Piper process exited during synthesis")
+                self.restart()
+                return None
+
+            if now - start > PIPER_CONFIG["synthesis_timeout"]:
+                print("❌ TTS synthesis timeout")
+                self.restart()
+                return None
+
+    @staticmethod
+    def _drain(q: queue.Queue):
+        while True:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                return
+
+    @staticmethod
+    def _read_stdout(process: subprocess.Popen, audio_queue: queue.Queue):
+        fd = process.stdout.fileno()
+        while True:
+            try:
+                data = os.read(fd, 4096)
+            except OSError:
+                break
+            if not data:
+                break
+            audio_queue.put(data)
+
+    @staticmethod
+    def _read_stderr(process: subprocess.Popen, done_queue: queue.Queue):
+        for raw in iter(process.stderr.readline, b''):
+            line = raw.decode('utf-8', errors='replace').strip()
+            match = _RTF_PATTERN.search(line)
+            if match:
+                done_queue.put(float(match.group(1)))
+            elif 'error' in line.lower():
+                print(f"❌ Piper: {line}")
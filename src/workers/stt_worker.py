@@ -8,9 +8,6 @@ import queue
 import threading
 import pyaudio
 import numpy as np
-import wave
-import whisper
-from pathlib import Path
 from typing import Optional
 
 from config import (
@@ -19,54 +16,100 @@ from config import (
     WORKER_CONFIG,
     QUEUE_CONFIG,
 )
+from audio_buffer import AudioRingBuffer
+from endpointing import Endpointer, BargeInDetector
+from vad import SpectralVAD
+from stt_inference import STTProcess, beam_fallback_reason
+from transcript_filter import TranscriptFilter
 
 
 class STTWorker:
     """Speech-to-text worker using Whisper"""
     
-    def __init__(self, output_queue: queue.Queue, metrics=None, reporter=None):
+    def __init__(self, output_queue: queue.Queue, metrics=None, reporter=None, playback=None):
         self.output_queue = output_queue
         self.metrics = metrics
         self.reporter = reporter
+        self.playback = playback  # PlaybackTracker - gates capture while Pluto speaks
+        self.cancel_token = None  # Session CancellationToken (set by the orchestrator)
         
         self.running = False
         self.paused = True  # Start paused (vision-driven activation)
+        self._listening = threading.Event()  # Set while not paused
         self.thread = None
+        self.capture_thread = None
+        self.partial_thread = None
         self.warmup_complete = False
         
         # Audio components
         self.audio = None
         self.stream = None
-        self.model = None
         
-        # Temp file for audio processing
-        self.temp_audio_path = Path("temp_recording.wav")
+        # The STT engine runs in its own process; this worker only captures
+        # audio, runs the VAD and talks to it
+        self.engine = STTProcess(metrics)
+        
+        # Continuous capture: the capture thread always drains the stream into
+        # the ring buffer; the recorder reads from it at its own cursor
+        sample_rate = AUDIO_CONFIG['sample_rate']
+        self.ring = AudioRingBuffer(int(AUDIO_CONFIG['ring_buffer_seconds'] * sample_rate), sample_rate)
+        self.read_index = 0
+        self.overflow_count = 0
+        self.overrun_count = 0
+        
+        self.vad = SpectralVAD(sample_rate)
+        self.endpointer = Endpointer(sample_rate, self.vad)
+        
+        # Barge-in: user speech over playback calls on_barge_in (set by the
+        # orchestrator) and is then recorded from its pre-roll
+        self.barge_in = BargeInDetector(self.vad)
+        self.on_barge_in = None
+        self._barge_in = False
+        
+        # Incremental transcription: a partial-decoder thread re-decodes the
+        # growing utterance; the inference process's log-mel buffer only
+        # computes new frames
+        self.utterance_id = 0
+        self.utterance_start = None
+        self.utterance_end_time = 0.0  # When the last utterance's endpoint was detected
+        self._last_partial_index = 0
+        self._partial_request = None  # (utterance_id, end_index) - latest wins
+        self._partial_result = None  # (utterance_id, n_samples, reply)
+        self._partial_event = threading.Event()
+        
+        # Drops hallucinated / no-speech transcripts before the LLM queue
+        self.transcript_filter = TranscriptFilter()
+        self._decode_lock = threading.Lock()
         
         # Stats
         self.processing_count = 0
+        self.trigger_count = 0
+        self.false_trigger_count = 0
+        self.echo_suppressed_count = 0
+        self.barge_in_count = 0
     
     def initialize(self) -> bool:
         """Initialize Whisper model and audio"""
         try:
-            print(f"   Loading Whisper model: {WHISPER_CONFIG['model_size']}")
+            print(f"   Loading STT engine: {WHISPER_CONFIG['engine']} ({WHISPER_CONFIG['model_size']})")
             
-            # Load Whisper model
-            self.model = whisper.load_model(
-                WHISPER_CONFIG['model_size'],
-                device=WHISPER_CONFIG['device']
-            )
+            # Load the model in the inference process
+            if not self.engine.start():
+                return False
             
-            print(f"   Whisper model loaded on: {WHISPER_CONFIG['device']}")
+            print(f"   STT model loaded on: {WHISPER_CONFIG['device']}")
             
             # Log model info to performance reporter
             if self.reporter:
-                model_name = f"whisper-{WHISPER_CONFIG['model_size']}"
+                model_name = f"{WHISPER_CONFIG['engine']}-{WHISPER_CONFIG['model_size']}"
                 model_details = {
+                    'engine': WHISPER_CONFIG['engine'],
                     'model_size': WHISPER_CONFIG['model_size'],
                     'device': WHISPER_CONFIG['device'],
                     'language': WHISPER_CONFIG['language'],
                     'temperature': WHISPER_CONFIG['temperature'],
                     'beam_size': WHISPER_CONFIG['beam_size'],
+                    'decoding': WHISPER_CONFIG['decoding'],
                     'fp16': WHISPER_CONFIG['fp16']
                 }
                 self.reporter.log_model_info('stt', model_name, model_details)
@@ -102,16 +145,12 @@ class STTWorker:
         start_time = time.time()
         
         try:
-            # Create 1 second of silent audio for warmup
-            silent_audio = np.zeros(AUDIO_CONFIG['sample_rate'], dtype=np.float32)
-            
-            # Run inference
-            result = self.model.transcribe(
-                silent_audio,
-                language=WHISPER_CONFIG['language'],
-                task=WHISPER_CONFIG['task'],
-                fp16=WHISPER_CONFIG['fp16']
-            )
+            # Run inference on 1 second of silence
+            self.engine.warmup()
+            
+            # Also warm the incremental decode path
+            if WHISPER_CONFIG['streaming']:
+                self.engine.transcribe(np.zeros(AUDIO_CONFIG['sample_rate'], dtype=np.float32), utterance_id=0)
             
             warmup_time = (time.time() - start_time) * 1000
             print(f"   STT warmup complete: {warmup_time:.0f}ms")
@@ -129,6 +168,15 @@ class STTWorker:
         self.warmup()
         
         self.running = True
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.capture_thread.start()
+        
+        self._calibrate_vad()
+        
+        if WHISPER_CONFIG['streaming']:
+            self.partial_thread = threading.Thread(target=self._partial_loop, daemon=True)
+            self.partial_thread.start()
+        
         self.thread = threading.Thread(target=self._listen_loop, daemon=True)
         self.thread.start()
         
@@ -144,6 +192,13 @@ class STTWorker:
         if self.thread:
             self.thread.join(timeout=5.0)
         
+        if self.capture_thread:
+            self.capture_thread.join(timeout=2.0)
+        
+        if self.partial_thread:
+            self._partial_event.set()
+            self.partial_thread.join(timeout=5.0)
+        
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
@@ -151,21 +206,40 @@ class STTWorker:
         if self.audio:
             self.audio.terminate()
         
-        if self.temp_audio_path.exists():
-            self.temp_audio_path.unlink()
+        self.engine.stop()
         
         print("✅ STT Worker stopped")
     
+    def _calibrate_vad(self):
+        """Learn the room's noise floor from the first second of capture"""
+        samples = int(AUDIO_CONFIG['vad_calibration_ms'] * AUDIO_CONFIG['sample_rate'] / 1000)
+        start = self.ring.total_written
+        
+        print("   Calibrating VAD noise floor (stay quiet)...")
+        if not self.ring.wait_for(start + samples, timeout=AUDIO_CONFIG['vad_calibration_ms'] / 1000 + 2.0):
+            print("⚠️  VAD calibration skipped - no audio captured")
+            return
+        
+        self.vad.calibrate(self.ring.read(start, start + samples))
+        print(f"   VAD noise floor: {self.vad.noise_db:.1f}dB (flatness {self.vad.noise_flatness:.2f})")
+        
+        if self.metrics:
+            self.metrics.log_metric('stt', 'vad_noise_floor', self.vad.noise_db, 'dB')
+    
     def pause(self):
         """Pause listening (vision-driven)"""
         if not self.paused:
             self.paused = True
+            self._listening.clear()
             print("⏸️  STT paused (no face detected)")
     
     def resume(self):
         """Resume listening (vision-driven)"""
         if self.paused:
+            # Skip audio captured while paused
+            self.read_index = self.ring.total_written
             self.paused = False
+            self._listening.set()
             print("▶️  STT resumed (face locked)")
     
     def is_paused(self) -> bool:
@@ -175,21 +249,41 @@ class STTWorker:
     def _listen_loop(self):
         """Main listening loop"""
         while self.running:
-            # Skip processing if paused (vision-driven activation)
-            if self.paused:
-                time.sleep(0.1)
+            # Wait while paused (vision-driven activation)
+            if not self._listening.wait(timeout=QUEUE_CONFIG['get_timeout']):
                 continue
             try:
+                # Half duplex: don't listen to Pluto's own voice (unless the
+                # user just barged in)
+                if self.playback is not None and self.playback.is_gated() and not self._barge_in:
+                    self._wait_out_playback()
+                    continue
+                
                 # Detect speech and record
                 audio_data = self._record_speech()
+                self._barge_in = False
+                # Deadlines downstream age the turn from here, so STT time counts
+                captured_at = self.utterance_end_time
                 
                 if audio_data is not None and audio_data.size > 0:
                     # Transcribe
                     start_time = time.time()
-                    text = self._transcribe(audio_data)
+                    reply = self._transcribe(audio_data)
                     latency = (time.time() - start_time) * 1000
                     
-                    if text and text.strip():
+                    duration = len(audio_data) / AUDIO_CONFIG['sample_rate']
+                    reason = self.transcript_filter.check(reply or {}, duration)
+                    text = reply['text'] if reply else ""
+                    
+                    if self._session_cancelled():
+                        # The person left while we were transcribing
+                        print(f"   ✋ Dropped transcript \"{text}\" (session ended)")
+                    
+                    elif reason:
+                        # Dropped transcripts count as false triggers, by reason
+                        self._record_trigger(false_trigger=True, reason=reason)
+                    else:
+                        self._record_trigger(false_trigger=False)
                         print(f"   📝 Recognized: \"{text}\"")
                         print(f"  🎤 STT: {latency:.0f}ms")
                         
@@ -197,7 +291,7 @@ class STTWorker:
                         self.output_queue.put({
                             'type': 'transcript',  # Fixed: changed from 'transcription' to 'transcript'
                             'text': text,
-                            'timestamp': time.time()
+                            'timestamp': captured_at
                         })
                         
                         if self.metrics:
@@ -214,52 +308,201 @@ class STTWorker:
                     if self.metrics:
                         self.metrics.log_error('stt', 'processing_error', str(e))
     
+    def _capture_loop(self):
+        """Capture thread: always drain the input stream into the ring buffer"""
+        while self.running:
+            try:
+                data = self.stream.read(AUDIO_CONFIG['chunk_size'], exception_on_overflow=True)
+                self.ring.write(np.frombuffer(data, dtype=np.int16))
+            
+            except IOError as e:
+                if not self.running:
+                    break
+                if getattr(e, 'errno', None) == pyaudio.paInputOverflowed:
+                    self.overflow_count += 1
+                    if self.metrics:
+                        self.metrics.log_metric('stt', 'input_overflow', 1, 'count')
+                    continue
+                print(f"❌ Audio capture error: {e}")
+                time.sleep(0.1)
+            
+            except Exception as e:
+                if self.running:
+                    print(f"❌ Audio capture error: {e}")
+                    time.sleep(0.1)
+    
+    def _session_cancelled(self) -> bool:
+        return self.paused or (self.cancel_token is not None and self.cancel_token.cancelled)
+    
+    def _wait_out_playback(self):
+        """Skip audio captured while Pluto speaks (plus echo tail)
+        
+        With barge-in enabled the audio is watched for the user talking over
+        playback; otherwise this just blocks until the speaker is quiet.
+        """
+        gate_start = self.read_index
+        
+        if AUDIO_CONFIG['barge_in_enabled'] and self.on_barge_in is not None:
+            speech_start = self._watch_for_barge_in()
+            if speech_start is not None:
+                self._count_echo(gate_start, speech_start)
+                preroll = int(AUDIO_CONFIG['preroll_ms'] * AUDIO_CONFIG['sample_rate'] / 1000)
+                self.read_index = max(speech_start - preroll, self.ring.oldest_index)
+                self._barge_in = True
+                return
+        else:
+            while self.running and not self.paused:
+                if self.playback.wait_until_quiet(timeout=QUEUE_CONFIG['get_timeout']):
+                    break
+        
+        gate_end = self.ring.total_written
+        self.read_index = gate_end
+        self._count_echo(gate_start, gate_end)
+    
+    def _watch_for_barge_in(self) -> Optional[int]:
+        """Run the barge-in detector over audio captured during playback
+        
+        Returns:
+            Absolute index where the user's speech started, or None if
+            playback ended without a barge-in
+        """
+        detector = self.barge_in
+        frame_samples = detector.frame_samples
+        detector.reset()
+        
+        while self.running and not self.paused and self.playback.is_gated():
+            frame = self._next_chunk(frame_samples)
+            if frame is None:
+                continue
+            
+            if detector.process(frame):
+                speech_start = self.read_index - detector.speech_frames * frame_samples
+                delay = (time.time() - self.ring.time_of(speech_start)) * 1000
+                self.barge_in_count += 1
+                print(f"✋ Barge-in detected ({delay:.0f}ms after speech start)")
+                
+                self.on_barge_in()
+                
+                if self.metrics:
+                    self.metrics.log_metric('stt', 'barge_in_detection', delay, 'ms')
+                return speech_start
+        
+        return None
+    
+    def _count_echo(self, start: int, end: int):
+        """Count speech-like segments in discarded playback audio as suppressed echo"""
+        frames = self.vad.frames(self.ring.read(start, end))
+        if len(frames) == 0:
+            return
+        
+        speech = self.vad.classify(frames).astype(np.int8)
+        edges = np.flatnonzero(np.diff(np.concatenate([[0], speech, [0]])))
+        runs = edges[1::2] - edges[::2]
+        segments = int(np.sum(runs >= self.endpointer.start_frames))
+        
+        if segments:
+            self._record_echo(segments)
+    
+    def _record_echo(self, segments: int = 1):
+        """Track self-echo segments that were not transcribed"""
+        self.echo_suppressed_count += segments
+        print(f"   🔇 Suppressed {segments} self-echo segment(s)")
+        
+        if self.metrics:
+            self.metrics.log_metric('stt', 'echo_suppressed', segments, 'count')
+    
+    def _next_chunk(self, size: int) -> Optional[np.ndarray]:
+        """Read the next chunk at the recorder cursor from the ring buffer"""
+        end = self.read_index + size
+        if not self.ring.wait_for(end, timeout=QUEUE_CONFIG['get_timeout']):
+            return None
+        
+        # Fell behind by more than the ring holds - skip ahead to what's left
+        if self.read_index < self.ring.oldest_index:
+            self.overrun_count += 1
+            print("⚠️  STT fell behind capture - skipping audio")
+            self.read_index = self.ring.oldest_index
+            end = self.read_index + size
+        
+        chunk = self.ring.read(self.read_index, end)
+        self.read_index = end
+        return chunk
+    
     def _record_speech(self) -> Optional[np.ndarray]:
-        """Record audio until silence detected"""
+        """Record audio until the endpointer detects end of speech
+        
+        Returns the phrase including ~preroll_ms of audio from before the
+        trigger, copied out of the ring buffer in one piece.
+        """
         try:
-            frames = []
-            silent_chunks = 0
-            speech_started = False
-            total_chunks = 0
-            max_chunks = int(AUDIO_CONFIG['max_phrase_duration'] * 
-                           AUDIO_CONFIG['sample_rate'] / AUDIO_CONFIG['chunk_size'])
-            
-            while self.running and total_chunks < max_chunks:
-                # Read audio chunk
-                data = self.stream.read(AUDIO_CONFIG['chunk_size'], exception_on_overflow=False)
-                audio_chunk = np.frombuffer(data, dtype=np.int16)
+            sample_rate = AUDIO_CONFIG['sample_rate']
+            preroll = int(AUDIO_CONFIG['preroll_ms'] * sample_rate / 1000)
+            max_samples = int(AUDIO_CONFIG['max_phrase_duration'] * sample_rate)
+            
+            endpointer = self.endpointer
+            frame_samples = endpointer.frame_samples
+            endpointer.reset()
+            
+            # Absolute index of the endpointer's frame 0
+            base_index = self.read_index
+            overruns = self.overrun_count
+            speech_start = None
+            
+            while self.running and not self.paused:
+                frame = self._next_chunk(frame_samples)
+                if frame is None:
+                    continue
                 
-                # Calculate energy
-                energy = np.abs(audio_chunk).mean()
+                if (self.playback is not None and not self._barge_in
+                        and self.playback.covers(self.ring.time_of(self.read_index - frame_samples))):
+                    # Playback started: whatever follows is Pluto's own voice
+                    # (half duplex - the phrase in progress is dropped)
+                    if speech_start is not None:
+                        print("   🔇 Playback started - dropping phrase in progress")
+                    self._partial_request = None
+                    self.read_index -= frame_samples
+                    return None
                 
-                # Check for speech
-                if energy > AUDIO_CONFIG['energy_threshold']:
-                    if not speech_started:
-                        print("🎙️  Speech detected...")
-                        speech_started = True
-                    
-                    frames.append(audio_chunk)
-                    silent_chunks = 0
-                else:
-                    if speech_started:
-                        frames.append(audio_chunk)
-                        silent_chunks += 1
-                        
-                        # Check if silence duration exceeded
-                        if silent_chunks >= AUDIO_CONFIG['silence_chunks_threshold']:
-                            break
+                if self.overrun_count != overruns:
+                    # Cursor skipped ahead after an overrun - restart the utterance
+                    overruns = self.overrun_count
+                    endpointer.reset()
+                    base_index = self.read_index - frame_samples
+                    speech_start = None
+                
+                event = endpointer.process(frame)
                 
-                total_chunks += 1
+                if event == 'start':
+                    print("🎙️  Speech detected...")
+                    speech_start = base_index + endpointer.speech_start_frame * frame_samples
+                    speech_start = max(speech_start - preroll, self.ring.oldest_index)
+                    self._begin_utterance(speech_start)
+                
+                elif event == 'end':
+                    break
+                
+                if speech_start is not None:
+                    if self.read_index - speech_start >= max_samples:
+                        break
+                    self._maybe_request_partial()
             
-            if not frames:
+            self._partial_request = None
+            
+            if speech_start is None:
                 return None
             
-            # Combine frames
-            audio_data = np.concatenate(frames)
+            self.utterance_end_time = time.time()
+            self._log_endpoint_delay(base_index + (endpointer.last_speech_frame + 1) * frame_samples)
+            
+            # Trim leading/trailing non-speech (keeps vad_trim_pad_ms around speech).
+            # In streaming mode the start stays put so cached log-mel frames still line up.
+            audio_data = self.vad.trim(self.ring.read(speech_start, self.read_index),
+                                       leading=not WHISPER_CONFIG['streaming'])
             
             # Check minimum duration
-            duration = len(audio_data) / AUDIO_CONFIG['sample_rate']
+            duration = len(audio_data) / sample_rate
             if duration < AUDIO_CONFIG['min_phrase_duration']:
+                self._record_trigger(false_trigger=True, reason='too_short')
                 return None
             
             return audio_data
@@ -269,27 +512,197 @@ class STTWorker:
                 print(f"❌ Recording error: {e}")
             return None
     
-    def _transcribe(self, audio_data: np.ndarray) -> str:
-        """Transcribe audio using Whisper"""
+    def _record_trigger(self, false_trigger: bool, reason: str = ""):
+        """Track VAD triggers and how many of them turned out not to be speech"""
+        self.trigger_count += 1
+        if false_trigger:
+            self.false_trigger_count += 1
+            print(f"   🔇 False trigger ({reason})")
+        
+        if self.metrics:
+            if false_trigger:
+                self.metrics.log_metric('stt', 'false_trigger', 1, 'count', {'reason': reason})
+            self.metrics.log_metric('stt', 'false_trigger_rate', self.false_trigger_rate(), 'ratio')
+    
+    def false_trigger_rate(self) -> float:
+        """Fraction of VAD triggers that produced no usable speech"""
+        return self.false_trigger_count / self.trigger_count if self.trigger_count else 0.0
+    
+    def _log_endpoint_delay(self, speech_end_index: int):
+        """Log time from the last speech sample to handing audio to Whisper"""
+        delay = (time.time() - self.ring.time_of(speech_end_index)) * 1000
+        print(f"   ⏹️  Endpoint after {delay:.0f}ms of silence")
+        
+        if self.metrics:
+            self.metrics.log_metric('stt', 'endpoint_delay', delay, 'ms')
+    
+    def _begin_utterance(self, start_index: int):
+        """Start tracking a new utterance for partial decoding"""
+        self.utterance_id += 1
+        self.utterance_start = start_index
+        self._last_partial_index = start_index
+    
+    def _maybe_request_partial(self):
+        """Ask the partial decoder for a new pass once enough new audio arrived"""
+        if not WHISPER_CONFIG['streaming']:
+            return
+        
+        interval = int(WHISPER_CONFIG['partial_interval_ms'] * AUDIO_CONFIG['sample_rate'] / 1000)
+        if self.read_index - self._last_partial_index >= interval:
+            self._last_partial_index = self.read_index
+            self._partial_request = (self.utterance_id, self.read_index)
+            self._partial_event.set()
+    
+    def _partial_loop(self):
+        """Partial decoder thread: re-decode the growing utterance"""
+        while self.running:
+            self._partial_event.wait(timeout=QUEUE_CONFIG['get_timeout'])
+            self._partial_event.clear()
+            
+            request = self._partial_request
+            if request is None or not self.running:
+                continue
+            
+            utterance_id, end_index = request
+            if self._session_cancelled():
+                continue
+            
+            try:
+                audio = self.ring.read(self.utterance_start, end_index).astype(np.float32) / 32768.0
+                
+                start_time = time.time()
+                with self._decode_lock:
+                    if utterance_id != self.utterance_id:
+                        continue
+                    reply = self._decode(audio, utterance_id)
+                    self._partial_result = (utterance_id, len(audio), reply)
+                latency = (time.time() - start_time) * 1000
+                
+                text = reply['text'] if reply else ""
+                
+                if text:
+                    print(f"   ✏️  Partial: \"{text}\" ({latency:.0f}ms)")
+                    try:
+                        self.output_queue.put_nowait({
+                            'type': 'partial_transcript',
+                            'text': text,
+                            'utterance_id': utterance_id,
+                            'timestamp': time.time()
+                        })
+                    except queue.Full:
+                        pass  # Partials are advisory - never block capture for them
+                
+                if self.metrics:
+                    self.metrics.log_metric('stt', 'partial_latency', latency, 'ms')
+                    
+            except Exception as e:
+                if self.running:
+                    print(f"❌ Partial transcription error: {e}")
+    
+    def _decode(self, audio_float: np.ndarray, utterance_id: int) -> Optional[dict]:
+        """Fast (greedy) decode of a growing utterance in the inference process
+        
+        Must be called with _decode_lock held.
+        """
+        reply = self.engine.transcribe(audio_float, utterance_id)
+        if reply is not None:
+            self._log_inference(reply)
+        return reply
+    
+    def _log_inference(self, reply: dict):
+        """Log engine time, real-time factor and IPC overhead of one request"""
+        if self.metrics:
+            timings = reply['timings']
+            metadata = {'engine': reply['engine']}
+            self.metrics.log_metric('stt', 'inference_time', timings['total_ms'], 'ms', metadata)
+            self.metrics.log_metric('stt', 'real_time_factor', reply['rtf'], 'ratio', metadata)
+            self.metrics.log_metric('stt', 'ipc_overhead', timings['roundtrip_ms'] - timings['total_ms'], 'ms')
+    
+    def _transcribe(self, audio_data: np.ndarray) -> Optional[dict]:
+        """Transcribe audio with the configured STT engine
+        
+        Decoding is greedy first; beam search only runs when the policy is
+        "beam" or the greedy result looks unreliable (see beam_fallback_reason).
+        """
         try:
             # Convert int16 to float32 [-1.0, 1.0]
             audio_float = audio_data.astype(np.float32) / 32768.0
+            start_time = time.time()
+            policy = WHISPER_CONFIG['decoding']
             
-            # Transcribe with Whisper
-            result = self.model.transcribe(
-                audio_float,
-                language=WHISPER_CONFIG['language'],
-                task=WHISPER_CONFIG['task'],
-                fp16=WHISPER_CONFIG['fp16'],
-                temperature=WHISPER_CONFIG['temperature'],
-                best_of=WHISPER_CONFIG['best_of'],
-                beam_size=WHISPER_CONFIG['beam_size']
-            )
+            reply, path, reason = None, [], None
+            if WHISPER_CONFIG['streaming']:
+                reply = self._transcribe_final(audio_float)
+                path.append('greedy')
+            elif policy != 'beam':
+                reply = self.engine.transcribe(audio_float)
+                if reply is not None:
+                    self._log_inference(reply)
+                path.append('greedy')
+            
+            if policy == 'beam':
+                reason = 'policy'
+            elif policy == 'adaptive' and reply is not None:
+                reason = beam_fallback_reason(reply)
+            
+            if reason:
+                beam_reply = self.engine.transcribe(audio_float, beam=True)
+                if beam_reply is not None:
+                    self._log_inference(beam_reply)
+                    reply = beam_reply
+                    path.append('beam')
+            
+            cost = (time.time() - start_time) * 1000
+            path = '+'.join(path) or 'failed'
+            if reason and reason != 'policy':
+                print(f"   🔁 Low-confidence greedy result ({reason}), re-decoded with beam search")
+            
+            if self.metrics:
+                self.metrics.log_metric('stt', 'decode_cost', cost, 'ms', {'path': path, 'reason': reason})
             
-            return result['text'].strip()
+            return reply
             
         except Exception as e:
             print(f"❌ Transcription error: {e}")
             if self.metrics:
                 self.metrics.log_error('stt', 'transcription_error', str(e))
-            return ""
+            return None
+    
+    def _transcribe_final(self, audio_float: np.ndarray) -> Optional[dict]:
+        """Greedy result for a streamed utterance
+        
+        If the last partial already covered all of the (trimmed) speech it is
+        the result; otherwise only the new log-mel frames are computed and one
+        greedy pass is run.
+        """
+        with self._decode_lock:
+            partial = self._partial_result
+            if partial and partial[0] == self.utterance_id and partial[1] >= len(audio_float) and partial[2]:
+                path, reply = 'partial_reuse', partial[2]
+            else:
+                path, reply = 'final_decode', self._decode(audio_float, self.utterance_id)
+        
+        if self.metrics:
+            self.metrics.log_metric('stt', 'final_path', 1, 'count', {'path': path})
+        
+        return reply
+    
+    def get_status(self) -> dict:
+        """Get worker status"""
+        return {
+            'name': 'STT',
+            'running': self.running,
+            'paused': self.paused,
+            'warmup_complete': self.warmup_complete,
+            'processed': self.processing_count,
+            'triggers': self.trigger_count,
+            'false_trigger_rate': round(self.false_trigger_rate(), 3),
+            'echo_suppressed': self.echo_suppressed_count,
+            'barge_ins': self.barge_in_count,
+            'transcripts_dropped': dict(self.transcript_filter.drop_counts),
+            'vad_noise_floor_db': round(self.vad.noise_db, 1) if self.vad.noise_db is not None else None,
+            'input_overflows': self.overflow_count,
+            'engine': self.engine.engine_name,
+            'inference_alive': self.engine.is_alive(),
+            'inference_restarts': self.engine.restart_count
+        }
@@ -3,34 +3,70 @@
 Text-to-Speech using Piper neural synthesis
 """
 
-import os
 import queue
+import random
 import threading
 import time
-import wave
-import subprocess
+import weakref
 import pyaudio
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
-from config import AUDIO_CONFIG, PIPER_CONFIG, WORKER_CONFIG, QUEUE_CONFIG
+from config import AUDIO_CONFIG, PIPER_CONFIG, VISION_CONFIG, WORKER_CONFIG, QUEUE_CONFIG
+from text_segmenter import split_sentences
+from tts_cache import TTSCache
+from .piper_engine import PiperEngine
 
 
 class TTSWorker:
-    """Text-to-Speech worker using Piper"""
+    """Text-to-Speech worker using Piper
     
-    def __init__(self, input_queue: queue.Queue, metrics_logger=None, reporter=None):
+    Runs as a two-stage pipeline:
+    - Synthesis thread: splits responses into sentences and renders them ahead
+      into a bounded PCM queue
+    - Playback thread: drains the PCM queue into a single open output stream,
+      so sentence N+1 is synthesized while sentence N is playing
+    """
+    
+    def __init__(self, input_queue: queue.Queue, metrics_logger=None, reporter=None, playback=None,
+                 prewarm_phrases: Optional[List[str]] = None):
         self.input_queue = input_queue
         self.metrics = metrics_logger
         self.reporter = reporter
+        self.playback = playback  # PlaybackTracker - publishes speaker start/stop
         self.running = False
         self.thread = None
+        self.playback_thread = None
         
         self.audio = None
+        self.engine = None
+        self.output_stream = None
         self.warmup_complete = False
         self.processing_count = 0
         
-        self.temp_wav_path = Path("temp_tts.wav")
+        # Synthesis → playback buffer (bounded so synthesis can't run far ahead)
+        self.pcm_queue = queue.Queue(maxsize=PIPER_CONFIG["pcm_buffer_chunks"])
+        
+        # turn_id → time the first text of the turn reached TTS, and the turns
+        # whose first audio was logged; released at the turn's end marker or
+        # when the turn is dropped
+        self.turn_start_times = {}
+        self._first_audio_logged = set()
+        
+        # Cancellation: messages carry the turn's CancellationToken; a
+        # cancelled turn is dropped at every stage and wakes interrupt()
+        self._watched_tokens = weakref.WeakSet()
+        self._interrupt_time = None
+        self.interrupt_count = 0
+        
+        # Pre-rendered greetings: (text, PCM) played without synthesis
+        self.greeting_clips: List[Tuple[str, bytes]] = []
+        self._greeting_index = 0
+        self.greeting_count = 0
+        
+        # Phrase cache: fixed phrases are synthesized at startup if missing
+        self.cache = TTSCache() if PIPER_CONFIG['cache_enabled'] else None
+        self.prewarm_phrases = prewarm_phrases or []
         
         print("🔊 TTS Worker initializing...")
     
@@ -69,6 +105,13 @@ class TTSWorker:
                 }
                 self.reporter.log_model_info('tts', model_name, model_details)
             
+            # Start the persistent Piper process (voice model loads once here)
+            self.engine = PiperEngine(self.metrics)
+            if not self.engine.start():
+                return False
+            
+            print(f"   Piper engine running: {self.engine.sample_rate}Hz raw PCM")
+            
             self.audio = pyaudio.PyAudio()
             
             print("✅ TTS Worker initialized")
@@ -92,27 +135,101 @@ class TTSWorker:
         start = time.time()
         
         try:
-            self._synthesize("Warmup test.", play=False)
+            self.engine.synthesize("Warmup test.")
             elapsed = (time.time() - start) * 1000
             print(f"   TTS warmup complete: {elapsed:.0f}ms")
         except Exception as e:
             print(f"⚠️  TTS warmup failed: {e}")
         
-        if self.temp_wav_path.exists():
-            self.temp_wav_path.unlink()
-        
         self.warmup_complete = True
     
+    def prerender_greetings(self):
+        """Synthesize the greeting variants once, so greeting a face costs no synthesis"""
+        if not VISION_CONFIG['greeting_prerendered']:
+            return
+        
+        texts = VISION_CONFIG['greeting_variants'] or [VISION_CONFIG['greeting_message']]
+        start = time.time()
+        
+        for text in texts:
+            pcm = self._render(text)
+            if pcm:
+                self.greeting_clips.append((text, pcm))
+            else:
+                print(f"⚠️  Could not pre-render greeting: \"{text}\"")
+        
+        elapsed = (time.time() - start) * 1000
+        print(f"   Pre-rendered {len(self.greeting_clips)} greeting(s): {elapsed:.0f}ms")
+        if self.metrics:
+            self.metrics.log_metric('tts', 'greeting_prerender', elapsed, 'ms',
+                                    {'variants': len(self.greeting_clips)})
+    
+    def prewarm_cache(self):
+        """Make sure the fixed phrases are in the cache (synthesizes only missing ones)"""
+        if self.cache is None or not self.prewarm_phrases:
+            return
+        
+        start = time.time()
+        sentences = [s for phrase in self.prewarm_phrases for s in split_sentences(phrase)]
+        synthesized = 0
+        for sentence in sentences:
+            if self.cache.cacheable(sentence) and self.cache.get(sentence) is None:
+                self.cache.put(sentence, self.engine.synthesize(sentence))
+                synthesized += 1
+        
+        # Startup lookups would skew the hit rate
+        self.cache.hits = self.cache.misses = 0
+        
+        elapsed = (time.time() - start) * 1000
+        print(f"   TTS cache: {len(sentences)} fixed phrase(s), {synthesized} synthesized ({elapsed:.0f}ms)")
+    
+    def play_greeting(self, token=None) -> Optional[str]:
+        """
+        Queue a pre-rendered greeting straight to playback
+        
+        Skips the LLM and Piper entirely; the only latency left is opening
+        the output device. Variants rotate per greeting_rotation.
+        
+        Args:
+            token: CancellationToken of the greeting turn
+        
+        Returns:
+            Greeting text, or None if no clip is available (caller falls back
+            to generating a greeting)
+        """
+        if not self.running or not self.greeting_clips:
+            return None
+        
+        if VISION_CONFIG['greeting_rotation'] == 'random':
+            text, pcm = random.choice(self.greeting_clips)
+        else:
+            text, pcm = self.greeting_clips[self._greeting_index % len(self.greeting_clips)]
+            self._greeting_index += 1
+        
+        self.greeting_count += 1
+        turn_id = f"greeting-{self.greeting_count}"
+        self._watch(token)
+        self.turn_start_times[turn_id] = time.time()
+        
+        print(f"   🗣️  Greeting: \"{text}\"")
+        self._put_pcm({'type': 'pcm', 'data': pcm, 'turn_id': turn_id, 'cancel_token': token})
+        self._put_pcm({'type': 'turn_end', 'turn_id': turn_id, 'cancel_token': token})
+        return text
+    
     def start(self):
-        """Start TTS processing thread"""
+        """Start TTS synthesis and playback threads"""
         if not self.initialize():
             return False
         
         self.warmup()
+        self.prewarm_cache()
+        self.prerender_greetings()
         
         self.running = True
         self.thread = threading.Thread(target=self._process_queue, daemon=True)
         self.thread.start()
+        self.playback_thread = threading.Thread(target=self._playback_loop, daemon=True)
+        self.playback_thread.start()
         print("🔊 TTS Worker started")
         return True
     
@@ -124,26 +241,49 @@ class TTSWorker:
         if self.thread:
             self.thread.join(timeout=2)
         
+        if self.playback_thread:
+            self.playback_thread.join(timeout=2)
+        
+        if self.output_stream is not None:
+            self._close_output_stream(self.output_stream)
+            self.output_stream = None
+        
+        if self.engine:
+            self.engine.stop()
+        
         if self.audio:
             self.audio.terminate()
         
-        if self.temp_wav_path.exists():
-            self.temp_wav_path.unlink()
-        
         print("✅ TTS Worker stopped")
     
     def _process_queue(self):
-        """Main queue processing loop"""
+        """Synthesis stage: render queued text into the PCM buffer
+        
+        Handles full responses ('response') and streamed sentence chunks
+        ('response_chunk'). Chunks arrive in order on the queue and are rendered
+        one after another; 'response_end' closes the streamed turn.
+        """
         while self.running:
             try:
                 task = self.input_queue.get(timeout=QUEUE_CONFIG["get_timeout"])
+                turn_id = task.get('turn_id')
+                token = task.get('cancel_token')
+                self._watch(token)
                 
-                if task['type'] == 'response':
+                if self._is_cancelled(token):
+                    # Cancelled turn - drain its remaining text; its end
+                    # marker will never be queued
+                    if task['type'] in ('response', 'response_end'):
+                        self._forget_turn(turn_id)
+                
+                elif task['type'] in ('response', 'response_chunk'):
                     response_text = task['text']
                     print(f"   🗣️  Speaking: \"{response_text}\"")
                     
+                    self.turn_start_times.setdefault(turn_id, time.time())
+                    
                     start_time = time.time()
-                    success = self._synthesize(response_text, play=True)
+                    success = self._synthesize(response_text, turn_id, token)
                     
                     if success:
                         latency = (time.time() - start_time) * 1000
@@ -153,8 +293,12 @@ class TTSWorker:
                         
                         if self.reporter:
                             self.reporter.log_latency('tts', latency)
-                        
-                        self.processing_count += 1
+                    
+                    if task['type'] == 'response':
+                        self._end_turn(turn_id, token)
+                
+                elif task['type'] == 'response_end':
+                    self._end_turn(turn_id, token)
                 
                 self.input_queue.task_done()
                 
@@ -166,71 +310,231 @@ class TTSWorker:
                     if self.metrics:
                         self.metrics.log_error('tts', 'processing_error', str(e))
     
-    def _synthesize(self, text: str, play: bool = True) -> bool:
-        """Synthesize speech using Piper"""
+    def _synthesize(self, text: str, turn_id=None, token=None) -> bool:
+        """Render text sentence by sentence into the PCM queue
+        
+        PCM chunks are queued as Piper produces them, so playback of the first
+        sentence starts before the rest of the text has been synthesized.
+        """
+        def on_audio(pcm: bytes):
+            if not self._is_cancelled(token):
+                self._put_pcm({'type': 'pcm', 'data': pcm, 'turn_id': turn_id, 'cancel_token': token})
+        
         try:
-            cmd = [
-                PIPER_CONFIG["piper_binary"],
-                "--model", PIPER_CONFIG["model_path"],
-                "--output_file", str(self.temp_wav_path)
-            ]
-            
-            if PIPER_CONFIG["voice"]:
-                cmd.extend(["--speaker", str(PIPER_CONFIG["voice"])])
-            
-            result = subprocess.run(
-                cmd,
-                input=text,
-                text=True,
-                capture_output=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                print(f"❌ Piper synthesis failed:")
-                print(f"   Return code: {result.returncode}")
-                print(f"   STDERR: {result.stderr}")
-                print(f"   STDOUT: {result.stdout}")
-                print(f"   Command: {' '.join(cmd)}")
-                return False
-            
-            if play and self.temp_wav_path.exists():
-                self._play_wav(self.temp_wav_path)
+            for sentence in split_sentences(text):
+                # A sentence already handed to Piper finishes (bounded by
+                # one sentence); its audio is dropped
+                if not self.running or self._is_cancelled(token):
+                    return False
+                
+                pcm = self._render(sentence, on_audio)
+                
+                if pcm is None:
+                    if self.metrics:
+                        self.metrics.log_error('tts', 'synthesis_error', 'Piper synthesis failed')
+                    return False
             
             return True
             
-        except subprocess.TimeoutExpired:
-            print(f"❌ TTS synthesis timeout")
-            return False
         except Exception as e:
             print(f"❌ Synthesis error: {e}")
             if self.metrics:
                 self.metrics.log_error('tts', 'synthesis_error', str(e))
             return False
     
-    def _play_wav(self, wav_path: Path):
-        """Play WAV file through PyAudio"""
+    def _render(self, sentence: str, on_audio=None) -> Optional[bytes]:
+        """PCM for one sentence, from the cache or synthesized by Piper
+        
+        on_audio receives the audio as it is produced (a cache hit delivers
+        it in one piece).
+        """
+        if self.cache is None or not self.cache.cacheable(sentence):
+            return self.engine.synthesize(sentence, on_audio=on_audio)
+        
+        pcm = self.cache.get(sentence)
+        if self.metrics:
+            self.metrics.log_metric('tts', 'cache_hit', 1.0 if pcm is not None else 0.0, 'ratio',
+                                    {'hit_rate': self.cache.hit_rate})
+        
+        if pcm is not None:
+            if on_audio is not None:
+                on_audio(pcm)
+            return pcm
+        
+        pcm = self.engine.synthesize(sentence, on_audio=on_audio)
+        if pcm:
+            self.cache.put(sentence, pcm)
+        return pcm
+    
+    def interrupt(self):
+        """Stop playback now and drop all audio buffered so far
+        
+        Called when a turn's token is cancelled (barge-in, face lost, reset);
+        safe from any thread. The playback thread closes the stream at its
+        next slice or on the wake-up marker, discarding buffered audio.
+        """
+        self._interrupt_time = time.time()
+        self.interrupt_count += 1
+        
+        # Anything still buffered belongs to the cancelled turns; the marker
+        # wakes the playback thread if it is idle between chunks
+        while True:
+            try:
+                item = self.pcm_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item['type'] == 'turn_end':
+                self._forget_turn(item['turn_id'])
         try:
-            wf = wave.open(str(wav_path), 'rb')
-            
-            stream = self.audio.open(
-                format=self.audio.get_format_from_width(wf.getsampwidth()),
-                channels=wf.getnchannels(),
-                rate=wf.getframerate(),
-                output=True
-            )
-            
-            chunk_size = 1024
-            data = wf.readframes(chunk_size)
+            self.pcm_queue.put_nowait({'type': 'interrupt', 'turn_id': None})
+        except queue.Full:
+            pass  # Playback checks the turn between slices anyway
+        
+        print("   ✋ TTS interrupted")
+    
+    def _watch(self, token):
+        """Interrupt playback as soon as this turn's token is cancelled"""
+        if token is not None and token not in self._watched_tokens:
+            self._watched_tokens.add(token)
+            token.add_callback(lambda reason: self.interrupt())
+    
+    @staticmethod
+    def _is_cancelled(token) -> bool:
+        return token is not None and token.cancelled
+    
+    def _forget_turn(self, turn_id):
+        """Release the first-audio bookkeeping of a finished or dropped turn"""
+        self.turn_start_times.pop(turn_id, None)
+        self._first_audio_logged.discard(turn_id)
+    
+    def _end_turn(self, turn_id, token=None):
+        """Mark the end of a turn in the PCM queue"""
+        self._put_pcm({'type': 'turn_end', 'turn_id': turn_id, 'cancel_token': token})
+        self.processing_count += 1
+    
+    def _put_pcm(self, item: dict):
+        """Queue an item for playback, blocking while the buffer is full"""
+        while self.running:
+            try:
+                self.pcm_queue.put(item, timeout=QUEUE_CONFIG["get_timeout"])
+                return
+            except queue.Full:
+                continue
+    
+    def _playback_loop(self):
+        """Playback stage: drain the PCM queue into one open output stream"""
+        while self.running:
+            try:
+                item = self.pcm_queue.get(timeout=QUEUE_CONFIG["get_timeout"])
+            except queue.Empty:
+                self._playback_stopped()
+                continue
             
-            while data and self.running:
-                stream.write(data)
-                data = wf.readframes(chunk_size)
+            turn_id = item.get('turn_id')
+            token = item.get('cancel_token')
             
+            try:
+                if item['type'] == 'pcm':
+                    if self._is_cancelled(token):
+                        continue
+                    
+                    if turn_id not in self._first_audio_logged:
+                        self._first_audio_logged.add(turn_id)
+                        turn_start = self.turn_start_times.get(turn_id)
+                        if turn_start is not None:
+                            first_audio = (time.time() - turn_start) * 1000
+                            print(f"  🔊 TTS first audio: {first_audio:.0f}ms")
+                            if self.metrics:
+                                metric = 'greeting_latency' if str(turn_id).startswith('greeting') else 'time_to_first_audio'
+                                self.metrics.log_metric('tts', metric, first_audio, 'ms')
+                    
+                    if self.playback is not None:
+                        self.playback.started()
+                    self._write_pcm(item['data'], token)
+                
+                elif item['type'] == 'turn_end':
+                    self._forget_turn(turn_id)
+                    if self.pcm_queue.empty():
+                        self._playback_stopped()
+                
+                elif item['type'] == 'interrupt':
+                    if self.output_stream is not None:
+                        self._abort_playback()
+                    self._interrupt_time = None
+                    
+            except Exception as e:
+                if self.running:
+                    print(f"❌ Audio playback error: {e}")
+                    if self.metrics:
+                        self.metrics.log_error('tts', 'playback_error', str(e))
+                    # Reopen the device on the next chunk
+                    if self.output_stream is not None:
+                        self._close_output_stream(self.output_stream)
+                        self.output_stream = None
+    
+    def _playback_stopped(self):
+        """Publish the end of playback (when the buffered audio leaves the speaker)"""
+        if self.playback is None or not self.playback.is_playing:
+            return
+        
+        latency = 0.0
+        if self.output_stream is not None:
+            try:
+                latency = self.output_stream.get_output_latency()
+            except Exception:
+                pass
+        self.playback.stopped(time.time() + latency)
+    
+    def _write_pcm(self, pcm: bytes, token=None):
+        """Write PCM to the output stream in small slices
+        
+        Between slices the turn's token is checked, so cancellation takes
+        effect within one slice (~50ms).
+        """
+        if self.output_stream is None:
+            self.output_stream = self._open_output_stream()
+        
+        slice_bytes = PIPER_CONFIG["playback_chunk_frames"] * self.engine.sample_width
+        for offset in range(0, len(pcm), slice_bytes):
+            if not self.running:
+                return
+            if self._is_cancelled(token):
+                self._abort_playback()
+                return
+            self.output_stream.write(pcm[offset:offset + slice_bytes])
+    
+    def _abort_playback(self):
+        """Stop the speaker immediately (closing an active stream discards its buffer)"""
+        try:
+            self.output_stream.close()
+        except Exception as e:
+            print(f"❌ Audio playback error: {e}")
+        self.output_stream = None
+        
+        if self.playback is not None:
+            self.playback.stopped()
+        
+        if self._interrupt_time is not None:
+            stop_latency = (time.time() - self._interrupt_time) * 1000
+            self._interrupt_time = None
+            print(f"   🔇 Playback stopped {stop_latency:.0f}ms after interrupt")
+            if self.metrics:
+                self.metrics.log_metric('tts', 'interrupt_latency', stop_latency, 'ms')
+    
+    def _open_output_stream(self):
+        """Open a PyAudio output stream matching the Piper voice"""
+        return self.audio.open(
+            format=self.audio.get_format_from_width(self.engine.sample_width),
+            channels=1,
+            rate=self.engine.sample_rate,
+            output=True,
+            output_device_index=AUDIO_CONFIG['output_device_index']
+        )
+    
+    def _close_output_stream(self, stream):
+        try:
             stream.stop_stream()
             stream.close()
-            wf.close()
-            
         except Exception as e:
             print(f"❌ Audio playback error: {e}")
             if self.metrics:
@@ -243,18 +547,11 @@ class TTSWorker:
             'running': self.running,
             'warmup_complete': self.warmup_complete,
             'processed': self.processing_count,
+            'buffered_chunks': self.pcm_queue.qsize(),
+            'interrupts': self.interrupt_count,
+            'greeting_clips': len(self.greeting_clips),
+            'cache_hit_rate': self.cache.hit_rate if self.cache else None,
             'model_exists': Path(PIPER_CONFIG["model_path"]).exists(),
-            'piper_available': self._check_piper()
+            'piper_available': self.engine is not None and self.engine.is_alive(),
+            'piper_restarts': self.engine.restart_count if self.engine else 0
         }
-    
-    def _check_piper(self) -> bool:
-        """Quick Piper availability check"""
-        try:
-            result = subprocess.run(
-                [PIPER_CONFIG["piper_binary"], "--version"],
-                capture_output=True,
-                timeout=2
-            )
-            return result.returncode == 0
-        except:
-            return False
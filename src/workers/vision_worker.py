@@ -339,6 +339,9 @@ class VisionWorker:
                     'center': self.locked_face_center,
                     'confidence': largest_face['confidence']
                 }
+            else:
+                # Seen, not locked yet - early signal that someone is coming
+                event['state'] = 'face_detected'
         else:
             # Track locked face
             # Find face closest to locked position
@@ -5,16 +5,39 @@ Test suite for voice assistant components
 
 import pytest
 import queue
+import numpy as np
 import time
+import threading
+import json
+import os
 import sys
+import requests
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from src.config import AUDIO_CONFIG, QUEUE_CONFIG
+from src.config import AUDIO_CONFIG, OLLAMA_CONFIG, QUEUE_CONFIG
 from src.metrics_logger import MetricsLogger, PerformanceMetric
+from src.text_segmenter import SentenceSegmenter, split_sentences
+from src.audio_buffer import AudioRingBuffer
+from src.endpointing import Endpointer, BargeInDetector
+from src.vad import SpectralVAD
+from src.log_mel import IncrementalLogMel, N_FFT, HOP_LENGTH
+from src.stt_engines import STTEngine, WhisperEngine, create_engine
+from src.stt_inference import STTProcess, beam_fallback_reason
+from src.transcript_filter import TranscriptFilter
+from src.playback_tracker import PlaybackTracker
+from src.cancellation import CancellationToken, TurnManager
+from src.agent_state import AgentStateManager, AgentState
+from src.tts_cache import TTSCache
+from src.response_cache import ResponseCache, is_follow_up
+from src.semantic_cache import SemanticCache
+from src.conversation_history import ConversationHistory, estimate_tokens
+from src.circuit_breaker import CircuitBreaker
+from src.ollama_client import OllamaClient
+from src.scheduler import DeadlineQueue
 
 
 class TestMetricsLogger:
@@ -123,7 +146,7 @@ class TestWorkerMocks:
         assert not worker.running
         assert worker.processing_count == 0
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_llm_worker_server_check(self, mock_get):
         """Test LLM worker server connectivity check"""
         from src.workers.llm_worker import LLMWorker
@@ -225,6 +248,1158 @@ class TestPipelineFlow:
         assert llm_to_tts.empty()
 
 
+class TestSentenceSegmenter:
+    """Test splitting streamed LLM output into speakable chunks"""
+    
+    def test_streamed_tokens_split_at_sentence_end(self):
+        """Test chunks are emitted as soon as a sentence completes"""
+        segmenter = SentenceSegmenter(min_chars=5, clause_min_chars=100)
+        
+        chunks = []
+        for token in ["Hello", " there", "!", " How", " can", " I", " help", "?"]:
+            chunks.extend(segmenter.feed(token))
+        
+        assert chunks == ["Hello there!"]
+        assert segmenter.flush() == "How can I help?"
+    
+    def test_short_sentences_are_merged(self):
+        """Test sentences under the minimum length wait for the next one"""
+        chunks = split_sentences("Yes. The store opens at 9 a.m. daily.", min_chars=10)
+        assert chunks == ["Yes. The store opens at 9 a.m. daily."]
+    
+    def test_abbreviations_do_not_split(self):
+        """Test abbreviations like Dr. do not end a sentence"""
+        chunks = split_sentences("Ask Dr. Smith about it. She knows.", min_chars=5)
+        assert chunks == ["Ask Dr. Smith about it.", "She knows."]
+    
+    def test_long_clause_split(self):
+        """Test long sentences split at clause boundaries"""
+        segmenter = SentenceSegmenter(min_chars=5, clause_min_chars=20)
+        chunks = segmenter.feed("We have apples and oranges today, plus fresh bread ")
+        assert chunks == ["We have apples and oranges today,"]
+
+
+class TestAudioRingBuffer:
+    """Test the capture ring buffer"""
+    
+    def test_read_back_written_samples(self):
+        """Test samples are addressed by absolute index"""
+        ring = AudioRingBuffer(capacity=8, sample_rate=16000)
+        ring.write(np.arange(5, dtype=np.int16))
+        
+        assert ring.total_written == 5
+        assert list(ring.read(1, 4)) == [1, 2, 3]
+    
+    def test_wraparound_keeps_newest(self):
+        """Test old samples are overwritten once the buffer is full"""
+        ring = AudioRingBuffer(capacity=8, sample_rate=16000)
+        ring.write(np.arange(6, dtype=np.int16))
+        ring.write(np.arange(6, 12, dtype=np.int16))
+        
+        assert ring.oldest_index == 4
+        # Reads before the oldest sample are clamped
+        assert list(ring.read(0, 12)) == [4, 5, 6, 7, 8, 9, 10, 11]
+    
+    def test_wait_for_timeout(self):
+        """Test waiting for samples that never arrive"""
+        ring = AudioRingBuffer(capacity=8, sample_rate=16000)
+        assert not ring.wait_for(1, timeout=0.05)
+
+
+def _voice(samples, sample_rate=16000):
+    """Harmonic test signal with a 150Hz fundamental (speech-like spectrum)"""
+    t = np.arange(samples) / sample_rate
+    return sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 20)) * 2500
+
+
+def _noise(samples, level=30, seed=0):
+    """White noise test signal"""
+    return np.random.default_rng(seed).normal(0, level, samples)
+
+
+class TestSpectralVAD:
+    """Test the spectral voice activity detector"""
+    
+    def _calibrated_vad(self):
+        vad = SpectralVAD(16000)
+        vad.calibrate(_noise(16000).astype(np.int16))
+        return vad
+    
+    def test_speech_detected(self):
+        """Test harmonic audio is classified as speech"""
+        vad = self._calibrated_vad()
+        audio = (_voice(16000) + _noise(16000)).astype(np.int16)
+        assert vad.classify(vad.frames(audio)).all()
+    
+    def test_loud_broadband_noise_rejected(self):
+        """Test fan-like noise louder than speech does not trigger"""
+        vad = self._calibrated_vad()
+        fan = _noise(16000, level=2000, seed=1).astype(np.int16)
+        assert not vad.classify(vad.frames(fan)).any()
+    
+    def test_trim_removes_silence(self):
+        """Test leading/trailing silence is trimmed"""
+        vad = self._calibrated_vad()
+        audio = np.concatenate([_noise(16000), _voice(8000) + _noise(8000, seed=2), _noise(16000, seed=3)])
+        
+        trimmed = vad.trim(audio.astype(np.int16), pad_ms=0)
+        assert abs(len(trimmed) - 8000) <= vad.frame_samples * 2
+    
+    def test_trim_without_speech_is_empty(self):
+        """Test pure noise trims to nothing"""
+        vad = self._calibrated_vad()
+        assert len(vad.trim(_noise(16000, seed=4).astype(np.int16))) == 0
+
+
+class TestEndpointer:
+    """Test end-of-speech detection"""
+    
+    def _run(self, endpointer, audio):
+        frames = endpointer.vad.frames(audio.astype(np.int16))
+        return [endpointer.process(frame) for frame in frames]
+    
+    def _calibrated_endpointer(self):
+        endpointer = Endpointer(16000)
+        endpointer.vad.calibrate(_noise(16000).astype(np.int16))
+        return endpointer
+    
+    def test_start_and_end_events(self):
+        """Test speech start after speech frames and end after trailing silence"""
+        endpointer = self._calibrated_endpointer()
+        silence_samples = AUDIO_CONFIG['trailing_silence_ms'] * 16
+        
+        assert 'start' not in self._run(endpointer, _noise(8000, seed=1))
+        assert 'start' in self._run(endpointer, _voice(4800))
+        
+        events = self._run(endpointer, _noise(silence_samples, seed=2))
+        assert events[-1] == 'end'
+        assert events.count('end') == 1
+    
+    def test_short_pause_does_not_end_speech(self):
+        """Test pauses shorter than the trailing silence keep the phrase open"""
+        endpointer = self._calibrated_endpointer()
+        self._run(endpointer, _voice(3200))
+        
+        assert 'end' not in self._run(endpointer, _noise(AUDIO_CONFIG['trailing_silence_ms'] * 8, seed=3))
+        assert 'end' not in self._run(endpointer, _voice(1600))
+    
+    def test_noise_floor_adapts(self):
+        """Test steady background noise raises the noise floor"""
+        endpointer = self._calibrated_endpointer()
+        initial = endpointer.vad.noise_db
+        
+        self._run(endpointer, _noise(32000, level=200, seed=4))
+        assert endpointer.vad.noise_db > initial
+
+
+class TestBargeInDetector:
+    """Test detecting the user talking over playback"""
+    
+    def _run(self, detector, audio):
+        frames = detector.vad.frames(audio.astype(np.int16))
+        return [detector.process(frame) for frame in frames]
+    
+    def _detector(self):
+        vad = SpectralVAD(16000)
+        vad.calibrate(_noise(16000).astype(np.int16))
+        return BargeInDetector(vad)
+    
+    def test_echo_does_not_trigger(self):
+        """Test Pluto's own voice at echo level is not a barge-in"""
+        detector = self._detector()
+        assert not any(self._run(detector, _voice(32000) * 0.2 + _noise(32000)))
+    
+    def test_louder_speech_triggers(self):
+        """Test speech well above the echo level interrupts after barge_in_ms"""
+        detector = self._detector()
+        self._run(detector, _voice(16000) * 0.2 + _noise(16000))
+        
+        events = self._run(detector, _voice(8000) + _noise(8000, seed=1))
+        assert any(events)
+        assert events.index(True) + 1 == detector.trigger_frames
+
+
+class TestIncrementalLogMel:
+    """Test the incremental Whisper front-end"""
+    
+    def _reference(self, filters, audio):
+        """One-shot log-mel computed the way whisper.transcribe does"""
+        padded = np.concatenate([audio[1:N_FFT // 2 + 1][::-1], audio, np.zeros(N_FFT)])
+        n_frames = len(audio) // HOP_LENGTH
+        window = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(N_FFT) / N_FFT)
+        frames = np.stack([padded[t * HOP_LENGTH:t * HOP_LENGTH + N_FFT] for t in range(n_frames)])
+        power = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2
+        return IncrementalLogMel.normalize(np.log10(np.maximum(filters @ power.T, 1e-10)))
+    
+    def test_incremental_matches_one_shot(self):
+        """Test feeding audio in pieces gives the same features as one pass"""
+        rng = np.random.default_rng(0)
+        filters = rng.random((80, N_FFT // 2 + 1)).astype(np.float32)
+        audio = rng.normal(0, 0.1, 16000).astype(np.float32)
+        
+        mel = IncrementalLogMel(filters, initial_frames=10)
+        for end in (3000, 7777, 12000):
+            mel.update(audio[:end])
+        result = mel.log_mel(audio)
+        
+        expected = self._reference(filters, audio)
+        assert result.shape == expected.shape == (80, 100)
+        assert np.allclose(result, expected, atol=1e-3)
+    
+    def test_shorter_audio_starts_new_utterance(self):
+        """Test the cache resets when a new utterance begins"""
+        rng = np.random.default_rng(1)
+        filters = rng.random((80, N_FFT // 2 + 1)).astype(np.float32)
+        mel = IncrementalLogMel(filters)
+        
+        mel.update(rng.normal(0, 0.1, 16000).astype(np.float32))
+        audio = rng.normal(0, 0.1, 4800).astype(np.float32)
+        assert np.allclose(mel.log_mel(audio), self._reference(filters, audio), atol=1e-3)
+
+
+class TestSTTEngine:
+    """Test the STT engine interface"""
+    
+    def test_transcribe_reports_timings_and_rtf(self):
+        """Test the base class adds total time and real-time factor"""
+        class SlowEngine(STTEngine):
+            name = "slow"
+            
+            def _run(self, audio, utterance_id, beam):
+                time.sleep(0.05)
+                return {'text': "hello", 'confidence': 0.9}
+        
+        result = SlowEngine().transcribe(np.zeros(16000, dtype=np.float32))
+        
+        assert result['text'] == "hello"
+        assert result['engine'] == "slow"
+        assert result['timings']['total_ms'] >= 50
+        assert 0.05 <= result['rtf'] < 1.0
+    
+    def test_unknown_engine_rejected(self):
+        """Test selecting an engine that doesn't exist"""
+        with pytest.raises(ValueError):
+            create_engine("nonexistent")
+    
+    def test_encoder_bucket_selection(self):
+        """Test short utterances get the smallest window that fits"""
+        engine = WhisperEngine()
+        
+        assert engine._bucket_frames(120) == 200  # 1.2s + tail pad -> 2s window
+        assert engine._bucket_frames(160) == 400  # 1.6s + 0.5s pad doesn't fit 2s
+        assert engine._bucket_frames(2500) is None  # Long audio: full 30s window
+    
+    def test_beam_fallback_policy(self):
+        """Test which greedy results are re-decoded with beam search"""
+        confident = {'text': "yes", 'avg_logprob': -0.2, 'compression_ratio': 1.1, 'no_speech_prob': 0.01}
+        assert beam_fallback_reason(confident) is None
+        
+        assert beam_fallback_reason({**confident, 'avg_logprob': -1.5}) == 'avg_logprob'
+        assert beam_fallback_reason({**confident, 'compression_ratio': 3.0}) == 'compression_ratio'
+        
+        # Low confidence on silence, and engines without Whisper statistics
+        assert beam_fallback_reason({**confident, 'avg_logprob': -1.5, 'no_speech_prob': 0.9}) is None
+        assert beam_fallback_reason({'text': "yes", 'confidence': 0.3}) is None
+
+
+class _FakeInferenceChild:
+    """Stand-in for the inference process and the parent's end of its pipe"""
+    
+    pid = 4242
+    
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.sent = []
+        self.alive = True
+    
+    def send(self, message):
+        self.sent.append(message)
+    
+    def poll(self, timeout=None):
+        return bool(self.replies)  # No reply queued: the child hangs
+    
+    def recv(self):
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+    
+    def close(self):
+        pass
+    
+    def start(self):
+        pass
+    
+    def is_alive(self):
+        return self.alive
+    
+    def kill(self):
+        self.alive = False
+    
+    def join(self, timeout=None):
+        pass
+
+
+class TestSTTProcess:
+    """Test the out-of-process STT client"""
+    
+    def _process(self, *children):
+        """STTProcess whose n-th spawned child is children[n]"""
+        spawned = list(children)
+        ctx = Mock()
+        ctx.Pipe.side_effect = lambda: (spawned[0], Mock())
+        ctx.Process.side_effect = lambda **kwargs: spawned.pop(0)
+        
+        proc = STTProcess(engine_name='whisper')
+        proc._ctx = ctx
+        return proc
+    
+    def test_shared_memory_holds_longest_phrase(self):
+        """Test the audio buffer fits max_phrase_duration plus a second of slack"""
+        proc = STTProcess(engine_name='whisper')
+        assert proc.capacity == int((AUDIO_CONFIG['max_phrase_duration'] + 1.0) * AUDIO_CONFIG['sample_rate'])
+    
+    def test_timeout_restarts_child(self):
+        """Test a hung child is replaced and the request fails with None"""
+        hung = _FakeInferenceChild({'status': 'ready'})
+        fresh = _FakeInferenceChild({'status': 'ready'},
+                                    {'status': 'ok', 'text': "hi", 'timings': {}})
+        proc = self._process(hung, fresh)
+        proc.capacity = 100
+        
+        try:
+            assert proc.start()
+            assert proc.transcribe(np.ones(50, dtype=np.float32)) is None
+            assert not hung.alive and proc.restart_count == 1
+            
+            reply = proc.transcribe(np.arange(250, dtype=np.float32))
+            assert reply['text'] == "hi" and 'roundtrip_ms' in reply['timings']
+            
+            # Audio longer than the buffer is clipped to its capacity
+            assert fresh.sent[-1]['n_samples'] == 100
+            assert np.array_equal(proc.audio_buffer, np.arange(100, dtype=np.float32))
+        finally:
+            proc.stop()
+    
+    def test_crash_restarts_child(self):
+        """Test a child crashing mid-request is replaced before the next request"""
+        crashed = _FakeInferenceChild({'status': 'ready'}, EOFError())
+        fresh = _FakeInferenceChild({'status': 'ready'},
+                                    {'status': 'ok', 'text': "again", 'timings': {}})
+        proc = self._process(crashed, fresh)
+        proc.capacity = 100
+        
+        try:
+            assert proc.start()
+            assert proc.transcribe(np.ones(50, dtype=np.float32)) is None
+            assert proc.restart_count == 1
+            assert proc.transcribe(np.ones(50, dtype=np.float32))['text'] == "again"
+        finally:
+            proc.stop()
+
+
+class TestTranscriptFilter:
+    """Test the hallucination / no-speech gate"""
+    
+    def _reply(self, text, **stats):
+        return {'text': text, 'avg_logprob': -0.3, 'compression_ratio': 1.2, 'no_speech_prob': 0.05, **stats}
+    
+    def test_real_speech_passes(self):
+        """Test a confident transcript is forwarded"""
+        f = TranscriptFilter()
+        assert f.check(self._reply("What time is it?"), duration=1.5) is None
+        assert f.check(self._reply("Thank you!"), duration=0.8) is None  # Clearly spoken
+        assert f.drop_counts == {}
+    
+    def test_drop_reasons(self):
+        """Test each junk signal and the per-reason counts"""
+        f = TranscriptFilter()
+        
+        assert f.check(self._reply("Thanks for watching!"), duration=1.0) == 'blocklist'
+        assert f.check(self._reply("hello there", no_speech_prob=0.8, avg_logprob=-1.2), duration=1.0) == 'no_speech'
+        assert f.check(self._reply("hello there", avg_logprob=-2.0), duration=1.0) == 'low_logprob'
+        assert f.check(self._reply("go go go go go go", compression_ratio=3.1), duration=2.0) == 'repetition'
+        assert f.check(self._reply("one two three four five six seven"), duration=0.5) == 'word_rate'
+        assert f.check(self._reply("  "), duration=1.0) == 'empty_transcript'
+        assert f.check(self._reply("Thank you.", no_speech_prob=0.7), duration=1.0) == 'blocklist'
+        assert f.check(self._reply("you"), duration=0.3) == 'blocklist'
+        
+        assert f.drop_counts['blocklist'] == 3
+        assert sum(f.drop_counts.values()) == 8
+
+
+class TestPlaybackTracker:
+    """Test the playback events used for echo gating"""
+    
+    def test_intervals_and_tail(self):
+        """Test capture times during playback and its tail count as echo"""
+        events = []
+        tracker = PlaybackTracker(tail_ms=300)
+        tracker.add_listener(lambda event, ts: events.append(event))
+        
+        tracker.started(timestamp=100.0)
+        assert tracker.is_playing and tracker.covers(100.5)
+        tracker.stopped(timestamp=102.0)
+        
+        assert events == ['start', 'stop']
+        assert not tracker.covers(99.9)
+        assert tracker.covers(102.2)  # Inside the echo tail
+        assert not tracker.covers(102.4)
+    
+    def test_wait_until_quiet(self):
+        """Test waiting is woken by the stop event and then the tail"""
+        tracker = PlaybackTracker(tail_ms=50)
+        tracker.started()
+        assert not tracker.wait_until_quiet(timeout=0.05)
+        
+        threading.Timer(0.05, tracker.stopped).start()
+        start = time.time()
+        assert tracker.wait_until_quiet(timeout=1.0)
+        assert 0.09 <= time.time() - start < 0.5
+        assert not tracker.is_gated()
+
+
+class TestCancellation:
+    """Test cancellation tokens shared between workers"""
+    
+    def test_token_tree_and_callbacks(self):
+        """Test cancelling a parent cancels children and runs callbacks once"""
+        calls = []
+        parent = CancellationToken()
+        child = parent.child()
+        child.add_callback(calls.append)
+        
+        parent.cancel('face_lost')
+        parent.cancel('again')
+        
+        assert child.cancelled and child.reason == 'face_lost'
+        assert calls == ['face_lost']
+        
+        # Late registrations see the cancellation immediately
+        late = parent.child()
+        late.add_callback(calls.append)
+        assert late.cancelled and calls == ['face_lost', 'face_lost']
+    
+    def test_turn_manager(self):
+        """Test barge-in cancels turns and face loss starts a new session"""
+        turns = TurnManager()
+        first = turns.new_turn()
+        assert turns.cancel_turns('barge_in') == 1
+        assert first.cancelled and not turns.session.cancelled
+        
+        old_session = turns.session
+        second = turns.new_turn()
+        turns.cancel_session('face_lost')
+        assert second.cancelled and old_session.cancelled
+        assert not turns.session.cancelled and not turns.new_turn().cancelled
+
+
+class _FakePiper:
+    """Stand-in for the Piper process: real stdout/stderr pipes, scripted replies"""
+    
+    def __init__(self, reply):
+        out_r, self.out_w = os.pipe()
+        err_r, self.err_w = os.pipe()
+        self.stdout = os.fdopen(out_r, 'rb', buffering=0)
+        self.stderr = os.fdopen(err_r, 'rb')
+        self.stdin = Mock()
+        self.stdin.write.side_effect = lambda line: reply(self)
+        self.returncode = None
+    
+    def audio(self, pcm: bytes):
+        os.write(self.out_w, pcm)
+    
+    def rtf(self, seconds: float):
+        os.write(self.err_w, f"[piper] [info] Real-time factor: 0.05 (infer=0.01 sec, audio={seconds} sec)\n".encode())
+    
+    def die(self):
+        self.returncode = 1
+        for fd in (self.out_w, self.err_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+    
+    def poll(self):
+        return self.returncode
+    
+    def wait(self, timeout=None):
+        self.die()
+        return self.returncode
+    
+    def kill(self):
+        self.die()
+
+
+class TestPiperEngine:
+    """Test the persistent Piper process"""
+    
+    PCM = bytes(range(256)) * 8  # 1024 16-bit samples
+    
+    def _engine(self, monkeypatch, *replies):
+        """Engine whose n-th Piper process answers with replies[n]"""
+        from src.workers.piper_engine import PiperEngine
+        processes = []
+        
+        def popen(*args, **kwargs):
+            processes.append(_FakePiper(replies[len(processes)]))
+            return processes[-1]
+        
+        engine = PiperEngine()
+        engine.sample_rate = 16000
+        monkeypatch.setattr('subprocess.Popen', popen)
+        assert engine.start()
+        return engine, processes
+    
+    def _reply(self, piper):
+        piper.audio(self.PCM)
+        piper.rtf(1024 / 16000)
+    
+    def test_utterance_ends_at_rtf_line(self, monkeypatch):
+        """Test PCM streams in whole samples and the RTF line ends the utterance"""
+        def reply(piper):
+            piper.audio(self.PCM[:1001])  # Split mid-sample
+            piper.audio(self.PCM[1001:])
+            piper.rtf(1024 / 16000)
+        
+        engine, processes = self._engine(monkeypatch, reply)
+        chunks = []
+        start = time.time()
+        pcm = engine.synthesize("Hello there.", on_audio=chunks.append)
+        
+        assert pcm == self.PCM
+        assert b"".join(chunks) == self.PCM
+        assert all(len(chunk) % 2 == 0 for chunk in chunks)
+        assert time.time() - start < 0.5  # Did not wait for idle_timeout
+        processes[0].stdin.write.assert_called_once_with(b"Hello there.\n")
+        engine.stop()
+    
+    def test_missing_rtf_line_falls_back_to_idle_timeout(self, monkeypatch):
+        """Test an utterance without an RTF line ends after idle_timeout of silence"""
+        from src.workers import piper_engine
+        
+        engine, _ = self._engine(monkeypatch, lambda piper: piper.audio(self.PCM))
+        with patch.dict(piper_engine.PIPER_CONFIG, {'idle_timeout': 0.1}):
+            assert engine.synthesize("Quiet logs.") == self.PCM
+        assert engine.restart_count == 0
+        engine.stop()
+    
+    def test_process_dies_mid_utterance(self, monkeypatch):
+        """Test a crash fails the utterance and a fresh process serves the next one"""
+        def crash(piper):
+            piper.audio(self.PCM[:512])
+            piper.die()
+        
+        engine, processes = self._engine(monkeypatch, crash, self._reply)
+        assert engine.synthesize("This will crash.") is None
+        assert engine.restart_count == 1
+        assert engine.synthesize("Back again.") == self.PCM
+        
+        assert len(processes) == 2
+        engine.stop()
+
+
+class _StubPiper:
+    """Stand-in for PiperEngine: each sentence becomes its own bytes as PCM"""
+    
+    sample_rate = 16000
+    sample_width = 2
+    
+    def __init__(self):
+        self.sentences = []
+    
+    @staticmethod
+    def pcm(text: str) -> bytes:
+        data = text.encode()
+        return data + b"\0" * (len(data) % 2)
+    
+    def synthesize(self, text, on_audio=None):
+        self.sentences.append(text)
+        pcm = self.pcm(text)
+        if on_audio:
+            on_audio(pcm)
+        return pcm
+
+
+def _wait_until(condition, timeout=2.0):
+    """Poll until condition() holds (worker threads run in the background)"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestTTSPipeline:
+    """Test the synthesis → playback pipeline of the TTS worker"""
+    
+    def _worker(self):
+        from src.workers import tts_worker
+        with patch.dict(tts_worker.PIPER_CONFIG, {'cache_enabled': False}):
+            worker = tts_worker.TTSWorker(queue.Queue())
+        worker.engine = _StubPiper()
+        
+        worker.written = []
+        stream = Mock()
+        stream.write.side_effect = worker.written.append
+        worker.audio = Mock()
+        worker.audio.open.return_value = stream
+        return worker
+    
+    def _run(self, worker, *stages):
+        worker.running = True
+        threads = [threading.Thread(target=stage, daemon=True) for stage in stages]
+        for thread in threads:
+            thread.start()
+        return threads
+    
+    def _stop(self, worker, threads):
+        worker.running = False
+        for thread in threads:
+            thread.join(timeout=2)
+    
+    def test_turn_plays_in_order(self):
+        """Test streamed chunks play in order and the turn end releases its bookkeeping"""
+        worker = self._worker()
+        threads = self._run(worker, worker._process_queue, worker._playback_loop)
+        
+        chunks = ["Hello there, friend.", "The shop opens at nine.", "See you soon."]
+        for index, text in enumerate(chunks):
+            worker.input_queue.put({'type': 'response_chunk', 'text': text, 'turn_id': 1, 'index': index})
+        worker.input_queue.put({'type': 'response_end', 'text': " ".join(chunks), 'turn_id': 1})
+        
+        expected = b"".join(_StubPiper.pcm(text) for text in chunks)
+        assert _wait_until(lambda: b"".join(worker.written) == expected and not worker.turn_start_times)
+        assert worker.engine.sentences == chunks
+        assert worker.processing_count == 1
+        self._stop(worker, threads)
+    
+    def test_cancelled_turn_pcm_is_skipped(self):
+        """Test PCM already buffered for a cancelled turn never reaches the speaker"""
+        worker = self._worker()
+        cancelled = CancellationToken()
+        worker.pcm_queue.put({'type': 'pcm', 'data': b"stale!", 'turn_id': 1, 'cancel_token': cancelled})
+        worker.pcm_queue.put({'type': 'turn_end', 'turn_id': 1, 'cancel_token': cancelled})
+        worker.pcm_queue.put({'type': 'pcm', 'data': b"fresh!", 'turn_id': 2, 'cancel_token': CancellationToken()})
+        cancelled.cancel('barge_in')
+        
+        threads = self._run(worker, worker._playback_loop)
+        assert _wait_until(lambda: worker.pcm_queue.empty() and worker.written)
+        self._stop(worker, threads)
+        assert worker.written == [b"fresh!"]
+    
+    def test_interrupt_releases_dropped_turns(self):
+        """Test interrupting drops buffered audio without leaking per-turn state"""
+        worker = self._worker()
+        token = CancellationToken()
+        
+        worker.turn_start_times[1] = time.time()
+        worker._first_audio_logged.add(1)
+        worker.pcm_queue.put({'type': 'pcm', 'data': b"hello!", 'turn_id': 1, 'cancel_token': token})
+        worker.pcm_queue.put({'type': 'turn_end', 'turn_id': 1, 'cancel_token': token})
+        
+        # Synthesis still had this turn's text in flight when it was cancelled
+        worker.turn_start_times[2] = time.time()
+        token.add_callback(lambda reason: worker.interrupt())
+        token.cancel('barge_in')
+        worker.input_queue.put({'type': 'response_end', 'text': "", 'turn_id': 2, 'cancel_token': token})
+        
+        threads = self._run(worker, worker._process_queue)
+        assert _wait_until(lambda: not worker.turn_start_times)
+        self._stop(worker, threads)
+        
+        assert not worker._first_audio_logged
+        assert worker.pcm_queue.get_nowait()['type'] == 'interrupt'
+        assert worker.pcm_queue.empty()
+
+
+class TestGreetings:
+    """Test pre-rendered greetings played without the LLM"""
+    
+    VARIANTS = ["Hi!", "Hello there!", "Broken."]
+    
+    def _worker(self, prerendered=True):
+        from src.workers import tts_worker
+        with patch.dict(tts_worker.PIPER_CONFIG, {'cache_enabled': False}):
+            worker = tts_worker.TTSWorker(queue.Queue())
+        
+        worker.engine = Mock()
+        worker.engine.synthesize.side_effect = lambda text, on_audio=None: (
+            None if text == "Broken." else _StubPiper.pcm(text))
+        
+        # Stub phrase cache that already holds the first variant
+        worker.cache = Mock()
+        worker.cache.cacheable.return_value = True
+        worker.cache.get.side_effect = lambda text: b"cached" if text == "Hi!" else None
+        
+        with patch.dict(tts_worker.VISION_CONFIG, {'greeting_prerendered': prerendered,
+                                                   'greeting_variants': self.VARIANTS}):
+            worker.prerender_greetings()
+        worker.running = True
+        return worker
+    
+    def test_prerender_uses_cache_and_skips_failures(self):
+        """Test cached variants skip Piper and variants that fail to render are left out"""
+        worker = self._worker()
+        
+        assert worker.greeting_clips == [("Hi!", b"cached"), ("Hello there!", _StubPiper.pcm("Hello there!"))]
+        assert [c.args[0] for c in worker.engine.synthesize.call_args_list] == ["Hello there!", "Broken."]
+        worker.cache.put.assert_called_once_with("Hello there!", _StubPiper.pcm("Hello there!"))
+    
+    def test_round_robin_rotation(self):
+        """Test variants rotate and each greeting is queued as its own turn"""
+        from src.workers import tts_worker
+        worker = self._worker()
+        
+        with patch.dict(tts_worker.VISION_CONFIG, {'greeting_rotation': 'round_robin'}):
+            texts = [worker.play_greeting() for _ in range(3)]
+        assert texts == ["Hi!", "Hello there!", "Hi!"]
+        
+        items = [worker.pcm_queue.get_nowait() for _ in range(6)]
+        assert [item['type'] for item in items] == ['pcm', 'turn_end'] * 3
+        assert items[0]['data'] == b"cached"
+        assert len({item['turn_id'] for item in items}) == 3
+    
+    def test_fallback_without_clips(self):
+        """Test play_greeting returns None so the caller generates a greeting instead"""
+        worker = self._worker(prerendered=False)
+        
+        assert worker.greeting_clips == []
+        assert worker.play_greeting() is None
+        assert worker.pcm_queue.empty()
+
+
+class TestTTSCache:
+    """Test the phrase-level PCM cache"""
+    
+    def test_lru_eviction(self, tmp_path):
+        """Test the memory budget evicts the least recently used clip"""
+        cache = TTSCache(directory=str(tmp_path), max_bytes=250, disk_max_bytes=10_000)
+        cache.put("One.", b"a" * 100)
+        cache.put("Two.", b"b" * 100)
+        assert cache.get("One.") == b"a" * 100  # Now most recent
+        cache.put("Three.", b"c" * 100)
+        
+        assert cache.memory_bytes <= 250
+        assert cache.key("Two.") not in cache._entries
+        assert cache.get("Two.") == b"b" * 100  # Still on disk
+        assert cache.hit_rate == 1.0
+    
+    def test_persists_across_restarts(self, tmp_path):
+        """Test a new cache instance finds clips written by an earlier one"""
+        TTSCache(directory=str(tmp_path)).put("Hello  there!", b"pcm")
+        
+        cache = TTSCache(directory=str(tmp_path))
+        assert cache.get("Hello there!") == b"pcm"  # Whitespace-normalized
+        assert cache.get("Something else.") is None
+        assert cache.hits == 1 and cache.misses == 1
+
+
+class TestResponseCache:
+    """Test the exact-match LLM response cache"""
+    
+    def test_normalized_key_and_savings(self):
+        """Test paraphrased punctuation/case hit the same entry and count savings"""
+        cache = ResponseCache(ttl=60, max_entries=10)
+        options = {'temperature': 0.0}
+        key = ResponseCache.key("What time do you close?", "sys", "model", options)
+        cache.put(key, "At nine.", generation_ms=1500)
+        
+        assert cache.get(ResponseCache.key("what time do you close", "sys", "model", options)) == "At nine."
+        assert cache.get(ResponseCache.key("what time do you close", "sys", "other", options)) is None
+        assert cache.saved_ms == 1500 and cache.hit_rate == 0.5
+    
+    def test_ttl_and_lru(self):
+        """Test expired and least recently used entries are dropped"""
+        cache = ResponseCache(ttl=0.05, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, key, 100)
+        assert cache.get("a") is None and cache.get("c") == "c"
+        
+        time.sleep(0.1)
+        assert cache.get("c") is None
+    
+    def test_follow_up_detection(self):
+        """Test history-dependent questions are recognized"""
+        assert is_follow_up("And what about tomorrow?")
+        assert is_follow_up("Can you say that again?")
+        assert not is_follow_up("What time do you close?")
+
+
+class TestSemanticCache:
+    """Test the embedding nearest-neighbour cache"""
+    
+    def test_threshold_and_persistence(self, tmp_path):
+        """Test only close questions hit, and the index survives a restart"""
+        cache = SemanticCache(directory=str(tmp_path), max_entries=4, threshold=0.9)
+        cache.add(np.array([1.0, 0.0, 0.0]), "When do you close?", "At nine.")
+        cache.add(np.array([0.0, 1.0, 0.0]), "Where is the exit?", "Behind you.")
+        
+        match = cache.lookup(np.array([0.95, 0.1, 0.0]))
+        assert match['answer'] == "At nine." and match['similarity'] > 0.9
+        assert cache.lookup(np.array([0.7, 0.7, 0.0])) is None
+        
+        reloaded = SemanticCache(directory=str(tmp_path), max_entries=4, threshold=0.9)
+        assert reloaded.lookup(np.array([0.0, 2.0, 0.0]))['answer'] == "Behind you."
+    
+    def test_bounded_size(self, tmp_path):
+        """Test the oldest entry is overwritten when full"""
+        cache = SemanticCache(directory=str(tmp_path), max_entries=2, threshold=0.99)
+        for i, vector in enumerate(np.eye(3)):
+            cache.add(vector, f"q{i}", f"a{i}")
+        
+        assert len(cache.entries) == 2
+        assert cache.lookup(np.eye(3)[0]) is None
+        assert cache.lookup(np.eye(3)[2])['answer'] == "a2"
+
+
+class TestAgentState:
+    """Test agent state reset behavior"""
+    
+    def test_reset_notifies_listeners(self):
+        """Test reset() unlocks the face and runs reset listeners (e.g. clear LLM history)"""
+        calls = []
+        agent = AgentStateManager()
+        agent.add_reset_listener(lambda: calls.append('cleared'))
+        agent.add_reset_listener(lambda: 1 / 0)  # A failing listener doesn't stop reset
+        
+        agent.lock_face(1.0)
+        agent.reset()
+        
+        assert calls == ['cleared']
+        assert agent.current_state == AgentState.IDLE and not agent.is_locked()
+
+
+class TestOllamaClient:
+    """Test the pooled Ollama session and its background health probe"""
+    
+    def test_health_flips_on_failure_and_recovery(self):
+        """Test the cached health follows the server without callers blocking"""
+        client = OllamaClient()
+        up = threading.Event()
+        up.set()
+        
+        def get(url, **kwargs):
+            if not up.is_set():
+                raise requests.exceptions.ConnectionError("refused")
+            return Mock(status_code=200)
+        
+        with patch.object(client.session, 'get', side_effect=get) as mock_get:
+            client.start_health_checks(interval=0.01)
+            try:
+                assert _wait_until(lambda: client.healthy)
+                up.clear()
+                assert _wait_until(lambda: not client.healthy)
+                up.set()
+                assert _wait_until(lambda: client.healthy)
+            finally:
+                client.close()
+        
+        url = mock_get.call_args.args[0]
+        assert url.endswith('/api/tags')
+        assert mock_get.call_args.kwargs['timeout'] == (OLLAMA_CONFIG['connect_timeout'], 1.0)
+    
+    def test_connect_and_read_timeouts(self):
+        """Test requests fail fast on connect but get the full read timeout"""
+        client = OllamaClient()
+        with patch.object(client.session, 'post') as mock_post:
+            client.post('/api/chat', json={})
+        
+        assert mock_post.call_args.kwargs['timeout'] == (OLLAMA_CONFIG['connect_timeout'], OLLAMA_CONFIG['timeout'])
+        client.close()
+
+
+class TestConversationHistory:
+    """Test the token-budgeted conversation history"""
+    
+    def test_estimate_tokens(self):
+        """Test the tokenizer approximation on words, numbers and punctuation"""
+        assert estimate_tokens("Hi there!") == 3
+        assert estimate_tokens("internationalization") == 5
+        assert estimate_tokens("1234567") == 3
+    
+    def test_budget_without_summarizer(self):
+        """Test the oldest turns are dropped to stay under the budget"""
+        history = ConversationHistory(budget=120)
+        for i in range(20):
+            history.extend([{'role': 'user', 'content': f"question number {i} " * 3},
+                            {'role': 'assistant', 'content': f"answer number {i} " * 3}])
+            assert history.tokens() <= 120
+        
+        assert history.messages()[0]['role'] == 'user'
+        assert "19" in history.messages()[-1]['content']
+    
+    def test_background_summary(self):
+        """Test older turns are replaced by the summarizer's output"""
+        done = threading.Event()
+        
+        def summarizer(previous, messages):
+            done.set()
+            return "The user asked about opening hours."
+        
+        history = ConversationHistory(summarizer, budget=200)
+        epoch = history.epoch
+        while not done.is_set():
+            history.extend([{'role': 'user', 'content': "When do you open tomorrow morning?"},
+                            {'role': 'assistant', 'content': "We open at nine in the morning."}], epoch)
+        
+        for _ in range(100):
+            if history.summary:
+                break
+            time.sleep(0.01)
+        
+        messages = history.messages()
+        assert messages[0]['role'] == 'system' and "opening hours" in messages[0]['content']
+        assert len(history) <= 4
+        
+        history.clear()
+        assert not history.add('user', "stale", epoch)  # Turn from before the reset
+
+
+class TestCircuitBreaker:
+    """Test the LLM backend circuit breaker"""
+    
+    def test_open_probe_and_close(self):
+        """Test failures open the circuit, a probe half-opens it and a good call closes it"""
+        changes = []
+        healthy = threading.Event()
+        breaker = CircuitBreaker(probe=healthy.is_set,
+                                 on_state_change=lambda old, new, reason: changes.append(new),
+                                 failure_threshold=2, slow_call_s=1.0,
+                                 backoff_initial_s=0.02, backoff_max_s=0.05)
+        
+        breaker.record_failure('timeout')
+        assert breaker.allow()
+        breaker.record_success(duration_s=5.0)  # Too slow: counts as a failure
+        assert breaker.is_open and not breaker.allow()
+        
+        healthy.set()
+        for _ in range(100):
+            if breaker.state == CircuitBreaker.HALF_OPEN:
+                break
+            time.sleep(0.01)
+        
+        assert breaker.allow() and not breaker.allow()  # One trial call at a time
+        breaker.record_success(duration_s=0.1)
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert changes == ['open', 'half_open', 'closed']
+        breaker.stop()
+
+
+class TestDeadlineQueue:
+    """Test deadline/priority scheduling of the STT->LLM queue"""
+    
+    def test_priority_and_coalescing(self):
+        """Test greetings run first and back-to-back transcripts merge into one turn"""
+        q = DeadlineQueue(maxsize=10)
+        now = time.time()
+        q.put({'type': 'partial_transcript', 'text': 'what', 'utterance_id': 1, 'timestamp': now})
+        q.put({'type': 'partial_transcript', 'text': 'what time', 'utterance_id': 1, 'timestamp': now})
+        assert q.qsize() == 1
+        assert q.partials_replaced == 1 and not q.drop_counts
+        
+        first = CancellationToken()
+        q.put({'type': 'transcript', 'text': 'what time is it', 'timestamp': now, 'cancel_token': first})
+        q.put({'type': 'transcript', 'text': 'in Cairo', 'timestamp': now, 'cancel_token': CancellationToken()})
+        q.put({'type': 'transcript', 'text': 'Hello', 'timestamp': now, 'source': 'vision_trigger'})
+        
+        assert q.get_nowait()['source'] == 'vision_trigger'
+        assert q.get_nowait()['text'] == 'what time is it in Cairo'
+        assert first.cancelled
+        assert q.qsize() == 0
+        assert q.drop_counts['coalesced'] == 2  # Partial superseded by the final, merged transcript
+    
+    def test_drops_expired_stale_face_and_cancelled(self):
+        """Test messages past their deadline, from another face or cancelled are dropped"""
+        q = DeadlineQueue(maxsize=10)
+        q.set_current_face(1.0)
+        cancelled = CancellationToken()
+        cancelled.cancel('barge_in')
+        
+        q.put({'type': 'transcript', 'text': 'late', 'timestamp': time.time() - 60, 'face_id': 1.0})
+        q.put({'type': 'transcript', 'text': 'hi', 'timestamp': time.time(), 'face_id': 2.0, 'source': 'vision_trigger'})
+        q.put({'type': 'transcript', 'text': 'stop', 'timestamp': time.time(), 'face_id': 1.0,
+               'cancel_token': cancelled, 'source': 'vision_trigger'})
+        with pytest.raises(queue.Empty):
+            q.get(timeout=0.05)
+        
+        q.put({'type': 'transcript', 'text': 'bye', 'timestamp': time.time(), 'face_id': 1.0})
+        q.set_current_face(None)
+        assert q.empty()
+        assert dict(q.drop_counts) == {'expired': 1, 'stale_face': 2, 'cancelled': 1}
+        q.join()  # Dropped messages count as done
+
+
+def _ollama_stream(lines, on_line=None):
+    """Stub streaming requests.Response yielding NDJSON lines"""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    
+    def iter_lines():
+        for line in lines:
+            yield json.dumps(line).encode()
+            if on_line:
+                on_line(line)
+    
+    response.iter_lines.side_effect = iter_lines
+    return response
+
+
+class TestLLMStreaming:
+    """Test streaming Ollama replies sentence by sentence to TTS"""
+    
+    def _worker(self, response):
+        from src.workers.llm_worker import LLMWorker
+        worker = LLMWorker(queue.Queue(), queue.Queue())
+        worker.client.post = Mock(return_value=response)
+        return worker
+    
+    def _chunks(self, worker):
+        chunks = []
+        while not worker.output_queue.empty():
+            chunks.append(worker.output_queue.get_nowait())
+        return chunks
+    
+    @staticmethod
+    def _piece(text):
+        return {'message': {'role': 'assistant', 'content': text}, 'done': False}
+    
+    def test_sentences_forwarded_as_they_complete(self):
+        """Test each finished sentence is queued for TTS, in order"""
+        lines = [self._piece("Hello there, my friend."), self._piece(" How are"),
+                 self._piece(" you today?"), {'done': True, 'load_duration': 0}]
+        worker = self._worker(_ollama_stream(lines))
+        
+        text = worker._generate_stream("Hi", turn_id=1, start_time=time.time(), token=CancellationToken())
+        chunks = self._chunks(worker)
+        
+        assert text == "Hello there, my friend. How are you today?"
+        assert [c['text'] for c in chunks] == ["Hello there, my friend.", "How are you today?"]
+        assert [c['index'] for c in chunks] == [0, 1]
+        assert worker.last_error is None and worker.is_model_warm()
+    
+    def test_error_line_speaks_fallback(self):
+        """Test an error before any text speaks the fallback phrase"""
+        from src.workers.llm_worker import FALLBACK_RESPONSES
+        worker = self._worker(_ollama_stream([{'error': "model not found"}]))
+        
+        text = worker._generate_stream("Hi", turn_id=1, start_time=time.time(), token=CancellationToken())
+        
+        assert worker.last_error == 'request_error'
+        assert text == FALLBACK_RESPONSES['request_error']
+        assert [c['text'] for c in self._chunks(worker)] == [text]
+        assert not worker.is_model_warm()
+    
+    def test_error_after_text_keeps_what_was_generated(self):
+        """Test an error mid-answer speaks the text so far instead of the fallback"""
+        worker = self._worker(_ollama_stream([self._piece("The shop opens at nine."),
+                                              self._piece(" On Sundays"), {'error': "out of memory"}]))
+        
+        text = worker._generate_stream("Hi", turn_id=1, start_time=time.time(), token=CancellationToken())
+        
+        assert worker.last_error == 'request_error'
+        assert text == "The shop opens at nine. On Sundays"
+        assert [c['text'] for c in self._chunks(worker)] == ["The shop opens at nine.", "On Sundays"]
+    
+    def test_cancel_mid_stream(self):
+        """Test cancelling closes the response and stops forwarding text"""
+        token = CancellationToken()
+        lines = [self._piece("The shop opens at nine."), self._piece(" On Sundays it opens"),
+                 self._piece(" at ten."), {'done': True}]
+        response = _ollama_stream(lines, on_line=lambda line: line is lines[1] and token.cancel('barge_in'))
+        worker = self._worker(response)
+        
+        text = worker._generate_stream("Hi", turn_id=1, start_time=time.time(), token=token)
+        
+        # The unfinished sentence is never sent to TTS
+        assert text == "The shop opens at nine. On Sundays it opens"
+        assert [c['text'] for c in self._chunks(worker)] == ["The shop opens at nine."]
+        assert worker.last_error is None
+        response.close.assert_called_once()
+
+
+def _ollama_reply(data: dict):
+    """Stub requests.Response for a non-streamed Ollama reply"""
+    response = Mock(status_code=200)
+    response.json.return_value = data
+    return response
+
+
+class TestLLMPreload:
+    """Test loading the model in the background when a face appears"""
+    
+    def _worker(self, post):
+        from src.workers.llm_worker import LLMWorker
+        worker = LLMWorker(queue.Queue(), queue.Queue())
+        worker.client.post = Mock(side_effect=post)
+        return worker
+    
+    def _wait(self, worker):
+        """Wait for the preload thread to finish"""
+        with worker._preloading:
+            pass
+    
+    def test_one_preload_per_cold_window(self):
+        """Test a second detection during a preload and detections while warm send nothing"""
+        release = threading.Event()
+        
+        def post(path, **kwargs):
+            release.wait(1)
+            return _ollama_reply({'load_duration': 2e9})
+        
+        worker = self._worker(post)
+        assert not worker.is_model_warm()
+        
+        worker.preload()
+        worker.preload()  # Still loading
+        release.set()
+        self._wait(worker)
+        
+        assert worker.is_model_warm()
+        worker.preload()
+        assert worker.client.post.call_count == 1
+    
+    def test_failure_backs_off_and_stays_cold(self):
+        """Test a failed preload or generation never marks the model warm"""
+        from src.workers import llm_worker
+        
+        worker = self._worker(requests.exceptions.ConnectionError("refused"))
+        with patch.dict(llm_worker.OLLAMA_CONFIG, {'preload_retry_s': 0.1}):
+            worker.preload()
+            self._wait(worker)
+            assert not worker.is_model_warm()
+            
+            worker.preload()  # Within preload_retry_s
+            assert worker.client.post.call_count == 1
+            
+            time.sleep(0.15)
+            worker.preload()
+            self._wait(worker)
+            assert worker.client.post.call_count == 2
+        
+        assert worker._generate("Hello") == llm_worker.FALLBACK_RESPONSES['request_error']
+        assert not worker.is_model_warm()
+    
+    def test_first_turn_cold_or_warm(self):
+        """Test only a session's first generated turn is logged, by model load time"""
+        worker = self._worker(None)
+        worker.metrics = Mock()
+        
+        worker.last_load_ms = None  # Answered from a cache
+        worker._log_first_turn(5.0)
+        worker.last_load_ms = 2000.0
+        worker._log_first_turn(2500.0)
+        worker._log_first_turn(400.0)
+        
+        worker.clear_history()
+        worker.last_load_ms = 1.0
+        worker._log_first_turn(300.0)
+        
+        logged = [c.args[1] for c in worker.metrics.log_metric.call_args_list]
+        assert logged == ['first_turn_cold', 'first_turn_warm']
+
+
 class TestConfigurationValidation:
     """Test configuration settings"""
     